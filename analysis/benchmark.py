@@ -0,0 +1,346 @@
+"""
+분석 파이프라인 단계별 벤치마크
+
+목적: 데이터 로딩 / 프로파일 / 랭킹 / 패스 네트워크 / 시너지 / 베스트 11 단계의 실행 시간을
+      고정된 데이터셋에서 측정하여 JSON으로 저장하고, 두 커밋의 결과를 비교하여 성능 저하를 확인
+
+데이터셋 (현재 이벤트 로그에서 생성):
+- team: 벤치마크 팀(전북, 없으면 이벤트가 가장 많은 팀)이 뛴 경기의 이벤트 (양 팀 모두)
+- season: 전체 이벤트 로그 (한 시즌)
+- season_x3: 전체 이벤트 로그 3벌 (game_id / season_id를 바꿔 3시즌처럼 이어 붙임)
+
+측정 항목: 실행 시간(초, 반복 실행 중 최소값), 최대 메모리(tracemalloc 피크, MB), 초당 이벤트 수
+           단계별 준비 작업(CSV 저장, 이벤트 인덱스, 팀 데이터 등)은 측정에서 제외
+           최대 메모리는 실행 시간과 별도로 한 번 더 실행하여 측정 (추적 오버헤드가 시간에 섞이지 않도록)
+
+사용 예:
+    python benchmark.py                              # 모든 데이터셋 × 단계 → benchmarks/results/<커밋>.json
+    python benchmark.py --datasets team season --stages load_data create_rankings_for_all_roles
+    python benchmark.py --compare old.json new.json  # 단계별 실행 시간 비교 (성능 저하가 있으면 종료 코드 1)
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from event_index import EventIndex
+from event_store import build_event_cache, load_data, load_events, load_match_info
+from generate_all_teams_data import build_teams_data, calculate_all_team_profiles, list_team_players
+from jeonbuk_team_analysis import calculate_player_profile, create_rankings_for_all_roles, load_role_templates
+from jeonbuk_team_combination_report import analyze_pass_network_detailed, analyze_player_synergy_pairs
+from possession import POSSESSION_COLUMNS
+from team_improvement_analysis import generate_best_11
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = PROJECT_ROOT / 'benchmarks' / 'results'
+
+DATASETS = ['team', 'season', 'season_x3']
+SEASON_COPIES = 3
+
+# calculate_player_profile 단계에서 프로파일을 계산할 선수 수 (이벤트 수 상위)
+PROFILE_PLAYERS = 20
+
+# 비교 시 성능 저하로 표시할 실행 시간 증가율
+REGRESSION_THRESHOLD = 0.10
+
+
+def benchmark_team(df):
+    """벤치마크 팀 (전북 현대 모터스, 없으면 이벤트가 가장 많은 팀)"""
+    jeonbuk = df[df['team_name_ko'].str.contains('전북', na=False)]
+    if len(jeonbuk) > 0:
+        return int(jeonbuk['team_id'].iloc[0])
+    return int(df['team_id'].value_counts().idxmax())
+
+
+def build_dataset(df, match_info_df, name, team_id):
+    """
+    벤치마크 데이터셋 (이벤트, 경기 정보)
+
+    season_x3는 복사본마다 game_id를 (최대 game_id + 1)만큼, season_id를 1씩 옮겨 서로 다른 경기로 만듦
+    """
+    if name == 'team':
+        game_ids = match_info_df.loc[(match_info_df['home_team_id'] == team_id) |
+                                     (match_info_df['away_team_id'] == team_id), 'game_id']
+        events = df[df['game_id'].isin(game_ids)].reset_index(drop=True)
+        return events, match_info_df[match_info_df['game_id'].isin(game_ids)].reset_index(drop=True)
+    if name == 'season':
+        return df, match_info_df
+    if name == 'season_x3':
+        offset = int(max(df['game_id'].max(), match_info_df['game_id'].max())) + 1
+        event_copies = []
+        match_copies = []
+        for i in range(SEASON_COPIES):
+            events = df.copy()
+            events['game_id'] = (events['game_id'] + i * offset).astype(df['game_id'].dtype)
+            event_copies.append(events)
+            matches = match_info_df.copy()
+            matches['game_id'] = matches['game_id'] + i * offset
+            if 'season_id' in matches.columns:
+                matches['season_id'] = matches['season_id'] + i
+            match_copies.append(matches)
+        return (pd.concat(event_copies, ignore_index=True),
+                pd.concat(match_copies, ignore_index=True))
+    raise ValueError(f"알 수 없는 데이터셋: {name}")
+
+
+def _write_source_files(events, match_info_df, directory):
+    """데이터셋을 원본 형식 CSV로 저장 (ingest 단계에서 붙는 점유 컬럼 제외)"""
+    directory = Path(directory)
+    events_path = directory / 'raw_data.csv'
+    match_info_path = directory / 'match_info.csv'
+    events.drop(columns=POSSESSION_COLUMNS, errors='ignore').to_csv(events_path, index=False)
+    match_info_df.to_csv(match_info_path, index=False)
+    return events_path, match_info_path
+
+
+# 단계 정의: 준비 함수(context) → 측정할 인자 없는 함수
+# context: {'events', 'match_info', 'team_id', 'role_templates', 'work_dir'}
+
+def _stage_load_data(context):
+    events_path, match_info_path = _write_source_files(context['events'], context['match_info'], context['work_dir'])
+    return lambda: (load_events(events_path, use_cache=False), load_match_info(match_info_path))
+
+
+def _stage_load_data_cached(context):
+    events_path, match_info_path = _write_source_files(context['events'], context['match_info'], context['work_dir'])
+    cache_dir = Path(context['work_dir']) / 'cache'
+    build_event_cache(events_path, cache_dir)
+    return lambda: (load_events(events_path, cache_dir), load_match_info(match_info_path))
+
+
+def _stage_calculate_player_profile(context):
+    events = context['events']
+    counts = events['player_id'].value_counts()
+    player_ids = counts.index[:PROFILE_PLAYERS].tolist()
+    index = EventIndex(events)
+    match_info_df = context['match_info']
+    return lambda: [calculate_player_profile(index, player_id, match_info_df) for player_id in player_ids]
+
+
+def _stage_create_rankings(context):
+    events, match_info_df, role_templates = context['events'], context['match_info'], context['role_templates']
+    return lambda: create_rankings_for_all_roles(events, role_templates, match_info_df)
+
+
+def _stage_pass_network(context):
+    index = EventIndex(context['events'])
+    team_id = context['team_id']
+    return lambda: analyze_pass_network_detailed(index, team_id)
+
+
+def _stage_synergy_pairs(context):
+    index = EventIndex(context['events'])
+    match_info_df, team_id = context['match_info'], context['team_id']
+    return lambda: analyze_player_synergy_pairs(index, match_info_df, team_id)
+
+
+def _stage_best_11(context):
+    events = EventIndex(context['events'])
+    all_teams, team_player_lists = list_team_players(events)
+    profiles = calculate_all_team_profiles(events, team_player_lists, context['match_info'])
+    teams_data = build_teams_data(all_teams, team_player_lists, profiles, context['role_templates'])
+    return lambda: generate_best_11(teams_data)
+
+
+STAGES = {
+    'load_data': _stage_load_data,
+    'load_data_cached': _stage_load_data_cached,
+    'calculate_player_profile': _stage_calculate_player_profile,
+    'create_rankings_for_all_roles': _stage_create_rankings,
+    'analyze_pass_network_detailed': _stage_pass_network,
+    'analyze_player_synergy_pairs': _stage_synergy_pairs,
+    'generate_best_11': _stage_best_11,
+}
+
+
+def measure(func, repeat=1, memory=True):
+    """
+    함수 실행 시간 / 최대 메모리 측정 (함수 출력은 숨김)
+
+    반환: {'wall_time': 반복 중 최소 실행 시간(초), 'wall_times': [...], 'peak_memory_mb': tracemalloc 피크 (memory=False면 None)}
+    """
+    wall_times = []
+    for _ in range(repeat):
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            wall_times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'wall_time': min(wall_times),
+        'wall_times': wall_times,
+        'peak_memory_mb': None if peak is None else peak / 1024**2,
+    }
+
+
+def git_commit():
+    """현재 커밋 해시 (git 저장소가 아니면 None)"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(datasets=DATASETS, stages=tuple(STAGES), repeat=1, memory=True, data_dir=None):
+    """
+    데이터셋 × 단계 벤치마크 실행
+
+    data_dir: 원본 데이터 디렉토리 (None이면 raw_data/open_track2, 합성 데이터는 synthetic_data.py로 생성)
+
+    반환: 결과 딕셔너리 (환경 정보, 데이터셋 크기, 단계별 측정값)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, match_info_df = load_data(data_dir=data_dir)
+        role_templates = load_role_templates()
+    team_id = benchmark_team(df)
+
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'data_dir': None if data_dir is None else str(data_dir),
+        'team_id': team_id,
+        'repeat': repeat,
+        'datasets': {},
+        'results': [],
+    }
+
+    for dataset in datasets:
+        events, matches = build_dataset(df, match_info_df, dataset, team_id)
+        n_events = len(events)
+        report['datasets'][dataset] = {
+            'events': n_events,
+            'games': int(events['game_id'].nunique()),
+            'players': int(events['player_id'].nunique()),
+        }
+        print(f"\n[{dataset}] {n_events:,}개 이벤트, {report['datasets'][dataset]['games']}경기")
+
+        for stage in stages:
+            with tempfile.TemporaryDirectory(prefix='benchmark_') as work_dir:
+                context = {
+                    'events': events,
+                    'match_info': matches,
+                    'team_id': team_id,
+                    'role_templates': role_templates,
+                    'work_dir': work_dir,
+                }
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func = STAGES[stage](context)
+                result = measure(func, repeat, memory)
+
+            result['events_per_sec'] = n_events / result['wall_time'] if result['wall_time'] > 0 else None
+            report['results'].append({'dataset': dataset, 'stage': stage, **result})
+
+            memory_text = '' if result['peak_memory_mb'] is None else f", 최대 메모리 {result['peak_memory_mb']:.1f} MB"
+            print(f"  {stage:32s} {result['wall_time']:8.3f}초, "
+                  f"{result['events_per_sec']:,.0f} 이벤트/초{memory_text}")
+
+    return report
+
+
+def save_report(report, output_path=None):
+    """벤치마크 결과 JSON 저장 (기본: benchmarks/results/<커밋>.json)"""
+    if output_path is None:
+        output_path = RESULTS_DIR / f"{report['commit'] or 'local'}.json"
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ 벤치마크 결과 저장 완료: {output_path}")
+    return output_path
+
+
+def compare_reports(old_path, new_path, threshold=REGRESSION_THRESHOLD):
+    """
+    두 벤치마크 결과의 단계별 실행 시간 / 최대 메모리 비교
+
+    반환: 실행 시간이 threshold 이상 늘어난 (dataset, stage) 목록
+    """
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+
+    old_results = {(r['dataset'], r['stage']): r for r in old['results']}
+    print(f"비교: {old.get('commit') or old_path} → {new.get('commit') or new_path}")
+    print(f"{'데이터셋':10s} {'단계':32s} {'이전(초)':>10s} {'현재(초)':>10s} {'비율':>7s} {'메모리(MB)':>18s}")
+
+    regressions = []
+    for result in new['results']:
+        key = (result['dataset'], result['stage'])
+        previous = old_results.get(key)
+        if previous is None:
+            print(f"{key[0]:10s} {key[1]:32s} {'-':>10s} {result['wall_time']:10.3f}")
+            continue
+
+        ratio = result['wall_time'] / previous['wall_time'] if previous['wall_time'] > 0 else np.inf
+        memory_text = ''
+        if previous.get('peak_memory_mb') is not None and result.get('peak_memory_mb') is not None:
+            memory_text = f"{previous['peak_memory_mb']:.1f} → {result['peak_memory_mb']:.1f}"
+        marker = ''
+        if ratio >= 1 + threshold:
+            regressions.append(key)
+            marker = '  ⚠ 느려짐'
+        print(f"{key[0]:10s} {key[1]:32s} {previous['wall_time']:10.3f} {result['wall_time']:10.3f} "
+              f"{ratio:6.2f}x {memory_text:>18s}{marker}")
+
+    if regressions:
+        print(f"\n⚠ 실행 시간이 {threshold:.0%} 이상 늘어난 단계: {len(regressions)}개")
+    else:
+        print("\n✓ 성능 저하 없음")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='분석 파이프라인 단계별 벤치마크')
+    parser.add_argument('--datasets', nargs='+', default=DATASETS, choices=DATASETS, help='측정할 데이터셋')
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES), help='측정할 단계')
+    parser.add_argument('--repeat', type=int, default=1, help='단계별 반복 실행 횟수 (최소 실행 시간 사용)')
+    parser.add_argument('--no-memory', action='store_true', help='최대 메모리 측정 생략 (추가 실행 없음)')
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help='원본 데이터 디렉토리 (기본: raw_data/open_track2, 예: raw_data/synthetic/12x10)')
+    parser.add_argument('--output', type=Path, default=None, help='결과 JSON 경로 (기본: benchmarks/results/<커밋>.json)')
+    parser.add_argument('--compare', nargs=2, type=Path, metavar=('OLD', 'NEW'), help='두 결과 JSON 비교')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='성능 저하로 표시할 실행 시간 증가율 (기본 0.10)')
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare_reports(*args.compare, threshold=args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    report = run_benchmarks(args.datasets, args.stages, args.repeat, memory=not args.no_memory,
+                            data_dir=args.data_dir)
+    save_report(report, args.output)
@@ -5,93 +5,23 @@
       롤 템플릿을 구분하여 정의
 """
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from event_store import load_data
+from event_index import EventIndex, event_frame, select_player
+from metric_registry import calculate_profile_set, player_profile, profile_row
+
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 PROJECT_ROOT = Path(__file__).parent.parent
 
-def load_data():
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
-
 def calculate_player_profile(df, player_id):
-    """선수별 행동 프로파일 계산"""
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    if len(player_data) < 50:
-        return None
-    
-    profile = {}
-    
-    # 패스 관련 지표
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        forward_passes = passes[passes['dx'] > 0]
-        profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        profile['long_pass_ratio'] = long_passes / len(passes)
-        
-        # 매우 긴 패스 (30m 이상)
-        very_long_passes = (pass_lengths > 30).sum()
-        profile['very_long_pass_ratio'] = very_long_passes / len(passes)
-        
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        profile['average_pass_length'] = pass_lengths.mean()
-        
-        # 짧은 패스 비율 (10m 이하)
-        short_passes = (pass_lengths <= 10).sum()
-        profile['short_pass_ratio'] = short_passes / len(passes)
-        
-        # 전진 패스 성공률
-        forward_successful = forward_passes[forward_passes['result_name'] == 'Successful']
-        profile['forward_pass_success_rate'] = len(forward_successful) / len(forward_passes) if len(forward_passes) > 0 else 0
-    else:
-        profile['forward_pass_ratio'] = 0
-        profile['long_pass_ratio'] = 0
-        profile['very_long_pass_ratio'] = 0
-        profile['pass_success_rate'] = 0
-        profile['average_pass_length'] = 0
-        profile['short_pass_ratio'] = 0
-        profile['forward_pass_success_rate'] = 0
-    
-    # 공간 활용 지표
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    
-    # 후방 지역 터치 (y < 30)
-    profile['touch_zone_defensive'] = (player_data['start_y'] < 30).sum() / len(player_data)
-    # 중앙 지역 터치 (30 <= y < 50)
-    profile['touch_zone_midfield'] = ((player_data['start_y'] >= 30) & (player_data['start_y'] < 50)).sum() / len(player_data)
-    # 전진 지역 터치 (y >= 50)
-    profile['touch_zone_forward'] = (player_data['start_y'] >= 50).sum() / len(player_data)
-    
-    # 중앙 지역 터치 (x: 30-70)
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & (player_data['start_x'] <= 70)).sum() / len(player_data)
-    
-    # 빌드업 참여도: 연속 패스 플레이 참여 빈도
-    # 간단 버전: 패스 후 다른 선수가 패스를 받는 빈도
-    pass_received = player_data[player_data['type_name'] == 'Pass Received']
-    profile['pass_received_frequency'] = len(pass_received) / len(player_data)
-    
-    # 패스 빈도
-    profile['pass_frequency'] = len(passes) / len(player_data)
-    
-    # 경기당 지표
-    games = player_data['game_id'].nunique()
-    profile['passes_per_game'] = len(passes) / games if games > 0 else 0
-    
-    return profile
+    """선수별 행동 프로파일 계산 (metric_registry의 'build_up' 프로파일)"""
+    return player_profile(df, player_id, 'build_up', min_events=50)
 
 def compare_positions(df):
     """포지션별 평균 프로파일 비교"""
@@ -101,9 +31,13 @@ def compare_positions(df):
     
     positions = ['CM', 'CDM', 'CB']
     position_profiles = {}
+    events = event_frame(df)
+    
+    # 모든 선수 프로파일을 한 번의 스캔으로 계산
+    profile_table = calculate_profile_set(df, 'build_up', min_events=50)
     
     for position in positions:
-        position_players = df[df['main_position'] == position]
+        position_players = events[events['main_position'] == position]
         if len(position_players) == 0:
             continue
         
@@ -111,7 +45,7 @@ def compare_positions(df):
         profiles = []
         
         for player_id in player_ids:
-            profile = calculate_player_profile(df, player_id)
+            profile = profile_row(profile_table, player_id)
             if profile:
                 profiles.append(profile)
         
@@ -164,8 +98,9 @@ def analyze_specific_players(df):
     }
     
     # 이름으로 ID 찾기
+    events = event_frame(df)
     for name in ['민상기', '김영빈', '권경원', '박성훈', '안영규']:
-        players = df[df['player_name_ko'].str.contains(name, na=False)]
+        players = events[events['player_name_ko'].str.contains(name, na=False)]
         if len(players) > 0:
             cb_players[name] = players['player_id'].iloc[0]
     
@@ -187,7 +122,7 @@ def analyze_specific_players(df):
         
         profile = calculate_player_profile(df, player_id)
         if profile:
-            player_data = df[df['player_id'] == player_id]
+            player_data = select_player(df, player_id)
             position = player_data['main_position'].iloc[0]
             results[name] = {
                 'profile': profile,
@@ -287,12 +222,13 @@ def define_roles():
 
 def main():
     df, match_info_df = load_data()
+    events = EventIndex(df)
     
     # 1. 포지션별 평균 비교
-    position_profiles = compare_positions(df)
+    position_profiles = compare_positions(events)
     
     # 2. 특정 선수 비교
-    player_results = analyze_specific_players(df)
+    player_results = analyze_specific_players(events)
     
     # 3. 구분된 롤 템플릿 제안
     role_templates = define_roles()
@@ -7,248 +7,120 @@
 근거: 실제 선수 행동 데이터 기반 (추정치 없음)
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 import json
 
+from event_store import add_partition_arguments, load_data, partition_filters_from_args
+from event_index import EventIndex
+from metric_registry import METRICS_VERSION, calculate_profile_set, player_profile
+from profile_cache import cached_profiles
+from role_discovery import build_position_tasks, discover_position_roles, discover_roles
+
 PROJECT_ROOT = Path(__file__).parent.parent
 
-def load_data():
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+# 지표 정의가 바뀌면 metric_registry.METRICS_VERSION을 증가시켜 프로파일 캐시를 무효화
+PROFILE_VERSION = METRICS_VERSION
 
 def calculate_comprehensive_profile(df, player_id):
-    """선수별 종합 행동 프로파일 계산 (모든 지표 포함)"""
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    if len(player_data) < 50:
-        return None
-    
-    profile = {}
-    
-    # 패스 관련 지표
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        forward_passes = passes[passes['dx'] > 0]
-        profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        very_long_passes = (pass_lengths > 30).sum()
-        short_passes = (pass_lengths <= 10).sum()
-        
-        profile['long_pass_ratio'] = long_passes / len(passes)
-        profile['very_long_pass_ratio'] = very_long_passes / len(passes)
-        profile['short_pass_ratio'] = short_passes / len(passes)
-        profile['average_pass_length'] = pass_lengths.mean()
-        
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        # 전방 패스
-        forward_passes = passes[passes['end_y'] > passes['start_y']]
-        if len(forward_passes) > 0:
-            forward_successful = forward_passes[forward_passes['result_name'] == 'Successful']
-            profile['forward_pass_success_rate'] = len(forward_successful) / len(forward_passes)
-            forward_distances = np.sqrt(
-                (forward_passes['end_x'] - forward_passes['start_x'])**2 +
-                (forward_passes['end_y'] - forward_passes['start_y'])**2
-            )
-            profile['average_forward_pass_distance'] = forward_distances.mean()
-        else:
-            profile['forward_pass_success_rate'] = 0
-            profile['average_forward_pass_distance'] = 0
-    else:
-        profile['forward_pass_ratio'] = 0
-        profile['long_pass_ratio'] = 0
-        profile['very_long_pass_ratio'] = 0
-        profile['short_pass_ratio'] = 0
-        profile['average_pass_length'] = 0
-        profile['pass_success_rate'] = 0
-        profile['forward_pass_success_rate'] = 0
-        profile['average_forward_pass_distance'] = 0
-    
-    # 캐리 관련
-    carries = player_data[player_data['type_name'] == 'Carry']
-    if len(carries) > 0:
-        carry_lengths = np.sqrt(carries['dx']**2 + carries['dy']**2)
-        profile['average_carry_length'] = carry_lengths.mean()
-        profile['carry_frequency'] = len(carries) / len(player_data)
-    else:
-        profile['average_carry_length'] = 0
-        profile['carry_frequency'] = 0
-    
-    # 공간 활용
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & (player_data['start_x'] <= 70)).sum() / len(player_data)
-    profile['touch_zone_wide'] = ((player_data['start_x'] < 30) | (player_data['start_x'] > 70)).sum() / len(player_data)
-    profile['touch_zone_defensive'] = (player_data['start_y'] < 30).sum() / len(player_data)
-    profile['touch_zone_midfield'] = ((player_data['start_y'] >= 30) & (player_data['start_y'] < 50)).sum() / len(player_data)
-    profile['touch_zone_forward'] = (player_data['start_y'] >= 50).sum() / len(player_data)
-    
-    # 수비 행동
-    interventions = player_data[player_data['type_name'] == 'Intervention']
-    blocks = player_data[player_data['type_name'] == 'Block']
-    tackles = player_data[player_data['type_name'] == 'Tackle']
-    clearances = player_data[player_data['type_name'] == 'Clearance']
-    
-    profile['defensive_action_frequency'] = (len(interventions) + len(blocks)) / len(player_data)
-    profile['tackle_frequency'] = len(tackles) / len(player_data)
-    profile['clearance_frequency'] = len(clearances) / len(player_data)
-    
-    # 공격 행동
-    shots = player_data[player_data['type_name'] == 'Shot']
-    profile['shot_frequency'] = len(shots) / len(player_data)
-    
-    # 빌드업 참여
-    profile['pass_frequency'] = len(passes) / len(player_data)
-    pass_received = player_data[player_data['type_name'] == 'Pass Received']
-    profile['pass_received_frequency'] = len(pass_received) / len(player_data)
-    
-    # 경기당 지표
-    games = player_data['game_id'].nunique()
-    profile['passes_per_game'] = len(passes) / games if games > 0 else 0
-    profile['events_per_game'] = len(player_data) / games if games > 0 else 0
-    
-    return profile
+    """선수별 종합 행동 프로파일 계산 (모든 지표 포함, metric_registry의 'comprehensive' 프로파일)"""
+    return player_profile(df, player_id, 'comprehensive', min_events=50)
 
-def cluster_players_by_role(df, position, n_clusters=3, min_events=100):
+def calculate_comprehensive_profiles(df):
     """
-    포지션별 선수들을 클러스터링하여 롤 구분
-    
-    반환: {cluster_id: {'players': [...], 'template': {...}}}
+    모든 선수의 종합 행동 프로파일 테이블 (이벤트 로그 한 번 스캔)
+
+    반환: player_id 인덱스 DataFrame (이벤트 50개 미만 선수 제외, 이벤트 로그에 처음 나온 순서)
     """
-    position_players = df[df['main_position'] == position]
-    player_ids = position_players['player_id'].dropna().unique()
-    
-    profiles = []
-    valid_player_ids = []
-    
-    for player_id in player_ids:
-        profile = calculate_comprehensive_profile(df, player_id)
-        if profile and len(position_players[position_players['player_id'] == player_id]) >= min_events:
-            profiles.append(profile)
-            valid_player_ids.append(player_id)
+    return calculate_profile_set(df, 'comprehensive', min_events=50, sort=False)
+
+def cluster_players_by_role(df, position, n_clusters=3, min_events=100, profiles=None):
+    """
+    포지션별 선수들을 클러스터링하여 롤 구분 (클러스터 수 고정)
     
-    if len(profiles) < n_clusters:
-        print(f"⚠ {position}: 선수 수({len(profiles)})가 클러스터 수({n_clusters})보다 적습니다.")
+    profiles: calculate_comprehensive_profiles 결과 (None이면 한 번의 스캔으로 계산)
+    반환: ({cluster_id: {'player_ids': [...], 'player_count': n, 'template': {...}}}, profile_df, feature_cols)
+    """
+    if profiles is None:
+        profiles = calculate_comprehensive_profiles(df)
+    
+    tasks = build_position_tasks(df, profiles, k_values=[n_clusters], min_events=min_events, min_players=0)
+    task = next((t for t in tasks if t['position'] == position), None)
+    if task is None or len(task['player_ids']) < n_clusters:
+        player_total = 0 if task is None else len(task['player_ids'])
+        print(f"⚠ {position}: 선수 수({player_total})가 클러스터 수({n_clusters})보다 적습니다.")
         return None
     
-    # 프로파일을 데이터프레임으로 변환
-    profile_df = pd.DataFrame(profiles)
-    
-    # 클러스터링에 사용할 핵심 지표 선택 (포지션별로 다를 수 있음)
-    # 모든 지표 사용 (정규화 필요)
-    feature_cols = [col for col in profile_df.columns if col not in ['passes_per_game', 'events_per_game']]
-    
-    if len(feature_cols) == 0:
+    task['k_values'] = [n_clusters]
+    _, templates, diagnostics = discover_position_roles(task)
+    if templates is None:
         return None
     
-    X = profile_df[feature_cols].values
-    
-    # 정규화
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    
-    # KMeans 클러스터링
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    clusters = kmeans.fit_predict(X_scaled)
-    
-    # 클러스터별 결과 정리
     result = {}
     for cluster_id in range(n_clusters):
-        cluster_indices = np.where(clusters == cluster_id)[0]
-        cluster_profiles = [profiles[i] for i in cluster_indices]
-        cluster_player_ids = [valid_player_ids[i] for i in cluster_indices]
-        
-        # 클러스터 평균 프로파일 (롤 템플릿)
-        cluster_template = {}
-        for key in feature_cols:
-            values = [p.get(key, 0) for p in cluster_profiles]
-            cluster_template[key] = np.mean(values)
-        
+        role = diagnostics['roles'][f'롤_{cluster_id}']
         result[cluster_id] = {
-            'player_ids': cluster_player_ids,
-            'player_count': len(cluster_player_ids),
-            'template': cluster_template
+            'player_ids': role['player_ids'],
+            'player_count': role['player_count'],
+            'template': templates[f'롤_{cluster_id}']
         }
     
-    return result, profile_df, feature_cols
+    profile_df = pd.DataFrame(task['X'], columns=task['feature_cols'])
+    return result, profile_df, task['feature_cols']
+
+def define_roles_for_all_positions(df, profiles=None, k_values=None, workers=1, return_diagnostics=False):
+    """
+    모든 포지션에 대해 롤 정의 (role_discovery 엔진: 포지션별 후보 k 평가, 포지션 병렬 처리)
 
-def define_roles_for_all_positions(df):
-    """모든 포지션에 대해 롤 정의"""
+    profiles: calculate_comprehensive_profiles 결과 (None이면 한 번의 스캔으로 계산)
+    k_values: 후보 클러스터 수 목록 (None이면 2 ~ 선수 수 기준 최대 롤 수)
+    workers: 포지션 병렬 처리 프로세스 수
+    return_diagnostics: True면 (롤 템플릿, 진단 정보) 반환
+    """
     print("="*80)
     print("데이터 기반 롤 정의")
     print("="*80)
     print("\n근거: 실제 선수 행동 데이터 기반 클러스터링")
     print("레퍼런스: 없음 (순수 데이터 기반)\n")
     
-    # 충분한 데이터가 있는 포지션만 처리
-    position_counts = df.groupby('main_position')['player_id'].nunique().sort_values(ascending=False)
-    valid_positions = position_counts[position_counts >= 10].index.tolist()  # 최소 10명 이상
+    if profiles is None:
+        profiles = calculate_comprehensive_profiles(df)
     
-    print(f"분석 대상 포지션: {valid_positions}\n")
+    all_role_templates, diagnostics = discover_roles(df, profiles, k_values=k_values, workers=workers)
     
-    all_role_templates = {}
+    print(f"분석 대상 포지션: {list(diagnostics.keys())}\n")
     
-    for position in valid_positions:
+    for position, info in diagnostics.items():
         print(f"\n{'='*80}")
         print(f"{position} 포지션 롤 정의")
         print(f"{'='*80}")
+        print(f"선수 수: {info['player_count']}명")
         
-        player_count = position_counts[position]
-        print(f"선수 수: {player_count}명")
-        
-        # 클러스터 수 결정 (선수 수에 따라)
-        if player_count >= 30:
-            n_clusters = 3
-        elif player_count >= 15:
-            n_clusters = 2
-        else:
-            n_clusters = 1  # 롤 구분 불가
-        
-        if n_clusters == 1:
-            print(f"⚠ 선수 수가 적어 롤 구분 불가. 포지션 평균만 계산합니다.")
-            # 포지션 평균 프로파일 계산
-            position_players = df[df['main_position'] == position]
-            player_ids = position_players['player_id'].dropna().unique()
-            
-            profiles = []
-            for player_id in player_ids:
-                profile = calculate_comprehensive_profile(df, player_id)
-                if profile:
-                    profiles.append(profile)
-            
-            if len(profiles) > 0:
-                template = {}
-                for key in profiles[0].keys():
-                    template[key] = np.mean([p.get(key, 0) for p in profiles])
-                
-                all_role_templates[position] = {
-                    '롤_0': template
-                }
+        if info['selected_k'] == 1:
+            print("⚠ 선수 수가 적어 롤 구분 불가. 포지션 평균만 계산합니다.")
             continue
         
-        # 클러스터링 수행
-        result = cluster_players_by_role(df, position, n_clusters=n_clusters)
-        
-        if result is None:
+        if position not in all_role_templates:
+            print(f"⚠ {position}: 클러스터링 대상 선수 수({info['clustered_players']})가 부족합니다.")
             continue
         
-        clusters, profile_df, feature_cols = result
+        print("\n후보 클러스터 수 평가:")
+        for candidate in info['candidates']:
+            marker = ' ← 선택' if candidate['k'] == info['selected_k'] else ''
+            print(f"  k={candidate['k']}: 실루엣 {candidate['silhouette']:.3f}, 관성 {candidate['inertia']:.1f}{marker}")
+        
+        if k_values is None and info['selected_k'] != info['max_roles']:
+            print(f"\n⚠ 선택된 롤 수({info['selected_k']})가 기존 규칙의 롤 수({info['max_roles']})와 다릅니다.")
+            print("  롤_N 키가 바뀌므로 assign_fm_role_names.py로 role_templates_named.json을 다시 생성해야 합니다.")
         
-        print(f"\n클러스터링 결과 ({n_clusters}개 롤):")
-        for cluster_id, cluster_data in clusters.items():
-            print(f"\n  롤_{cluster_id}: {cluster_data['player_count']}명")
+        print(f"\n클러스터링 결과 ({info['selected_k']}개 롤):")
+        for role_name, template in all_role_templates[position].items():
+            print(f"\n  {role_name}: {info['roles'][role_name]['player_count']}명")
             
             # 대표 지표 출력
-            template = cluster_data['template']
-            print(f"    주요 지표:")
+            print("    주요 지표:")
             key_metrics = ['forward_pass_ratio', 'long_pass_ratio', 'pass_success_rate', 
                           'average_touch_y', 'defensive_action_frequency', 'shot_frequency']
             for metric in key_metrics:
@@ -258,18 +130,13 @@ def define_roles_for_all_positions(df):
                         print(f"      {metric}: {value:.2%}")
                     else:
                         print(f"      {metric}: {value:.2f}")
-        
-        # 롤 템플릿 저장
-        position_roles = {}
-        for cluster_id, cluster_data in clusters.items():
-            position_roles[f'롤_{cluster_id}'] = cluster_data['template']
-        
-        all_role_templates[position] = position_roles
     
+    if return_diagnostics:
+        return all_role_templates, diagnostics
     return all_role_templates
 
-def save_role_templates(templates, output_path):
-    """롤 템플릿을 JSON 파일로 저장"""
+def save_role_templates(templates, output_path, label='롤 템플릿'):
+    """롤 템플릿(또는 롤 발견 진단 정보)을 JSON 파일로 저장 (label: 저장 메시지에 표시할 이름)"""
     # JSON 직렬화를 위해 numpy 타입 변환
     def convert_numpy(obj):
         if isinstance(obj, np.integer):
@@ -293,17 +160,27 @@ def save_role_templates(templates, output_path):
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(cleaned_templates, f, ensure_ascii=False, indent=2)
     
-    print(f"\n✓ 롤 템플릿 저장: {output_path}")
+    print(f"\n✓ {label} 저장: {output_path}")
 
-def main():
-    df, match_info_df = load_data()
+def main(k_values=None, workers=1, filters=None):
+    filters = filters or {}
+    df, match_info_df = load_data(**filters)
+    
+    # 선수 종합 프로파일 (선수 구간 조회는 이벤트 인덱스 사용, 데이터가 같으면 프로파일 캐시 사용)
+    events = EventIndex(df)
+    profiles = cached_profiles('comprehensive', PROFILE_VERSION, lambda: calculate_comprehensive_profiles(events),
+                               filters=filters)
     
     # 모든 포지션에 대해 롤 정의
-    role_templates = define_roles_for_all_positions(df)
+    role_templates, diagnostics = define_roles_for_all_positions(
+        events, profiles, k_values=k_values, workers=workers, return_diagnostics=True
+    )
     
     # 결과 저장
     output_path = PROJECT_ROOT / 'analysis' / 'role_templates_data_based.json'
     save_role_templates(role_templates, output_path)
+    save_role_templates(diagnostics, PROJECT_ROOT / 'analysis' / 'role_discovery_diagnostics.json',
+                        label='롤 발견 진단 정보')
     
     print("\n" + "="*80)
     print("롤 정의 완료")
@@ -313,7 +190,22 @@ def main():
     print("\n주의: 이 롤들은 데이터 기반으로 자동 생성된 것이므로,")
     print("      실제 축구 도메인에서 사용되는 롤 이름과 다를 수 있습니다.")
     print("      필요시 도메인 전문가가 각 롤에 적절한 이름을 부여해야 합니다.")
+    
+    # 기존 규칙과 롤 수가 달라진 포지션 (롤_N 키 기준인 role_templates_named.json이 맞지 않게 됨)
+    changed = [position for position, info in diagnostics.items()
+               if k_values is None and info['selected_k'] is not None and info['selected_k'] != info['max_roles']]
+    if changed:
+        print(f"\n⚠ 롤 수가 기존 규칙과 다른 포지션: {', '.join(changed)}")
+        print("  python analysis/assign_fm_role_names.py로 role_templates_named.json을 다시 생성하세요.")
 
 if __name__ == '__main__':
-    main()
-
+    parser = argparse.ArgumentParser(description='데이터 기반 롤 정의 (포지션별 KMeans 모델 선택)')
+    parser.add_argument('--k', type=int, nargs='+', help='후보 클러스터 수 (기본: 2 ~ 선수 수 기준 최대 롤 수)')
+    parser.add_argument('--workers', type=int, default=1, help='포지션 병렬 처리 프로세스 수 (기본 1)')
+    add_partition_arguments(parser)
+    args = parser.parse_args()
+    
+    try:
+        main(k_values=args.k, workers=args.workers, filters=partition_filters_from_args(args))
+    except ValueError as error:
+        parser.error(str(error))
@@ -11,16 +11,17 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from event_store import load_data
+from event_index import EventIndex, event_frame, select_player
+from metric_registry import calculate_metrics
+
 PROJECT_ROOT = Path(__file__).parent.parent
 
-def load_data():
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+BUILD_UP_METRICS = ['build_up_participation_ratio', 'build_up_start_ratio']
 
 def analyze_forward_passing(df, player_id):
     """전방 패스 패턴 분석"""
-    player_data = df[df['player_id'] == player_id].copy()
+    player_data = select_player(df, player_id).copy()
     passes = player_data[player_data['type_name'] == 'Pass']
     
     if len(passes) == 0:
@@ -52,40 +53,24 @@ def analyze_forward_passing(df, player_id):
     return result
 
 def analyze_build_up_start(df, player_id):
-    """빌드업 시작점 역할 분석"""
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    # 패스를 받은 후 바로 패스를 하는 빈도 (빌드업 중간 참여)
-    pass_received = player_data[player_data['type_name'] == 'Pass Received']
-    
-    build_up_participation = 0
-    for idx, row in pass_received.iterrows():
-        # 패스를 받은 후 3초 이내에 패스를 하는지
-        next_events = player_data[(player_data['game_id'] == row['game_id']) & 
-                                  (player_data['action_id'] > row['action_id']) &
-                                  (player_data['time_seconds'] <= row['time_seconds'] + 3)]
-        if len(next_events[next_events['type_name'] == 'Pass']) > 0:
-            build_up_participation += 1
-    
-    # 패스를 받기 전에 다른 선수가 패스를 했는지 (빌드업 시작점)
-    build_up_start = 0
-    for idx, row in pass_received.iterrows():
-        prev_events = player_data[(player_data['game_id'] == row['game_id']) & 
-                                  (player_data['action_id'] < row['action_id']) &
-                                  (player_data['time_seconds'] >= row['time_seconds'] - 3)]
-        if len(prev_events[prev_events['type_name'] == 'Pass']) == 0:
-            build_up_start += 1
+    """
+    빌드업 시작점 역할 분석 (metric_registry 빌드업 지표, event_windows 시간 윈도우)
+
+    - 중간 참여: 패스를 받은 후 3초 이내에 패스를 하는 비율
+    - 시작점: 패스를 받기 전 3초 이내에 패스가 없는 비율
+    (시각 비교는 같은 경기/피리어드 안에서만)
+    """
+    metrics = calculate_metrics(select_player(df, player_id), BUILD_UP_METRICS)
     
-    result = {
-        'build_up_participation_ratio': build_up_participation / len(pass_received) if len(pass_received) > 0 else 0,
-        'build_up_start_ratio': build_up_start / len(pass_received) if len(pass_received) > 0 else 0,
-    }
+    result = {metric: 0 for metric in BUILD_UP_METRICS}
+    if player_id in metrics.index:
+        result.update({metric: float(metrics.at[player_id, metric]) for metric in BUILD_UP_METRICS})
     
     return result
 
 def analyze_pass_purpose(df, player_id):
     """패스 목적 분석"""
-    player_data = df[df['player_id'] == player_id].copy()
+    player_data = select_player(df, player_id).copy()
     passes = player_data[player_data['type_name'] == 'Pass']
     
     if len(passes) == 0:
@@ -124,8 +109,9 @@ def compare_players_detailed(df):
     
     # 선수 ID 찾기
     players = {}
+    events = event_frame(df)
     for name in ['박진섭', '민상기', '김영빈', '권경원', '박성훈', '안영규', '기성용', '정우영', '윤빛가람']:
-        found = df[df['player_name_ko'].str.contains(name, na=False)]
+        found = events[events['player_name_ko'].str.contains(name, na=False)]
         if len(found) > 0:
             players[name] = found['player_id'].iloc[0]
     
@@ -134,7 +120,7 @@ def compare_players_detailed(df):
     print("\n[1. 전방 패스 패턴 분석]")
     print("-"*80)
     for name, player_id in players.items():
-        player_data = df[df['player_id'] == player_id]
+        player_data = select_player(df, player_id)
         position = player_data['main_position'].iloc[0]
         
         forward_analysis = analyze_forward_passing(df, player_id)
@@ -234,7 +220,7 @@ def compare_players_detailed(df):
 
 def main():
     df, match_info_df = load_data()
-    compare_players_detailed(df)
+    compare_players_detailed(EventIndex(df))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,174 @@
+"""
+이벤트 로그 인덱스 (player_id / team_id / game_id → 연속 행 구간)
+
+목적: 함수마다 df[df['team_id'] == team_id] 같은 불리언 마스크로 전체 로그를 다시 스캔하는 대신,
+      로드 직후 한 번 정렬하고 키별 오프셋 테이블을 만들어 O(1) 슬라이스(복사 없는 iloc 구간)로 조회
+
+- 기본 순서: (game_id, action_id) - 경기 / 경기 내 순서
+- 선수/팀 순서: (키, game_id, action_id) - 처음 조회할 때 한 번 정렬하여 보관
+  (팀-경기, 선수-경기 구간도 같은 정렬에서 연속 구간으로 조회)
+
+select_* 함수는 DataFrame과 EventIndex를 모두 받으므로
+분석 함수는 어느 쪽을 넘겨받아도 같은 결과를 반환
+"""
+
+import numpy as np
+
+SORT_COLUMNS = ['game_id', 'action_id']
+
+
+def _offset_table(*key_arrays):
+    """정렬된 키 배열 → {키: (시작, 끝)} (키가 여러 개면 튜플 키)"""
+    n = len(key_arrays[0])
+    if n == 0:
+        return {}
+
+    change = np.zeros(n - 1, dtype=bool)
+    for keys in key_arrays:
+        change |= keys[1:] != keys[:-1]
+    starts = np.concatenate([[0], np.flatnonzero(change) + 1])
+    ends = np.concatenate([starts[1:], [n]])
+
+    if len(key_arrays) == 1:
+        keys = key_arrays[0][starts].tolist()
+    else:
+        keys = list(zip(*(k[starts].tolist() for k in key_arrays)))
+    return dict(zip(keys, zip(starts.tolist(), ends.tolist())))
+
+
+class EventIndex:
+    """
+    정렬된 이벤트 로그 + 키별 오프셋 테이블
+
+    사용 예:
+        index = EventIndex(df)
+        index.team(team_id)               # 팀 이벤트
+        index.team_game(team_id, game_id) # 팀의 한 경기 이벤트
+        index.player(player_id)           # 선수 이벤트
+    """
+
+    def __init__(self, df):
+        self._source = df
+        self._events = None
+        self._orders = {}
+
+    @classmethod
+    def from_sorted(cls, frame, key):
+        """
+        (key, game_id, action_id) 순으로 이미 정렬된 프레임으로 인덱스 생성 (복사 없음)
+
+        예: 메모리 맵 이벤트 스토어를 워커 프로세스에서 열 때 (key 이외의 조회는 처음 사용할 때 정렬)
+        """
+        index = cls(frame)
+        index._orders[key] = index._build_order(frame, key)
+        return index
+
+    @property
+    def events(self):
+        """(game_id, action_id) 순 이벤트 (처음 사용할 때 정렬, 같은 키 안에서는 원래 순서 유지)"""
+        if self._events is None:
+            self._events = self._source.sort_values(SORT_COLUMNS, kind='mergesort').reset_index(drop=True)
+        return self._events
+
+    def __len__(self):
+        return len(self._source)
+
+    @staticmethod
+    def _build_order(frame, key):
+        key_values = frame[key].to_numpy()
+        return {
+            'frame': frame,
+            'offsets': _offset_table(key_values),
+            'game_offsets': _offset_table(key_values, frame['game_id'].to_numpy()),
+        }
+
+    def _order(self, key):
+        """key 기준 정렬 프레임과 오프셋 테이블 (처음 사용할 때 생성)"""
+        if key not in self._orders:
+            if key == 'game_id':
+                frame = self.events
+            else:
+                frame = self.events[self.events[key].notna()]
+                frame = frame.sort_values(key, kind='mergesort').reset_index(drop=True)
+            self._orders[key] = self._build_order(frame, key)
+        return self._orders[key]
+
+    def sorted_frame(self, key):
+        """(key, game_id, action_id) 순으로 정렬된 이벤트 (key가 결측인 행 제외)"""
+        return self._order(key)['frame']
+
+    def _slice(self, key, value, game_id=None):
+        order = self._order(key)
+        if game_id is None:
+            bounds = order['offsets'].get(value)
+        else:
+            bounds = order['game_offsets'].get((value, game_id))
+        if bounds is None:
+            return order['frame'].iloc[0:0]
+        return order['frame'].iloc[bounds[0]:bounds[1]]
+
+    def game(self, game_id):
+        """경기 이벤트 (action_id 순)"""
+        return self._slice('game_id', game_id)
+
+    def team(self, team_id):
+        """팀 이벤트 (game_id, action_id 순)"""
+        return self._slice('team_id', team_id)
+
+    def player(self, player_id):
+        """선수 이벤트 (game_id, action_id 순)"""
+        return self._slice('player_id', player_id)
+
+    def team_game(self, team_id, game_id):
+        """팀의 한 경기 이벤트"""
+        return self._slice('team_id', team_id, game_id)
+
+    def player_game(self, player_id, game_id):
+        """선수의 한 경기 이벤트"""
+        return self._slice('player_id', player_id, game_id)
+
+    def game_ids(self):
+        return np.array(list(self._order('game_id')['offsets'].keys()))
+
+    def team_ids(self):
+        return np.array(list(self._order('team_id')['offsets'].keys()))
+
+    def player_ids(self):
+        return np.array(list(self._order('player_id')['offsets'].keys()))
+
+
+def event_frame(data):
+    """DataFrame 또는 EventIndex → 이벤트 DataFrame"""
+    if isinstance(data, EventIndex):
+        return data.events
+    return data
+
+
+def select_game(data, game_id):
+    if isinstance(data, EventIndex):
+        return data.game(game_id)
+    return data[data['game_id'] == game_id]
+
+
+def select_team(data, team_id):
+    if isinstance(data, EventIndex):
+        return data.team(team_id)
+    return data[data['team_id'] == team_id]
+
+
+def select_player(data, player_id):
+    if isinstance(data, EventIndex):
+        return data.player(player_id)
+    return data[data['player_id'] == player_id]
+
+
+def select_team_game(data, team_id, game_id):
+    if isinstance(data, EventIndex):
+        return data.team_game(team_id, game_id)
+    return data[(data['game_id'] == game_id) & (data['team_id'] == team_id)]
+
+
+def select_player_game(data, player_id, game_id):
+    if isinstance(data, EventIndex):
+        return data.player_game(player_id, game_id)
+    return data[(data['game_id'] == game_id) & (data['player_id'] == player_id)]
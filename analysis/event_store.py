@@ -0,0 +1,580 @@
+"""
+이벤트 로그 컬럼형 캐시 및 공용 데이터 로더
+
+목적: 모든 분석/검증 스크립트가 매번 raw_data.csv를 기본 dtype으로 다시 파싱하는 대신,
+      CSV를 한 번만 타입 지정된 컬럼형 파일로 변환하여 재사용
+
+- 범주형: type_name, result_name, team_name_ko, main_position
+- float32: 좌표 (start_x, start_y, end_x, end_y, dx, dy)
+- int32: game_id, action_id, period_id, team_id
+  (player_id는 결측치가 있고 기존 코드가 float ID를 사용하므로 float64 유지)
+- 점유 라벨: possession_id, possession_start, possession_end, possession_team_id, possession_outcome
+  (ingest 단계에서 한 번 계산, possession.py)
+
+캐시 형식: pyarrow가 설치되어 있으면 Parquet, 없으면 pickle (둘 다 범주형/정수형 dtype 보존)
+캐시 무효화: 원본 CSV의 크기/수정 시각이 바뀌면 SHA-1 해시를 다시 계산해 비교
+
+메모리 맵 스토어: 컬럼별 .npy 파일 (문자열/범주형은 코드 + 카테고리 목록)
+                  여러 워커 프로세스가 같은 이벤트 로그를 복사 없이 읽기 전용으로 공유할 때 사용
+
+파티션 스토어: 시즌(season_id) / 대회(competition_id) / game_id 구간별 파일 + 매니페스트
+               cache/partitions/season_id=2024/competition_id=1/game_id=126000-126999/part-00000.parquet
+               시즌/대회/팀 조건이 있으면 매니페스트로 해당 파티션만 골라 읽음 (load_data(seasons=..., ...))
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from possession import add_possession_columns
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DATA_DIR = PROJECT_ROOT / 'raw_data' / 'open_track2'
+CACHE_DIR = RAW_DATA_DIR / 'cache'
+
+EVENTS_CSV = RAW_DATA_DIR / 'raw_data.csv'
+MATCH_INFO_CSV = RAW_DATA_DIR / 'match_info.csv'
+
+CATEGORY_COLUMNS = ['type_name', 'result_name', 'team_name_ko', 'main_position']
+FLOAT32_COLUMNS = ['start_x', 'start_y', 'end_x', 'end_y', 'dx', 'dy']
+INT32_COLUMNS = ['game_id', 'action_id', 'period_id', 'team_id']
+
+# 캐시 레이아웃/dtype 정의가 바뀌면 증가시켜 기존 캐시를 무효화
+CACHE_VERSION = 2
+
+# 스트리밍 읽기 기본 청크 크기 (행 수)
+STREAM_CHUNK_ROWS = 200_000
+
+# 파티션 스토어 (캐시 디렉토리 아래) / 파티션 하나의 game_id 구간 폭
+PARTITION_DIR_NAME = 'partitions'
+PARTITION_GAME_RANGE = 1000
+# 경기 정보에 없는 경기의 시즌/대회 값
+UNKNOWN_PARTITION = -1
+# 파티션 파일에 함께 저장하는 원본 행 번호 (읽을 때 원본 순서 복원 후 제거)
+ROW_COLUMN = '_row'
+
+
+def cache_format():
+    """사용 가능한 컬럼형 포맷 선택"""
+    try:
+        import pyarrow  # noqa: F401
+        return 'parquet'
+    except ImportError:
+        return 'pickle'
+
+
+def _file_hash(path, chunk_size=1 << 20):
+    """파일 SHA-1 해시"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_signature(path):
+    stat = Path(path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _typed_events(df):
+    """파싱한 이벤트 → 정수형 컬럼 변환 + 점유 라벨 컬럼"""
+    for col in INT32_COLUMNS:
+        if col in df.columns and df[col].notna().all():
+            df[col] = df[col].astype('int32')
+    return add_possession_columns(df)
+
+
+def _read_events_csv(path):
+    """raw_data.csv를 타입 지정하여 파싱 (점유 라벨 컬럼 포함)"""
+    dtypes = {col: 'category' for col in CATEGORY_COLUMNS}
+    dtypes.update({col: 'float32' for col in FLOAT32_COLUMNS})
+    return _typed_events(pd.read_csv(path, dtype=dtypes))
+
+
+def iter_event_chunks(source_path=EVENTS_CSV, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    raw_data.csv를 경기 단위 청크로 나누어 읽기 (전체 이벤트 로그를 메모리에 올리지 않음)
+
+    청크 끝에 걸친 경기는 다음 청크와 합쳐서 반환하므로 경기 하나가 두 청크로 나뉘지 않음
+    (점유 라벨 / 이벤트 윈도우 필터는 경기 안에서만 계산되므로 청크별 결과가 전체 로딩과 같음)
+    각 청크는 _read_events_csv와 같은 dtype + 점유 라벨 컬럼
+
+    raw_data.csv는 경기별로 연속된 행이어야 함 (이미 반환한 경기가 다시 나오면 ValueError)
+    메모리: 청크 크기 + 경기 하나
+    """
+    dtypes = {col: 'float32' for col in FLOAT32_COLUMNS}
+    seen_games = set()
+
+    def finish(events):
+        games = pd.unique(events['game_id'])
+        if seen_games.intersection(games.tolist()):
+            raise ValueError(f"{source_path}: 경기별로 연속된 행이 아닙니다 (같은 game_id가 떨어져 있음)")
+        seen_games.update(games.tolist())
+        for col in CATEGORY_COLUMNS:
+            if col in events.columns:
+                events[col] = events[col].astype('category')
+        return _typed_events(events.reset_index(drop=True))
+
+    carry = None
+    for chunk in pd.read_csv(source_path, dtype=dtypes, chunksize=chunk_rows):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        is_last_game = (chunk['game_id'] == chunk['game_id'].iloc[-1]).to_numpy()
+        carry = chunk[is_last_game]
+        if not is_last_game.all():
+            yield finish(chunk[~is_last_game])
+    if carry is not None and len(carry) > 0:
+        yield finish(carry)
+
+
+def _meta_path(cache_path):
+    return cache_path.with_suffix('.meta.json')
+
+
+def _is_cache_valid(cache_path, source_path):
+    """캐시 메타데이터와 원본 파일을 비교하여 캐시 유효성 확인"""
+    meta_path = _meta_path(cache_path)
+    if not cache_path.exists() or not meta_path.exists():
+        return False
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+
+    if meta.get('version') != CACHE_VERSION:
+        return False
+
+    signature = _source_signature(source_path)
+    if signature['size'] != meta.get('size'):
+        return False
+    if signature['mtime_ns'] == meta.get('mtime_ns'):
+        return True
+
+    # 수정 시각만 바뀐 경우 (복사/touch) 내용 해시로 재확인
+    if _file_hash(source_path) != meta.get('sha1'):
+        return False
+
+    meta['mtime_ns'] = signature['mtime_ns']
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return True
+
+
+def build_event_cache(source_path=EVENTS_CSV, cache_dir=CACHE_DIR):
+    """
+    raw_data.csv를 컬럼형 캐시로 변환 (ingest 단계)
+
+    반환: 타입 지정된 이벤트 DataFrame
+    """
+    fmt = cache_format()
+    cache_path = Path(cache_dir) / f'events.{fmt}'
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    df = _read_events_csv(source_path)
+    if fmt == 'parquet':
+        df.to_parquet(cache_path, index=False)
+    else:
+        df.to_pickle(cache_path)
+
+    meta = dict(_source_signature(source_path))
+    meta.update({
+        'version': CACHE_VERSION,
+        'sha1': _file_hash(source_path),
+        'format': fmt,
+        'rows': len(df),
+    })
+    with open(_meta_path(cache_path), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    return df
+
+
+def load_events(source_path=EVENTS_CSV, cache_dir=CACHE_DIR, use_cache=True):
+    """
+    이벤트 로그 로딩 (캐시가 유효하면 캐시에서, 아니면 CSV를 변환하여 캐시 생성)
+    """
+    if not use_cache:
+        return _read_events_csv(source_path)
+
+    fmt = cache_format()
+    cache_path = Path(cache_dir) / f'events.{fmt}'
+
+    if _is_cache_valid(cache_path, source_path):
+        if fmt == 'parquet':
+            return pd.read_parquet(cache_path)
+        return pd.read_pickle(cache_path)
+
+    print(f"이벤트 캐시 생성 중: {cache_path}")
+    return build_event_cache(source_path, cache_dir)
+
+
+def data_hash(events_path=EVENTS_CSV, match_info_path=MATCH_INFO_CSV, cache_dir=CACHE_DIR):
+    """
+    이벤트 스토어 내용 해시 (raw_data.csv + match_info.csv SHA-1)
+
+    이벤트 캐시가 유효하면 캐시 메타데이터에 기록된 SHA-1을 사용 (원본 CSV를 다시 읽지 않음)
+    """
+    cache_path = Path(cache_dir) / f'events.{cache_format()}'
+    if _is_cache_valid(cache_path, events_path):
+        with open(_meta_path(cache_path), 'r', encoding='utf-8') as f:
+            events_sha1 = json.load(f)['sha1']
+    else:
+        events_sha1 = _file_hash(events_path)
+
+    digest = hashlib.sha1()
+    digest.update(events_sha1.encode())
+    digest.update(_file_hash(match_info_path).encode())
+    return digest.hexdigest()
+
+
+def load_match_info(source_path=MATCH_INFO_CSV):
+    """경기 정보 로딩 (작은 테이블이므로 CSV 직접 파싱)"""
+    return pd.read_csv(source_path)
+
+
+def load_event_batch(events_path, match_info_path):
+    """
+    새 경기 묶음 로딩 (raw_data.csv / match_info.csv와 같은 형식, 캐시 없이 타입 지정하여 파싱)
+
+    반환: (이벤트 DataFrame, 경기 정보 DataFrame)
+    """
+    return _read_events_csv(events_path), load_match_info(match_info_path)
+
+
+def build_mmap_store(df, store_dir):
+    """
+    이벤트 DataFrame을 메모리 맵 스토어로 저장 (행 순서 유지)
+
+    숫자형 컬럼은 그대로, 그 외 컬럼은 범주형 코드(int32) + 카테고리 목록으로 저장
+    (원래 범주형이 아닌 문자열 컬럼은 열 때 원래 dtype으로 복원)
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        entry = {'name': col, 'file': f'col_{i}.npy'}
+        if isinstance(values.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(values):
+            categorical = values.astype('category')
+            np.save(store_dir / entry['file'], categorical.cat.codes.to_numpy().astype(np.int32))
+            entry['categories'] = categorical.cat.categories.tolist()
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                entry['dtype'] = str(values.dtype)
+        else:
+            np.save(store_dir / entry['file'], values.to_numpy())
+        columns.append(entry)
+
+    with open(store_dir / 'store.json', 'w', encoding='utf-8') as f:
+        json.dump({'rows': len(df), 'columns': columns}, f, ensure_ascii=False)
+
+
+def open_mmap_store(store_dir):
+    """
+    메모리 맵 스토어를 읽기 전용 DataFrame으로 열기
+
+    숫자형/범주형 컬럼은 복사하지 않음 (문자열 컬럼만 메모리에 복원)
+    """
+    store_dir = Path(store_dir)
+    with open(store_dir / 'store.json', 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+
+    data = {}
+    for entry in meta['columns']:
+        values = np.load(store_dir / entry['file'], mmap_mode='r')
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, categories=entry['categories'], validate=False)
+            if 'dtype' in entry:
+                values = pd.Series(values).astype(entry['dtype']).to_numpy()
+        data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def _game_partition_keys(game_ids, match_info_df):
+    """game_id → (시즌 배열, 대회 배열) (경기 정보에 없는 경기는 UNKNOWN_PARTITION)"""
+    games = match_info_df.drop_duplicates('game_id').set_index('game_id')
+    game_ids = pd.Series(np.asarray(game_ids))
+    keys = []
+    for col in ('season_id', 'competition_id'):
+        if col in games.columns:
+            values = game_ids.map(games[col]).fillna(UNKNOWN_PARTITION)
+        else:
+            values = pd.Series(UNKNOWN_PARTITION, index=game_ids.index)
+        keys.append(values.astype('int64').to_numpy())
+    return keys[0], keys[1]
+
+
+def _games_with_teams(events, teams=None):
+    """팀이 뛴 경기의 이벤트만 (상대 팀 이벤트 포함, teams가 None이면 그대로)"""
+    if teams is None:
+        return events
+    games = events.loc[events['team_id'].isin(list(teams)), 'game_id'].unique()
+    return events[events['game_id'].isin(games)]
+
+
+def _match_info_for(match_info_df, events):
+    """이벤트에 있는 경기의 경기 정보만"""
+    return match_info_df[match_info_df['game_id'].isin(pd.unique(events['game_id']))].reset_index(drop=True)
+
+
+def filter_events(df, match_info_df, seasons=None, competitions=None, teams=None):
+    """
+    시즌 / 대회 / 팀 조건으로 이벤트와 경기 정보 필터 (전체 로딩 후 필터, load_partitions와 같은 결과)
+
+    seasons / competitions: season_id / competition_id 목록 (None이면 전체)
+    teams: team_id 목록 - 해당 팀이 뛴 경기의 모든 이벤트 (상대 팀 이벤트 포함)
+    반환: (이벤트 DataFrame, 경기 정보 DataFrame)
+    """
+    season_ids, competition_ids = _game_partition_keys(df['game_id'], match_info_df)
+    keep = np.ones(len(df), dtype=bool)
+    if seasons is not None:
+        keep &= np.isin(season_ids, list(seasons))
+    if competitions is not None:
+        keep &= np.isin(competition_ids, list(competitions))
+    events = _games_with_teams(df[keep], teams).reset_index(drop=True)
+    return events, _match_info_for(match_info_df, events)
+
+
+def filter_label(seasons=None, competitions=None, teams=None):
+    """필터 조건 → 캐시 파일 이름용 문자열 (조건이 없으면 빈 문자열)"""
+    parts = []
+    for key, values in (('season', seasons), ('competition', competitions), ('team', teams)):
+        if values is not None:
+            parts.append(f"{key}-{'-'.join(str(v) for v in sorted(values))}")
+    return '_'.join(parts)
+
+
+def _store_paths(source_path):
+    """raw_data.csv 경로 → (match_info.csv 경로, 파티션 스토어 디렉토리) (load_data(data_dir)와 같은 배치)"""
+    source_dir = Path(source_path).parent
+    return source_dir / MATCH_INFO_CSV.name, source_dir / CACHE_DIR.name / PARTITION_DIR_NAME
+
+
+def build_partitioned_store(source_path=EVENTS_CSV, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    raw_data.csv → 시즌 / 대회 / game_id 구간 파티션 스토어 (경기 단위 청크로 스트리밍 변환)
+
+    파티션마다 청크별 파일(part-00000.parquet ...)로 저장하므로 전체 이벤트 로그를 메모리에 올리지 않음
+    각 행에 원본 행 번호(_row)를 함께 저장 → 여러 파티션을 읽어도 원본 순서로 복원
+    매니페스트: 파티션별 시즌/대회/game_id 구간/행 수/경기 수/팀 목록 + 범주형 컬럼 전체 카테고리
+
+    반환: 매니페스트 딕셔너리
+    """
+    match_info_path, store_dir = _store_paths(source_path)
+    fmt = cache_format()
+    _meta_path(store_dir).unlink(missing_ok=True)
+    if store_dir.exists():
+        shutil.rmtree(store_dir)
+    store_dir.mkdir(parents=True)
+    match_info_df = load_match_info(match_info_path)
+
+    partitions = {}
+    categories = {}
+    offset = 0
+    for chunk_no, events in enumerate(iter_event_chunks(source_path, chunk_rows)):
+        events[ROW_COLUMN] = np.arange(offset, offset + len(events), dtype=np.int64)
+        offset += len(events)
+        for col in CATEGORY_COLUMNS:
+            if col in events.columns:
+                categories.setdefault(col, set()).update(events[col].cat.categories.tolist())
+
+        season_ids, competition_ids = _game_partition_keys(events['game_id'], match_info_df)
+        range_starts = events['game_id'].to_numpy() // PARTITION_GAME_RANGE * PARTITION_GAME_RANGE
+        for key, part in events.groupby([season_ids, competition_ids, range_starts], sort=False):
+            season_id, competition_id, range_start = (int(value) for value in key)
+            entry = partitions.get((season_id, competition_id, range_start))
+            if entry is None:
+                path = (f'season_id={season_id}/competition_id={competition_id}/'
+                        f'game_id={range_start}-{range_start + PARTITION_GAME_RANGE - 1}')
+                entry = partitions[(season_id, competition_id, range_start)] = {
+                    'season_id': season_id, 'competition_id': competition_id,
+                    'game_id_min': range_start, 'game_id_max': range_start + PARTITION_GAME_RANGE - 1,
+                    'path': path, 'files': [], 'rows': 0, 'games': set(), 'team_ids': set(),
+                    'first_row': int(part[ROW_COLUMN].iloc[0]),
+                }
+                (store_dir / path).mkdir(parents=True)
+
+            file_name = f'{entry["path"]}/part-{chunk_no:05d}.{fmt}'
+            if fmt == 'parquet':
+                part.to_parquet(store_dir / file_name, index=False)
+            else:
+                part.reset_index(drop=True).to_pickle(store_dir / file_name)
+            entry['files'].append(file_name)
+            entry['rows'] += len(part)
+            entry['games'].update(part['game_id'].unique().tolist())
+            entry['team_ids'].update(part['team_id'].dropna().unique().tolist())
+
+    entries = []
+    for entry in sorted(partitions.values(), key=lambda e: (e['season_id'], e['competition_id'], e['game_id_min'])):
+        entry.update(games=len(entry['games']), team_ids=sorted(int(team_id) for team_id in entry['team_ids']))
+        entries.append(entry)
+    manifest = {
+        'format': fmt,
+        'game_range': PARTITION_GAME_RANGE,
+        'rows': offset,
+        'categories': {col: sorted(values) for col, values in categories.items()},
+        'partitions': entries,
+    }
+    with open(store_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 메타데이터는 마지막에 기록 (중간에 실패하면 스토어가 무효로 남아 다시 생성됨)
+    meta = dict(_source_signature(source_path))
+    meta.update({
+        'version': CACHE_VERSION,
+        'sha1': _file_hash(source_path),
+        'match_info_sha1': _file_hash(match_info_path),
+        'format': fmt,
+        'rows': offset,
+    })
+    with open(_meta_path(store_dir), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    return manifest
+
+
+def _is_store_valid(source_path):
+    """파티션 스토어 유효성 (원본 이벤트 로그 + 시즌/대회 구분에 쓴 경기 정보 + 저장 형식)"""
+    match_info_path, store_dir = _store_paths(source_path)
+    if not _is_cache_valid(store_dir, source_path):
+        return False
+    with open(_meta_path(store_dir), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    return meta.get('format') == cache_format() and meta.get('match_info_sha1') == _file_hash(match_info_path)
+
+
+def open_partitioned_store(source_path=EVENTS_CSV):
+    """파티션 스토어 매니페스트 (스토어가 없거나 원본이 바뀌었으면 다시 생성)"""
+    _, store_dir = _store_paths(source_path)
+    if not _is_store_valid(source_path):
+        print(f"파티션 스토어 생성 중: {store_dir}")
+        return build_partitioned_store(source_path)
+    with open(store_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def select_partitions(manifest, seasons=None, competitions=None, teams=None):
+    """매니페스트에서 조건에 맞는 파티션만 선택 (파일은 읽지 않음, 원본 순서)"""
+    seasons = None if seasons is None else set(seasons)
+    competitions = None if competitions is None else set(competitions)
+    teams = None if teams is None else set(teams)
+    selected = [
+        entry for entry in manifest['partitions']
+        if (seasons is None or entry['season_id'] in seasons)
+        and (competitions is None or entry['competition_id'] in competitions)
+        and (teams is None or not teams.isdisjoint(entry['team_ids']))
+    ]
+    return sorted(selected, key=lambda entry: entry['first_row'])
+
+
+def _read_partition_files(store_dir, files, manifest):
+    """파티션 파일들 → 원본 행 순서 이벤트 DataFrame (범주형은 전체 카테고리 목록으로 통일)"""
+    frames = [pd.read_parquet(store_dir / name) if manifest['format'] == 'parquet' else pd.read_pickle(store_dir / name)
+              for name in files]
+    events = pd.concat(frames, ignore_index=True)
+    for col, values in manifest['categories'].items():
+        events[col] = pd.Categorical(events[col], categories=values)
+    events = events.sort_values(ROW_COLUMN, kind='stable')
+    return events.drop(columns=ROW_COLUMN).reset_index(drop=True)
+
+
+def iter_partitions(seasons=None, competitions=None, teams=None, source_path=EVENTS_CSV):
+    """
+    조건에 맞는 파티션을 하나씩 읽기 (파티션 = 완전한 경기들, 스트리밍 집계용)
+
+    반환: 파티션별 이벤트 DataFrame 이터레이터 (원본 순서, teams 조건이면 해당 팀 경기만)
+    """
+    _, store_dir = _store_paths(source_path)
+    manifest = open_partitioned_store(source_path)
+    for entry in select_partitions(manifest, seasons, competitions, teams):
+        events = _games_with_teams(_read_partition_files(store_dir, entry['files'], manifest), teams)
+        if len(events) > 0:
+            yield events.reset_index(drop=True)
+
+
+def load_partitions(seasons=None, competitions=None, teams=None, source_path=EVENTS_CSV):
+    """
+    조건에 맞는 파티션만 읽어 이벤트 로딩 (filter_events(load_events(...), ...)와 같은 결과)
+
+    시즌/대회 조건은 파티션 단위로 정확히 걸러지고, 팀 조건은 팀 목록으로 파티션을 거른 뒤 경기 단위로 필터
+    반환: 이벤트 DataFrame (조건에 맞는 경기가 없으면 ValueError)
+    """
+    _, store_dir = _store_paths(source_path)
+    manifest = open_partitioned_store(source_path)
+    selected = select_partitions(manifest, seasons, competitions, teams)
+    if not selected:
+        raise ValueError(f"조건에 맞는 경기가 없습니다: {filter_label(seasons, competitions, teams)}")
+
+    files = [name for entry in selected for name in entry['files']]
+    events = _games_with_teams(_read_partition_files(store_dir, files, manifest), teams)
+    print(f"  파티션 로딩: {len(selected)}/{len(manifest['partitions'])}개 파티션, {len(events):,}개 이벤트")
+    return events.reset_index(drop=True)
+
+
+def add_partition_arguments(parser):
+    """--season / --competition 옵션 추가 (파티션 스토어에서 해당 경기만 로딩)"""
+    parser.add_argument('--season', type=int, nargs='+', default=None, metavar='SEASON_ID',
+                        help='분석할 시즌 (match_info.csv season_id, 기본: 전체)')
+    parser.add_argument('--competition', type=int, nargs='+', default=None, metavar='COMPETITION_ID',
+                        help='분석할 대회 (match_info.csv competition_id, 기본: 전체)')
+
+
+def partition_filters_from_args(args):
+    """add_partition_arguments로 받은 옵션 → load_data 필터 인자"""
+    return {'seasons': args.season, 'competitions': args.competition}
+
+
+@timed('load')
+def load_data(use_cache=True, data_dir=None, seasons=None, competitions=None, teams=None):
+    """
+    데이터 로딩 (모든 분석/검증 스크립트 공용)
+
+    data_dir: raw_data.csv / match_info.csv가 있는 디렉토리 (None이면 raw_data/open_track2,
+              합성 데이터 등 다른 디렉토리면 캐시는 data_dir/cache에 저장)
+    seasons / competitions / teams: 해당 시즌/대회/팀 경기만 로딩 (filter_events 참고)
+              캐시를 사용하면 파티션 스토어에서 조건에 맞는 파티션만 읽음 (전체 로딩 후 필터하지 않음)
+    """
+    events_path = EVENTS_CSV if data_dir is None else Path(data_dir) / EVENTS_CSV.name
+    match_info_path, _ = _store_paths(events_path)
+    filtered = any(values is not None for values in (seasons, competitions, teams))
+
+    if filtered and use_cache:
+        df = load_partitions(seasons, competitions, teams, events_path)
+        return df, _match_info_for(load_match_info(match_info_path), df)
+
+    if data_dir is None:
+        df = load_events(use_cache=use_cache)
+        match_info_df = load_match_info()
+    else:
+        data_dir = Path(data_dir)
+        df = load_events(data_dir / EVENTS_CSV.name, data_dir / CACHE_DIR.name, use_cache=use_cache)
+        match_info_df = load_match_info(data_dir / MATCH_INFO_CSV.name)
+    if filtered:
+        return filter_events(df, match_info_df, seasons, competitions, teams)
+    return df, match_info_df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='이벤트 로그 캐시 / 파티션 스토어 생성')
+    parser.add_argument('--partitions', action='store_true', help='시즌/대회/game_id 구간 파티션 스토어 생성')
+    add_partition_arguments(parser)
+    parser.add_argument('--team', type=int, nargs='+', default=None, metavar='TEAM_ID',
+                        help='파티션 선택 확인용 팀 조건 (--season / --competition과 함께)')
+    args = parser.parse_args()
+
+    if args.partitions:
+        manifest = build_partitioned_store()
+        print(f"✓ 파티션 스토어 생성 완료: {len(manifest['partitions'])}개 파티션, {manifest['rows']:,} 행")
+        selected = select_partitions(manifest, teams=args.team, **partition_filters_from_args(args))
+        for entry in selected:
+            print(f"  {entry['path']}: {entry['rows']:,} 행, {entry['games']}경기")
+    else:
+        events = build_event_cache()
+        print(f"✓ 이벤트 캐시 생성 완료: {len(events):,} 행 ({cache_format()})")
+        print(f"  메모리 사용량: {events.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
@@ -0,0 +1,92 @@
+"""
+이벤트 시퀀스 시간 윈도우 엔진 (정렬된 시간 배열 + searchsorted)
+
+목적: 기준 이벤트(예: 패스 받기)마다 선수 이벤트 전체를 시간 조건으로 다시 필터링하는 대신 (선수별 O(n²)),
+      (선수, 경기, 피리어드, action_id) 순으로 한 번 정렬하고 대상 이벤트(예: 패스) 위치를 searchsorted로 찾아
+      모든 선수의 기준 이벤트에 대해 "N초 이내 이후/이전 대상 이벤트가 있는지"를 한 번에 계산
+
+- 이후: 같은 구간에서 action_id가 더 크고 time_seconds <= 기준 시각 + N인 대상 이벤트
+- 이전: 같은 구간에서 action_id가 더 작고 time_seconds >= 기준 시각 - N인 대상 이벤트
+- 구간: (선수, 경기, 피리어드) - time_seconds는 피리어드 내 시각이므로 피리어드를 넘어 비교하지 않음
+"""
+
+import numpy as np
+import pandas as pd
+
+# 시퀀스 구간 키 (없는 컬럼은 건너뜀, 예: period_id가 없는 로그)
+WINDOW_KEYS = ['player_id', 'game_id', 'period_id']
+
+# 빌드업 판정 시간 윈도우 (초)
+BUILD_UP_WINDOW = 3
+
+
+def sorted_groups(events, keys):
+    """(keys..., action_id) 정렬 순서와 정렬된 행의 구간 번호, 키 결측 여부"""
+    order = np.lexsort([events[key].to_numpy() for key in reversed(keys + ['action_id'])])
+    n = len(order)
+
+    change = np.zeros(n, dtype=bool)
+    valid = np.ones(n, dtype=bool)
+    if n > 0:
+        change[0] = True
+    for key in keys:
+        values = events[key].to_numpy()[order]
+        change[1:] |= values[1:] != values[:-1]
+        valid &= pd.notna(values)
+    return order, np.cumsum(change) - 1, valid
+
+
+def window_has_event(events, anchor_mask, target_mask, seconds, direction='after', keys=None):
+    """
+    기준 이벤트마다 같은 구간 안에 seconds초 이내의 이후/이전 대상 이벤트가 있는지
+
+    events: 이벤트 DataFrame (행 순서 무관)
+    anchor_mask, target_mask: 기준/대상 이벤트 불리언 배열 (events와 같은 길이)
+    direction: 'after' (이후) 또는 'before' (이전)
+    keys: 구간 키 (None이면 WINDOW_KEYS 중 events에 있는 컬럼)
+
+    반환: events 행 순서의 불리언 배열 (기준 이벤트가 아니거나 구간 키가 결측이면 False)
+    """
+    if direction not in ('after', 'before'):
+        raise ValueError(f"알 수 없는 방향: {direction}")
+    if keys is None:
+        keys = [key for key in WINDOW_KEYS if key in events.columns]
+
+    n = len(events)
+    result = np.zeros(n, dtype=bool)
+    if n == 0:
+        return result
+
+    order, group, valid = sorted_groups(events, list(keys))
+    time = events['time_seconds'].to_numpy(dtype=float)[order]
+    anchor_pos = np.flatnonzero(np.asarray(anchor_mask)[order] & valid)
+    target_pos = np.flatnonzero(np.asarray(target_mask)[order] & valid)
+    if len(anchor_pos) == 0 or len(target_pos) == 0:
+        return result
+
+    target_group = group[target_pos]
+    target_time = time[target_pos]
+    anchor_group = group[anchor_pos]
+    anchor_time = time[anchor_pos]
+
+    if direction == 'after':
+        # 각 대상 이벤트부터 구간 끝까지의 최소 시각 (구간별 역방향 누적 최소, 시각 결측 대상은 제외)
+        times = pd.Series(np.where(np.isnan(target_time), np.inf, target_time)[::-1])
+        bound = times.groupby(target_group[::-1]).cummin().to_numpy()[::-1]
+        nearest = np.searchsorted(target_pos, anchor_pos, side='right')
+        found = nearest < len(target_pos)
+        nearest = np.minimum(nearest, len(target_pos) - 1)
+        hit = found & (target_group[nearest] == anchor_group) & (bound[nearest] <= anchor_time + seconds)
+    else:
+        # 구간 시작부터 각 대상 이벤트까지의 최대 시각 (구간별 누적 최대)
+        times = pd.Series(np.where(np.isnan(target_time), -np.inf, target_time))
+        bound = times.groupby(target_group).cummax().to_numpy()
+        nearest = np.searchsorted(target_pos, anchor_pos, side='left') - 1
+        found = nearest >= 0
+        nearest = np.maximum(nearest, 0)
+        hit = found & (target_group[nearest] == anchor_group) & (bound[nearest] >= anchor_time - seconds)
+
+    sorted_result = np.zeros(n, dtype=bool)
+    sorted_result[anchor_pos] = hit
+    result[order] = sorted_result
+    return result
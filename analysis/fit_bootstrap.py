@@ -0,0 +1,115 @@
+"""
+롤 적합도 / 랭킹 부트스트랩 신뢰구간 (경기 단위 재표집)
+
+목적: 표본 크기 보정(최소 5경기, 200개 이벤트, 신뢰도 기하평균)만으로는 점수의 불확실성을 알 수 없으므로,
+      선수마다 출전 경기를 복원 추출하여 프로파일과 적합도 점수를 다시 계산한 분포로 신뢰구간을 구함
+      (pandas 프로파일 계산을 재표집 횟수만큼 반복하지 않도록 배열 연산으로 처리)
+
+방법:
+1. 선수-경기별 가산 통계 (metric_registry.metric_stats, by=['player_id', 'game_id']) - 이벤트 로그 한 번 스캔
+2. 재표집 가중치: 선수의 경기 수 g에 대해 다항분포 (B × g) - 경기별 통계와 행렬 곱하면 재표집 통계
+3. 모든 선수의 재표집 통계를 한 번에 지표로 변환 (finalize_profile_set) → 적합도 점수 일괄 계산 (role_fit)
+4. 점수 신뢰구간: 재표집 점수 백분위수 / 랭킹 구간: 재표집마다 포지션-롤 내 순위를 매긴 뒤 순위 백분위수
+
+팀 승률 / WAR는 경기 결과 기반 팀 지표이므로 재표집하지 않고 원래 값 사용
+"""
+
+import numpy as np
+import pandas as pd
+
+from event_index import event_frame
+from instrumentation import timed
+from metric_registry import finalize_profile_set, metric_stats, profile_set_metrics
+from role_fit import calculate_role_fit_matrix, profiles_to_matrix
+
+# 재표집 횟수 / 신뢰수준 / 난수 시드 (같은 데이터면 같은 구간)
+BOOTSTRAP_SAMPLES = 500
+CI_LEVEL = 0.95
+BOOTSTRAP_SEED = 42
+
+# 재표집할 프로파일 (profile_engine 랭킹 정의)
+PROFILE_SET = 'ranking'
+
+
+def player_game_stats(df, player_ids=None, name=PROFILE_SET):
+    """
+    선수-경기별 가산 통계 (이벤트 로그 한 번 스캔)
+
+    player_ids: 대상 선수 (None이면 전체)
+    반환: (player_id, game_id) MultiIndex DataFrame (선수 순, 선수 내 경기 순)
+    """
+    events = event_frame(df)
+    if player_ids is not None:
+        events = events[events['player_id'].isin(player_ids)]
+    return metric_stats(events, profile_set_metrics(name), by=['player_id', 'game_id'])
+
+
+@timed('bootstrap')
+def bootstrap_profiles(df, player_ids=None, n_samples=BOOTSTRAP_SAMPLES, seed=BOOTSTRAP_SEED, name=PROFILE_SET):
+    """
+    선수별 경기 복원 추출 프로파일
+
+    반환: (player_id, sample) MultiIndex 프로파일 DataFrame (선수마다 n_samples행, 컬럼: PROFILE_SETS[name])
+    """
+    stats = player_game_stats(df, player_ids, name)
+    rng = np.random.default_rng(seed)
+
+    player_index = stats.index.get_level_values('player_id')
+    players, starts, game_counts = np.unique(player_index.to_numpy(), return_index=True, return_counts=True)
+    values = stats.to_numpy(dtype=float)
+
+    resampled = np.empty((len(players) * n_samples, values.shape[1]))
+    for i, (start, games) in enumerate(zip(starts, game_counts)):
+        weights = rng.multinomial(games, np.full(games, 1.0 / games), size=n_samples)
+        resampled[i * n_samples:(i + 1) * n_samples] = weights @ values[start:start + games]
+
+    index = pd.MultiIndex.from_product([pd.Index(players, name='player_id'), range(n_samples)],
+                                       names=['player_id', 'sample'])
+    return finalize_profile_set(pd.DataFrame(resampled, index=index, columns=stats.columns), name)
+
+
+def bootstrap_fit_scores(samples, player_ids, template_matrix, team_win_rate=None, war=None):
+    """
+    재표집 프로파일 → 적합도 점수 분포
+
+    samples: bootstrap_profiles 결과
+    player_ids: 점수를 계산할 선수 (samples에 있어야 함)
+    team_win_rate, war: 선수별 배열 (재표집하지 않는 값)
+
+    반환: (선수 × 재표집 × 템플릿) 적합도 점수 배열 (표본 크기 보정 포함)
+    """
+    n_samples = samples.index.get_level_values('sample').max() + 1
+    player_profiles = samples.loc[list(player_ids)]
+    n_players = len(player_ids)
+
+    def repeated(values):
+        return None if values is None else np.repeat(np.asarray(values, dtype=float), n_samples)
+
+    scores = calculate_role_fit_matrix(
+        profiles_to_matrix(player_profiles), template_matrix,
+        game_count=player_profiles['game_count'].to_numpy(dtype=float),
+        event_count=player_profiles['event_count'].to_numpy(dtype=float),
+        war=repeated(war),
+        team_win_rate=repeated(team_win_rate),
+    )
+    return scores['fit_score'].reshape(n_players, n_samples, -1)
+
+
+def score_intervals(fit_samples, level=CI_LEVEL):
+    """재표집 점수 → (하한, 상한) 백분위수 구간 (선수 × 템플릿)"""
+    alpha = (1 - level) / 2 * 100
+    low, high = np.nanpercentile(fit_samples, [alpha, 100 - alpha], axis=1)
+    return low, high
+
+
+def rank_intervals(fit_samples, level=CI_LEVEL):
+    """
+    재표집마다 선수 순위(1 = 최고 점수)를 매긴 뒤 순위 백분위수 구간
+
+    반환: (하한, 상한) 정수 순위 배열 (선수 × 템플릿)
+    """
+    keyed = np.nan_to_num(-fit_samples, nan=np.inf)
+    ranks = keyed.argsort(axis=0, kind='stable').argsort(axis=0, kind='stable') + 1
+    alpha = (1 - level) / 2 * 100
+    low, high = np.percentile(ranks, [alpha, 100 - alpha], axis=1)
+    return np.floor(low).astype(int), np.ceil(high).astype(int)
@@ -0,0 +1,258 @@
+"""
+팀 × 경기 결과 행렬 및 리그 전체 WAR 계산
+
+목적: 선수마다, 경기마다 match_info_df[match_info_df['game_id'] == game_id]를 스캔하는 대신
+      팀 × 경기 결과 행렬(승/무/패, 득점, 실점, 승점)을 한 번 만들고
+      - (team_id, game_id) 쌍 조회 및 임의 경기 집합의 성과 집계 (aggregate_team_games)
+      - 선수 × 경기 출전 행렬과 곱해 모든 선수의 WAR를 한 번에 계산 (calculate_league_war)
+
+WAR (Wins Above Replacement): 선수가 뛴 경기 승률 - 선수가 뛰지 않은 팀 경기 승률
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 경기 결과 코드 (팀 관점)
+RESULT_LOSS = -1
+RESULT_DRAW = 0
+RESULT_WIN = 1
+
+# 결과별 승점
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+
+def build_team_game_results(match_info_df, game_ids=None):
+    """
+    팀 × 경기 결과 행렬 생성
+
+    game_ids: 행렬의 경기 축 (None이면 match_info_df의 경기)
+              match_info_df에 없는 경기는 결과 없음(played=False)으로 남음
+
+    반환: {
+        'team_ids', 'game_ids': 각 축의 ID 배열,
+        'played': 팀이 해당 경기를 치렀는지 (teams × games, bool),
+        'is_home': 팀이 해당 경기의 홈팀인지 (teams × games, bool),
+        'result': 팀 관점 결과 코드 (1 승, 0 무, -1 패; 치르지 않은 경기는 0),
+        'points': 팀 관점 승점 (승 3, 무 1, 패/치르지 않은 경기 0),
+        'goals_for', 'goals_against': 팀 관점 득점/실점 (치르지 않은 경기는 0),
+        'home_win', 'away_win': 경기별 홈/원정 승리 여부 (games,)
+    }
+    """
+    matches = match_info_df.drop_duplicates('game_id')
+
+    if game_ids is None:
+        game_ids = matches['game_id'].to_numpy()
+    game_ids = np.asarray(game_ids)
+
+    team_ids = np.unique(np.concatenate([
+        matches['home_team_id'].to_numpy(), matches['away_team_id'].to_numpy()
+    ]))
+
+    n_teams = len(team_ids)
+    n_games = len(game_ids)
+
+    # 행렬 경기 축 기준으로 match_info 정렬 (없는 경기는 -1)
+    match_pos = pd.Index(matches['game_id']).get_indexer(game_ids)
+    has_info = match_pos >= 0
+    info = matches.iloc[match_pos[has_info]]
+    cols = np.flatnonzero(has_info)
+
+    home_rows = np.searchsorted(team_ids, info['home_team_id'].to_numpy())
+    away_rows = np.searchsorted(team_ids, info['away_team_id'].to_numpy())
+    home_score = info['home_score'].to_numpy()
+    away_score = info['away_score'].to_numpy()
+
+    played = np.zeros((n_teams, n_games), dtype=bool)
+    is_home = np.zeros((n_teams, n_games), dtype=bool)
+    result = np.zeros((n_teams, n_games), dtype=np.int8)
+    goals_for = np.zeros((n_teams, n_games))
+    goals_against = np.zeros((n_teams, n_games))
+
+    played[home_rows, cols] = True
+    played[away_rows, cols] = True
+    is_home[home_rows, cols] = True
+    result[home_rows, cols] = np.sign(home_score - away_score)
+    result[away_rows, cols] = np.sign(away_score - home_score)
+    goals_for[home_rows, cols] = home_score
+    goals_against[home_rows, cols] = away_score
+    goals_for[away_rows, cols] = away_score
+    goals_against[away_rows, cols] = home_score
+
+    points = np.where(result == RESULT_WIN, POINTS_WIN, 0) + np.where(played & (result == RESULT_DRAW), POINTS_DRAW, 0)
+
+    home_win = np.zeros(n_games, dtype=bool)
+    away_win = np.zeros(n_games, dtype=bool)
+    home_win[cols] = home_score > away_score
+    away_win[cols] = away_score > home_score
+
+    return {
+        'team_ids': team_ids,
+        'game_ids': game_ids,
+        'played': played,
+        'is_home': is_home,
+        'result': result,
+        'points': points,
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'home_win': home_win,
+        'away_win': away_win,
+    }
+
+
+def build_appearance_matrix(df, game_ids):
+    """
+    선수 × 경기 출전 행렬 (희소 행렬)
+
+    반환: (player_ids, appearances) - appearances[i, j]는 선수 i가 경기 game_ids[j]에 이벤트를 남겼으면 1
+    """
+    events = df[df['player_id'].notna()]
+    pairs = pd.DataFrame({
+        'player_id': events['player_id'].to_numpy(),
+        'game_id': events['game_id'].to_numpy(),
+    }).drop_duplicates()
+
+    player_codes, player_ids = pd.factorize(pairs['player_id'], sort=True)
+    game_codes = pd.Index(game_ids).get_indexer(pairs['game_id'])
+
+    appearances = sparse.csr_matrix(
+        (np.ones(len(pairs)), (player_codes, game_codes)),
+        shape=(len(player_ids), len(game_ids))
+    )
+    return player_ids, appearances
+
+
+def calculate_league_war(df, match_info_df):
+    """
+    리그 전체 선수의 팀 승률 및 WAR 계산
+
+    - 선수의 팀: 이벤트 로그에서 선수의 첫 이벤트 팀
+    - 출전 경기 승리: 팀이 홈이면 홈 승리, 아니면 원정 승리로 판정
+    - 미출전 경기: 팀이 치른 경기(match_info 기준) 중 선수가 이벤트를 남기지 않은 경기
+
+    반환: player_id 인덱스 DataFrame (team_win_rate, war, war_games_with, war_games_without)
+    """
+    events = df[df['player_id'].notna()]
+    game_ids = np.union1d(match_info_df['game_id'].unique(), events['game_id'].unique())
+
+    results = build_team_game_results(match_info_df, game_ids)
+    player_ids, appearances = build_appearance_matrix(events, game_ids)
+    n_teams = len(results['team_ids'])
+
+    # 팀 관점 승리 행렬 (팀이 홈이 아닌 경기는 원정 승리로 판정)
+    win = np.where(results['is_home'], results['home_win'], results['away_win'])
+    played_win = results['played'] & win
+
+    # 선수 × 팀 집계 (희소 출전 행렬 × 팀 × 경기 행렬)
+    wins_by_team = appearances @ win.T.astype(float)
+    played_by_team = appearances @ results['played'].T.astype(float)
+    played_wins_by_team = appearances @ played_win.T.astype(float)
+
+    # 선수의 첫 이벤트 팀 (match_info에 없는 팀은 결과 없음)
+    first_events = events.drop_duplicates('player_id').set_index('player_id')
+    player_team_ids = first_events.loc[player_ids, 'team_id'].to_numpy()
+    team_rows = np.searchsorted(results['team_ids'], player_team_ids)
+    team_rows = np.minimum(team_rows, n_teams - 1)
+    known_team = results['team_ids'][team_rows] == player_team_ids
+
+    rows = np.arange(len(player_ids))
+    games_with = np.asarray(appearances.sum(axis=1)).ravel()
+    wins_with = np.where(known_team, wins_by_team[rows, team_rows], 0)
+
+    team_games = results['played'].sum(axis=1)
+    team_wins = played_win.sum(axis=1)
+    games_without = np.where(known_team, team_games[team_rows] - played_by_team[rows, team_rows], 0)
+    wins_without = np.where(known_team, team_wins[team_rows] - played_wins_by_team[rows, team_rows], 0)
+
+    team_win_rate = np.divide(wins_with, games_with, out=np.full(len(player_ids), 0.5), where=games_with > 0)
+    win_rate_without = np.divide(wins_without, games_without, out=np.zeros(len(player_ids)),
+                                 where=games_without > 0)
+
+    # 미출전 경기가 없으면 (모든 경기 출전) WAR는 0
+    war = np.where(games_without > 0, team_win_rate - win_rate_without, 0.0)
+
+    return pd.DataFrame({
+        'team_win_rate': team_win_rate,
+        'war': war,
+        'war_games_with': games_with.astype(int),
+        'war_games_without': games_without.astype(int),
+    }, index=pd.Index(player_ids, name='player_id'))
+
+
+def lookup_team_games(results, team_ids, game_ids):
+    """
+    (team_id, game_id) 쌍 → 팀 관점 경기 결과 (벡터화 조회)
+
+    team_ids: 스칼라 또는 game_ids와 같은 길이의 배열 (경기마다 팀이 다른 경우, 예: 이적 선수)
+    결과 행렬에 없는 팀/경기 또는 팀이 치르지 않은 경기는 played=False, 0점
+
+    반환: {'played', 'win', 'draw', 'loss', 'points', 'goals_for', 'goals_against'} (각각 (games,) 배열)
+    """
+    game_ids = np.asarray(game_ids)
+    team_ids = np.broadcast_to(np.asarray(team_ids), game_ids.shape)
+    n_teams = len(results['team_ids'])
+
+    cols = pd.Index(results['game_ids']).get_indexer(game_ids)
+    rows = np.minimum(np.searchsorted(results['team_ids'], team_ids), max(n_teams - 1, 0))
+    valid = cols >= 0
+    if n_teams > 0:
+        valid &= results['team_ids'][rows] == team_ids
+        valid &= results['played'][rows, np.where(valid, cols, 0)]
+    else:
+        valid[:] = False
+
+    def pick(matrix):
+        values = np.zeros(len(game_ids), dtype=matrix.dtype)
+        values[valid] = matrix[rows[valid], cols[valid]]
+        return values
+
+    result = pick(results['result'])
+    return {
+        'played': valid,
+        'win': valid & (result == RESULT_WIN),
+        'draw': valid & (result == RESULT_DRAW),
+        'loss': valid & (result == RESULT_LOSS),
+        'points': pick(results['points']),
+        'goals_for': pick(results['goals_for']),
+        'goals_against': pick(results['goals_against']),
+    }
+
+
+def aggregate_team_games(results, team_ids, game_ids):
+    """
+    경기 집합의 팀 성과 집계
+
+    team_ids: 스칼라 또는 경기별 팀 배열 (player_game_teams 결과 등)
+    분모(game_count)는 전달된 경기 수 (결과를 알 수 없는 경기도 포함)
+
+    반환: {'game_count', 'wins', 'draws', 'losses', 'points', 'goals_for', 'goals_against',
+           'win_rate', 'avg_goals_for', 'avg_goals_against'}
+    """
+    game_ids = np.asarray(list(game_ids))
+    game_count = len(game_ids)
+    vectors = lookup_team_games(results, team_ids, game_ids)
+
+    totals = {
+        'game_count': game_count,
+        'wins': int(vectors['win'].sum()),
+        'draws': int(vectors['draw'].sum()),
+        'losses': int(vectors['loss'].sum()),
+        'points': int(vectors['points'].sum()),
+        'goals_for': vectors['goals_for'].sum(),
+        'goals_against': vectors['goals_against'].sum(),
+    }
+    totals['win_rate'] = totals['wins'] / game_count if game_count > 0 else 0
+    totals['avg_goals_for'] = totals['goals_for'] / game_count if game_count > 0 else 0
+    totals['avg_goals_against'] = totals['goals_against'] / game_count if game_count > 0 else 0
+    return totals
+
+
+def player_game_teams(player_data, game_ids):
+    """
+    선수의 경기별 소속 팀 (해당 경기 첫 이벤트의 team_id)
+
+    선수가 이벤트를 남기지 않은 경기는 -1 (결과 조회 시 제외)
+    """
+    first_events = player_data.drop_duplicates('game_id').set_index('game_id')['team_id']
+    return first_events.reindex(np.asarray(list(game_ids))).fillna(-1).to_numpy()
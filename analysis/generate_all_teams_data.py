@@ -7,16 +7,26 @@ GitHub Pages 웹 서비스를 위한 JSON 데이터 생성
 import pandas as pd
 import numpy as np
 import json
+import argparse
+import tempfile
+from multiprocessing import Pool
 from pathlib import Path
 from collections import defaultdict
 
+from event_store import (add_partition_arguments, build_mmap_store, load_data, open_mmap_store,
+                         partition_filters_from_args)
+from event_index import EventIndex, event_frame, select_player, select_team
+from game_results import calculate_league_war
+from profile_cache import cached_profiles
+from metric_registry import METRICS_VERSION, calculate_profile_set, profile_row
+from profile_engine import PROFILE_COLUMNS, PROFILE_METRICS, get_player_profile
+from role_fit import SCORE_KEYS, score_profiles, templates_to_matrix
+from instrumentation import add_profile_arguments, profile_session_from_args, timed
+
 PROJECT_ROOT = Path(__file__).parent.parent
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+# 지표 정의가 바뀌면 metric_registry.METRICS_VERSION을 증가시켜 프로파일 캐시를 무효화
+PROFILE_VERSION = METRICS_VERSION
 
 def load_role_templates():
     """롤 템플릿 로딩"""
@@ -24,356 +34,243 @@ def load_role_templates():
     with open(template_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-# jeonbuk_team_analysis.py의 함수들을 import하거나 복사
-# 간단하게 필요한 함수들을 여기에 포함
-def calculate_player_profile(df, player_id, match_info_df):
-    """선수 행동 프로파일 계산 (jeonbuk_team_analysis.py에서 복사)"""
-    from scipy.spatial.distance import cosine, euclidean
-    
-    player_data = df[df['player_id'] == player_id].copy()
+def _war_columns(profiles, war_table):
+    """프로파일 테이블에 팀 승률/WAR 컬럼 추가 (WAR 테이블에 없는 선수는 승률 0.5, WAR 0.0)"""
+    if war_table is None:
+        war_table = pd.DataFrame(columns=['team_win_rate', 'war', 'war_games_with', 'war_games_without'])
+    war_rows = war_table.reindex(profiles.index)
+    profiles['team_win_rate'] = war_rows['team_win_rate'].fillna(0.5).to_numpy(dtype=float)
+    profiles['war'] = war_rows['war'].fillna(0.0).to_numpy(dtype=float)
+    profiles['war_games_with'] = war_rows['war_games_with'].fillna(0).to_numpy(dtype=float).astype(int)
+    profiles['war_games_without'] = war_rows['war_games_without'].fillna(0).to_numpy(dtype=float).astype(int)
+    return profiles[PROFILE_COLUMNS]
+
+def calculate_player_profile(df, player_id, match_info_df, war_table=None):
+    """
+    선수 행동 프로파일 계산 (metric_registry의 'teams_data' 프로파일)
+
+    war_table: calculate_league_war 결과 (None이면 해당 선수만으로 계산)
+    """
+    player_data = select_player(df, player_id)
     
     if len(player_data) == 0:
         return None
     
-    game_count = player_data['game_id'].nunique()
-    event_count = len(player_data)
-    
-    # WAR (Wins Above Replacement) 계산
-    # 선수가 뛴 경기에서의 팀 승률 vs 선수가 뛰지 않은 경기에서의 팀 승률 비교
-    team_win_rate = None
-    war = None
-    war_games_with = 0
-    war_games_without = 0
+    # WAR (Wins Above Replacement): 선수가 뛴 경기 팀 승률 - 뛰지 않은 경기 팀 승률
+    # (팀 × 경기 결과 행렬 기반 리그 WAR 테이블에서 조회)
+    if match_info_df is None:
+        war_table = None
+    elif war_table is None:
+        war_table = calculate_league_war(player_data, match_info_df)
     
-    if match_info_df is not None:
-        player_games = player_data['game_id'].unique()
-        player_team_id = player_data['team_id'].iloc[0] if len(player_data) > 0 else None
-        
-        if player_team_id is not None:
-            # 선수가 뛴 경기에서의 팀 승률
-            wins_with = 0
-            games_with = len(player_games)
-            
-            for game_id in player_games:
-                game_info = match_info_df[match_info_df['game_id'] == game_id]
-                if len(game_info) > 0:
-                    is_home = game_info['home_team_id'].iloc[0] == player_team_id
-                    home_score = game_info['home_score'].iloc[0]
-                    away_score = game_info['away_score'].iloc[0]
-                    
-                    if is_home:
-                        if home_score > away_score:
-                            wins_with += 1
-                    else:
-                        if away_score > home_score:
-                            wins_with += 1
-            
-            if games_with > 0:
-                team_win_rate = wins_with / games_with
-            
-            # 선수가 뛰지 않은 경기에서의 팀 승률
-            # 해당 팀의 모든 경기 찾기
-            team_games = match_info_df[
-                (match_info_df['home_team_id'] == player_team_id) | 
-                (match_info_df['away_team_id'] == player_team_id)
-            ]['game_id'].unique()
-            
-            # 선수가 뛰지 않은 경기
-            games_without = [g for g in team_games if g not in player_games]
-            wins_without = 0
-            games_without_count = len(games_without)
-            
-            for game_id in games_without:
-                game_info = match_info_df[match_info_df['game_id'] == game_id]
-                if len(game_info) > 0:
-                    is_home = game_info['home_team_id'].iloc[0] == player_team_id
-                    home_score = game_info['home_score'].iloc[0]
-                    away_score = game_info['away_score'].iloc[0]
-                    
-                    if is_home:
-                        if home_score > away_score:
-                            wins_without += 1
-                    else:
-                        if away_score > home_score:
-                            wins_without += 1
-            
-            # WAR 계산: 선수가 뛴 경기 승률 - 선수가 뛰지 않은 경기 승률
-            if games_with > 0 and games_without_count > 0:
-                win_rate_with = wins_with / games_with
-                win_rate_without = wins_without / games_without_count
-                war = win_rate_with - win_rate_without
-                war_games_with = games_with
-                war_games_without = games_without_count
-            elif games_with > 0:
-                # 선수가 뛰지 않은 경기가 없으면 (모든 경기 출전) WAR는 0으로 설정
-                war = 0.0
-                war_games_with = games_with
-                war_games_without = 0
-    
-    # 패스 관련
-    passes = player_data[player_data['type_name'] == 'Pass'].copy()
-    if len(passes) > 0:
-        passes['pass_length'] = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        forward_passes = passes[passes['dx'] > 0]
-        profile = {
-            'forward_pass_ratio': len(forward_passes) / len(passes),
-            'long_pass_ratio': (passes['pass_length'] > 20).sum() / len(passes),
-            'very_long_pass_ratio': (passes['pass_length'] > 30).sum() / len(passes),
-            'short_pass_ratio': (passes['pass_length'] <= 10).sum() / len(passes),
-            'average_pass_length': passes['pass_length'].mean(),
-            'pass_success_rate': (passes['result_name'] == 'Successful').sum() / len(passes),
-            'forward_pass_success_rate': (forward_passes['result_name'] == 'Successful').sum() / len(forward_passes) if len(forward_passes) > 0 else 0,
-            'average_forward_pass_distance': forward_passes['pass_length'].mean() if len(forward_passes) > 0 else 0,
-        }
-    else:
-        profile = {
-            'forward_pass_ratio': 0, 'long_pass_ratio': 0, 'very_long_pass_ratio': 0,
-            'short_pass_ratio': 0, 'average_pass_length': 0, 'pass_success_rate': 0,
-            'forward_pass_success_rate': 0, 'average_forward_pass_distance': 0,
-        }
-    
-    # 캐리 관련
-    carries = player_data[player_data['type_name'] == 'Carry'].copy()
-    if len(carries) > 0:
-        carries['carry_length'] = np.sqrt(carries['dx']**2 + carries['dy']**2)
-        profile['average_carry_length'] = carries['carry_length'].mean()
-        profile['carry_frequency'] = len(carries) / len(player_data)
-    else:
-        profile['average_carry_length'] = 0
-        profile['carry_frequency'] = 0
-    
-    # 터치 위치
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & (player_data['start_x'] <= 70)).sum() / len(player_data)
-    profile['touch_zone_wide'] = ((player_data['start_x'] < 30) | (player_data['start_x'] > 70)).sum() / len(player_data)
-    profile['touch_zone_defensive'] = (player_data['start_y'] < 33.3).sum() / len(player_data)
-    profile['touch_zone_midfield'] = ((player_data['start_y'] >= 33.3) & (player_data['start_y'] <= 66.6)).sum() / len(player_data)
-    profile['touch_zone_forward'] = (player_data['start_y'] > 66.6).sum() / len(player_data)
-    
-    # 수비 행동
-    defensive_actions = player_data[player_data['type_name'].isin(['Tackle', 'Interception', 'Clearance', 'Recovery'])]
-    profile['defensive_action_frequency'] = len(defensive_actions) / len(player_data)
-    profile['tackle_frequency'] = (player_data['type_name'] == 'Tackle').sum() / len(player_data)
-    profile['clearance_frequency'] = (player_data['type_name'] == 'Clearance').sum() / len(player_data)
-    
-    # 슈팅
-    profile['shot_frequency'] = (player_data['type_name'] == 'Shot').sum() / len(player_data)
-    
-    # 패스 빈도
-    profile['pass_frequency'] = len(passes) / len(player_data)
-    profile['pass_received_frequency'] = (player_data['type_name'] == 'Pass Received').sum() / len(player_data)
-    
-    profile['game_count'] = game_count
-    profile['event_count'] = event_count
-    profile['team_win_rate'] = team_win_rate if team_win_rate is not None else 0.5
-    profile['war'] = war if war is not None else 0.0
-    profile['war_games_with'] = war_games_with
-    profile['war_games_without'] = war_games_without
-    
-    return profile
+    profiles = _war_columns(calculate_profile_set(player_data, 'teams_data'), war_table)
+    return profile_row(profiles, player_id)
 
 def calculate_role_fit_score(player_profile, role_template):
-    """롤 적합도 점수 계산 (간단 버전)"""
-    from scipy.spatial.distance import cosine, euclidean
-    
+    """롤 적합도 점수 계산 (간단 버전, role_fit.calculate_role_fit_matrix 사용)"""
     if player_profile is None or role_template is None:
         return None
     
-    metrics = [
-        'forward_pass_ratio', 'long_pass_ratio', 'very_long_pass_ratio', 'short_pass_ratio',
-        'average_pass_length', 'pass_success_rate', 'forward_pass_success_rate',
-        'average_forward_pass_distance', 'average_carry_length', 'carry_frequency',
-        'average_touch_x', 'average_touch_y', 'touch_zone_central', 'touch_zone_wide',
-        'touch_zone_defensive', 'touch_zone_midfield', 'touch_zone_forward',
-        'defensive_action_frequency', 'tackle_frequency', 'clearance_frequency',
-        'shot_frequency', 'pass_frequency', 'pass_received_frequency'
-    ]
-    
-    player_vector = np.array([player_profile.get(m, 0) for m in metrics])
-    role_vector = np.array([role_template.get(m, 0) for m in metrics])
-    
-    # 코사인 유사도
-    player_norm = player_vector / (np.linalg.norm(player_vector) + 1e-10)
-    role_norm = role_vector / (np.linalg.norm(role_vector) + 1e-10)
-    cosine_sim = 1 - cosine(player_norm, role_norm)
-    
-    # 유클리드 거리
-    max_values = np.maximum(np.abs(player_vector), np.abs(role_vector))
-    max_values = np.maximum(max_values, 1.0)
-    player_normalized = player_vector / max_values
-    role_normalized = role_vector / max_values
-    euclidean_dist = euclidean(player_normalized, role_normalized)
-    max_possible_dist = np.sqrt(len(metrics))
-    euclidean_score = 1 - (euclidean_dist / max_possible_dist)
-    euclidean_score = max(0, min(1, euclidean_score))
-    
-    # 가중 평균
-    combined_score = 0.6 * cosine_sim + 0.4 * euclidean_score
-    raw_score = combined_score * 100
-    
-    # 표본 크기 보정
-    game_count = player_profile.get('game_count', 0)
-    event_count = player_profile.get('event_count', 0)
-    min_games = 5
-    min_events = 200
-    
-    game_confidence = min(1.0, game_count / min_games) if game_count > 0 else 0
-    event_confidence = min(1.0, event_count / min_events) if event_count > 0 else 0
-    confidence = np.sqrt(game_confidence * event_confidence)
-    
-    prior_score = 50.0
-    adjusted_score = confidence * raw_score + (1 - confidence) * prior_score
-    
-    # 경기 수 보너스
-    game_bonus = 0.0
-    if game_count >= 30:
-        game_bonus = 3.0
-    elif game_count >= 25:
-        game_bonus = 2.0
-    elif game_count >= 20:
-        game_bonus = 1.0
-    elif game_count >= 15:
-        game_bonus = 0.5
-    
-    # WAR 기반 보너스 (Wins Above Replacement)
-    # WAR는 선수가 뛴 경기 승률 - 선수가 뛰지 않은 경기 승률
-    # 약팀에서도 승리에 기여한 선수를 평가할 수 있음
-    war = player_profile.get('war', 0.0)
-    war_bonus = 0.0
-    
-    # WAR가 높을수록 보너스 (최대 +3.0점)
-    if war >= 0.3:  # 30%p 이상 개선
-        war_bonus = 3.0
-    elif war >= 0.2:  # 20%p 이상 개선
-        war_bonus = 2.0
-    elif war >= 0.1:  # 10%p 이상 개선
-        war_bonus = 1.0
-    elif war >= 0.05:  # 5%p 이상 개선
-        war_bonus = 0.5
-    elif war <= -0.3:  # 30%p 이상 악화
-        war_bonus = -3.0
-    elif war <= -0.2:  # 20%p 이상 악화
-        war_bonus = -2.0
-    elif war <= -0.1:  # 10%p 이상 악화
-        war_bonus = -1.0
-    elif war <= -0.05:  # 5%p 이상 악화
-        war_bonus = -0.5
-    
-    # 기존 팀 승률도 보조 지표로 유지 (하지만 가중치 낮춤)
-    team_win_rate = player_profile.get('team_win_rate', 0.5)
-    win_rate_bonus = 0.0
-    if team_win_rate >= 0.6:
-        win_rate_bonus = 0.5  # 기존 1.0에서 0.5로 감소
-    elif team_win_rate >= 0.5:
-        win_rate_bonus = 0.25  # 기존 0.5에서 0.25로 감소
-    elif team_win_rate < 0.3:
-        win_rate_bonus = -0.5  # 기존 -1.0에서 -0.5로 완화
-    elif team_win_rate < 0.4:
-        win_rate_bonus = -0.25  # 기존 -0.5에서 -0.25로 완화
-    
-    final_score = adjusted_score + game_bonus + war_bonus + win_rate_bonus
-    
-    return {
-        'fit_score': final_score,
-        'raw_score': raw_score,
-        'confidence': confidence,
-        'cosine_score': cosine_sim * 100,
-        'euclidean_score': euclidean_score * 100,
-        'game_bonus': game_bonus,
-        'war_bonus': war_bonus,
-        'win_rate_bonus': win_rate_bonus
-    }
+    template_matrix = np.array([[role_template.get(m, 0) for m in PROFILE_METRICS]], dtype=float)
+    scores = score_profiles([player_profile], template_matrix)
+    return {key: float(scores[key][0, 0]) for key in SCORE_KEYS}
 
 def find_best_role_for_player(player_profile, role_templates, position):
-    """선수에게 가장 적합한 롤 찾기"""
+    """선수에게 가장 적합한 롤 찾기 (포지션의 모든 롤을 한 번에 계산)"""
     if player_profile is None or position not in role_templates:
         return None, 0, {}
     
-    best_role = None
-    best_score = 0
-    best_details = {}
+    role_names, template_matrix = templates_to_matrix(role_templates, position)
+    if len(role_names) == 0:
+        return None, 0, {}
     
-    for role_name, role_info in role_templates[position].items():
-        template = role_info.get('template', {})
-        result = calculate_role_fit_score(player_profile, template)
-        
-        if result and result['fit_score'] > best_score:
-            best_score = result['fit_score']
-            best_role = role_name
-            best_details = result
+    scores = score_profiles([player_profile], template_matrix)
+    fit_scores = np.nan_to_num(scores['fit_score'][0], nan=-np.inf)
+    best = int(np.argmax(fit_scores))
+    if not fit_scores[best] > 0:
+        return None, 0, {}
     
-    return best_role, best_score, best_details
+    best_details = {key: float(scores[key][0, best]) for key in SCORE_KEYS}
+    return role_names[best], best_details['fit_score'], best_details
 
-def generate_all_teams_data():
-    """모든 팀의 선수 데이터 생성"""
-    print("="*80)
-    print("모든 팀의 선수 분석 데이터 생성")
-    print("="*80)
+def build_player_entry(player_id, player_name, position, profile, role_templates):
+    """
+    선수 프로파일 → teams_data.json 선수 항목 (가장 적합한 롤 매칭)
+
+    반환: 선수 딕셔너리 (프로파일이 없거나 적합한 롤이 없으면 None)
+    """
+    if profile is None:
+        return None
     
-    df, match_info_df = load_data()
-    role_templates = load_role_templates()
+    # 가장 적합한 롤 찾기
+    best_role, fit_score, score_details = find_best_role_for_player(profile, role_templates, position)
     
-    # 모든 팀 목록
-    all_teams = df.groupby(['team_id', 'team_name_ko']).size().reset_index(name='count')
+    if best_role is None:
+        return None
+    
+    return {
+        'player_id': float(player_id),
+        'player_name': player_name,
+        'position': position,
+        'role': best_role,
+        'fit_score': round(fit_score, 1),
+        'score_details': {
+            'raw_score': round(score_details.get('raw_score', 0), 1),
+            'confidence': round(score_details.get('confidence', 0), 3),
+            'cosine_score': round(score_details.get('cosine_score', 0), 1),
+            'euclidean_score': round(score_details.get('euclidean_score', 0), 1),
+            'game_bonus': round(score_details.get('game_bonus', 0), 1),
+            'win_rate_bonus': round(score_details.get('win_rate_bonus', 0), 1),
+        },
+        'game_count': int(profile.get('game_count', 0)),
+        'event_count': int(profile.get('event_count', 0)),
+        'team_win_rate': round(profile.get('team_win_rate', 0.5), 3),
+        'war': round(profile.get('war', 0.0), 3),
+        'war_games_with': int(profile.get('war_games_with', 0)),
+        'war_games_without': int(profile.get('war_games_without', 0)),
+    }
+
+def calculate_team_profiles(events, team_players, match_info_df, war_table):
+    """
+    팀 선수들의 프로파일 계산 (팀 선수 이벤트 구간을 모아 한 번에 집계)
+
+    events: 이벤트 DataFrame 또는 EventIndex
+    team_players: 팀 선수 목록 (player_id, player_name_ko, main_position, count)
+    반환: {player_id: 프로파일 딕셔너리}
+    """
+    player_ids = []
+    for _, player_row in team_players.iterrows():
+        player_id = player_row['player_id']
+        
+        if pd.isna(player_id) or pd.isna(player_row['main_position']):
+            continue
+        
+        if player_id not in player_ids:
+            player_ids.append(player_id)
+    
+    if len(player_ids) == 0:
+        return {}
+    
+    team_events = pd.concat([select_player(events, player_id) for player_id in player_ids])
+    if match_info_df is None:
+        war_table = None
+    elif war_table is None:
+        war_table = calculate_league_war(team_events, match_info_df)
+    profiles = _war_columns(calculate_profile_set(team_events, 'teams_data'), war_table)
+    
+    return {
+        player_id: profile_row(profiles, player_id)
+        for player_id in player_ids if player_id in profiles.index
+    }
+
+def analyze_team_players(team_players, profiles, role_templates):
+    """
+    팀 선수들의 최적 롤 매칭
+
+    profiles: player_id 인덱스 프로파일 테이블
+    반환: 선수 딕셔너리 리스트
+    """
+    players_list = []
+    
+    for _, player_row in team_players.iterrows():
+        player_id = player_row['player_id']
+        position = player_row['main_position']
+        
+        if pd.isna(player_id) or pd.isna(position):
+            continue
+        
+        profile = get_player_profile(profiles, player_id)
+        entry = build_player_entry(player_id, player_row['player_name_ko'], position, profile, role_templates)
+        if entry is not None:
+            players_list.append(entry)
+    
+    return players_list
+
+
+# 워커 프로세스 상태 (_init_worker에서 한 번 설정)
+_worker_state = {}
+
+
+def _init_worker(store_dir, match_info_df, war_table):
+    """워커 초기화: 메모리 맵 이벤트 스토어를 읽기 전용으로 열기 (선수 순 정렬 상태 그대로 사용)"""
+    _worker_state['events'] = EventIndex.from_sorted(open_mmap_store(store_dir), 'player_id')
+    _worker_state['match_info_df'] = match_info_df
+    _worker_state['war_table'] = war_table
+
+
+def _team_profiles_worker(team_players):
+    return calculate_team_profiles(
+        _worker_state['events'], team_players, _worker_state['match_info_df'], _worker_state['war_table']
+    )
+
+
+def _iter_team_profiles(events, team_player_lists, match_info_df, war_table, workers):
+    """
+    팀별 선수 프로파일을 팀 순서대로 반환
+
+    workers > 1이면 프로세스 풀에서 병렬 처리 (워커는 임시 메모리 맵 스토어를 공유)
+    """
+    if workers <= 1:
+        for team_players in team_player_lists:
+            yield calculate_team_profiles(events, team_players, match_info_df, war_table)
+        return
+    
+    with tempfile.TemporaryDirectory(prefix='event_store_') as store_dir:
+        build_mmap_store(events.sorted_frame('player_id'), store_dir)
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(store_dir, match_info_df, war_table)) as pool:
+            yield from pool.imap(_team_profiles_worker, team_player_lists)
+
+
+@timed('profile')
+def calculate_all_team_profiles(events, team_player_lists, match_info_df, workers=1):
+    """
+    모든 팀 선수의 프로파일 테이블 (player_id 인덱스, 컬럼: PROFILE_COLUMNS)
+    """
+    # 리그 전체 WAR 테이블 (한 번만 계산)
+    war_table = calculate_league_war(event_frame(events), match_info_df)
+    
+    profiles = {}
+    for team_profiles in _iter_team_profiles(events, team_player_lists, match_info_df, war_table, workers):
+        profiles.update(team_profiles)
+    
+    index = pd.Index(list(profiles.keys()), name='player_id', dtype=float)
+    return pd.DataFrame(list(profiles.values()), index=index, columns=PROFILE_COLUMNS)
+
+
+def list_team_players(events, min_events=200):
+    """
+    모든 팀 목록 (팀 이름 순)과 팀별 선수 목록 (최소 이벤트 수 이상)
+
+    반환: (all_teams DataFrame - team_id, team_name_ko, count,
+           팀 순서대로 선수 목록 리스트 - player_id, player_name_ko, main_position, count)
+    """
+    all_teams = event_frame(events).groupby(['team_id', 'team_name_ko'], observed=True).size().reset_index(name='count')
     all_teams = all_teams.sort_values('team_name_ko')
     
-    print(f"\n총 {len(all_teams)}개 팀 발견")
+    team_player_lists = []
+    for _, team_row in all_teams.iterrows():
+        team_players = select_team(events, team_row['team_id']).groupby(['player_id', 'player_name_ko', 'main_position'], observed=True).size().reset_index(name='count')
+        team_player_lists.append(team_players[team_players['count'] >= min_events])
     
+    return all_teams, team_player_lists
+
+
+def build_teams_data(all_teams, team_player_lists, profiles, role_templates):
+    """
+    팀별 선수 롤 매칭 → teams_data 딕셔너리 {팀 이름: {team_id, team_name, players}}
+
+    선수가 없는 팀은 제외
+    """
     teams_data = {}
     
-    for idx, team_row in all_teams.iterrows():
+    for (idx, team_row), team_players in zip(all_teams.iterrows(), team_player_lists):
         team_id = team_row['team_id']
         team_name = team_row['team_name_ko']
         
         print(f"\n[{idx+1}/{len(all_teams)}] {team_name} 분석 중...")
         
-        # 팀의 모든 선수
-        team_players = df[df['team_id'] == team_id].groupby(['player_id', 'player_name_ko', 'main_position']).size().reset_index(name='count')
-        team_players = team_players[team_players['count'] >= 200]  # 최소 200개 이벤트
-        
-        players_list = []
-        
-        for _, player_row in team_players.iterrows():
-            player_id = player_row['player_id']
-            player_name = player_row['player_name_ko']
-            position = player_row['main_position']
-            
-            if pd.isna(player_id) or pd.isna(position):
-                continue
-            
-            # 선수 프로파일 계산
-            profile = calculate_player_profile(df, player_id, match_info_df)
-            if profile is None:
-                continue
-            
-            # 가장 적합한 롤 찾기
-            best_role, fit_score, score_details = find_best_role_for_player(profile, role_templates, position)
-            
-            if best_role is None:
-                continue
-            
-            players_list.append({
-                'player_id': float(player_id),
-                'player_name': player_name,
-                'position': position,
-                'role': best_role,
-                'fit_score': round(fit_score, 1),
-                'score_details': {
-                    'raw_score': round(score_details.get('raw_score', 0), 1),
-                    'confidence': round(score_details.get('confidence', 0), 3),
-                    'cosine_score': round(score_details.get('cosine_score', 0), 1),
-                    'euclidean_score': round(score_details.get('euclidean_score', 0), 1),
-                    'game_bonus': round(score_details.get('game_bonus', 0), 1),
-                    'win_rate_bonus': round(score_details.get('win_rate_bonus', 0), 1),
-                },
-                'game_count': int(profile.get('game_count', 0)),
-                'event_count': int(profile.get('event_count', 0)),
-                'team_win_rate': round(profile.get('team_win_rate', 0.5), 3),
-                'war': round(profile.get('war', 0.0), 3),
-                'war_games_with': int(profile.get('war_games_with', 0)),
-                'war_games_without': int(profile.get('war_games_without', 0)),
-            })
+        players_list = analyze_team_players(team_players, profiles, role_templates)
         
         if len(players_list) > 0:
             teams_data[team_name] = {
@@ -383,7 +280,12 @@ def generate_all_teams_data():
             }
             print(f"  → {len(players_list)}명의 선수 분석 완료")
     
-    # JSON 파일로 저장
+    return teams_data
+
+
+@timed('export')
+def save_teams_data(teams_data):
+    """teams_data.json 저장 (웹 서비스 데이터)"""
     output_path = PROJECT_ROOT / 'docs' / 'data' / 'teams_data.json'
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
@@ -393,8 +295,58 @@ def generate_all_teams_data():
     print(f"\n✓ 데이터 저장 완료: {output_path}")
     print(f"  총 {len(teams_data)}개 팀, {sum(len(t['players']) for t in teams_data.values())}명의 선수")
     
+    return output_path
+
+def generate_all_teams_data(workers=1, use_cache=True, filters=None):
+    """
+    모든 팀의 선수 데이터 생성
+
+    workers: 프로파일 계산 프로세스 수 (1이면 단일 프로세스, 결과는 동일)
+    use_cache: 데이터/지표 정의가 같으면 저장된 프로파일 테이블 사용 (profile_cache)
+    filters: 시즌/대회 조건 (load_data 인자, None이면 전체 - 해당 파티션만 로딩)
+    """
+    print("="*80)
+    print("모든 팀의 선수 분석 데이터 생성")
+    print("="*80)
+    
+    filters = filters or {}
+    df, match_info_df = load_data(**filters)
+    role_templates = load_role_templates()
+    
+    # 팀/선수 구간 조회용 이벤트 인덱스
+    events = EventIndex(df)
+    
+    # 모든 팀 목록 / 팀의 모든 선수 (최소 200개 이벤트)
+    all_teams, team_player_lists = list_team_players(events)
+    
+    print(f"\n총 {len(all_teams)}개 팀 발견")
+    if workers > 1:
+        print(f"병렬 처리: {workers}개 프로세스")
+    
+    # 선수 프로파일 (데이터가 같으면 프로파일 캐시 사용)
+    profiles = cached_profiles(
+        'teams_data', PROFILE_VERSION,
+        lambda: calculate_all_team_profiles(events, team_player_lists, match_info_df, workers),
+        use_cache=use_cache, filters=filters
+    )
+    
+    teams_data = build_teams_data(all_teams, team_player_lists, profiles, role_templates)
+    
+    save_teams_data(teams_data)
+    
     return teams_data
 
 if __name__ == '__main__':
-    generate_all_teams_data()
-
+    parser = argparse.ArgumentParser(description='모든 팀의 선수 분석 데이터 생성')
+    parser.add_argument('--workers', type=int, default=1, help='프로파일 계산 프로세스 수 (기본 1)')
+    parser.add_argument('--no-cache', action='store_true', help='프로파일 캐시를 사용하지 않고 다시 계산')
+    add_partition_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    with profile_session_from_args(args, 'generate_all_teams_data'):
+        try:
+            generate_all_teams_data(workers=args.workers, use_cache=not args.no_cache,
+                                    filters=partition_filters_from_args(args))
+        except ValueError as error:
+            parser.error(str(error))
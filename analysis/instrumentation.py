@@ -0,0 +1,207 @@
+"""
+분석 스크립트 공용 계측 (단계별 실행 시간 / 메모리 할당 / cProfile)
+
+목적: 스크립트마다 print로 진행 상황만 출력하는 대신, 로딩/프로파일/점수/랭킹/내보내기 단계에
+      타이머를 걸어 단계별 호출 횟수, 누적 시간, 메모리 할당(tracemalloc)을 기록하고
+      --profile 옵션으로 기계가 읽을 수 있는 JSON 리포트를 저장
+
+- stage(name): 컨텍스트 매니저 / timed(name): 함수 데코레이터
+  계측 세션이 없으면 아무것도 기록하지 않음 (함수 호출만 그대로 전달)
+- 단계가 중첩되면 경로로 구분 (예: 'rank/score' = 랭킹 안에서 호출된 점수 계산)
+- 메모리: allocated = 단계가 끝났을 때 남은 할당량 변화, peak = 단계 중 최대 할당량 (시작 시점 대비)
+- 프로세스 풀 워커 안에서 실행된 단계는 기록되지 않음 (부모 프로세스의 대기 시간으로 포함)
+
+사용 예:
+    parser = argparse.ArgumentParser(...)
+    add_profile_arguments(parser)            # --profile [JSON], --cprofile PROF
+    args = parser.parse_args()
+    with profile_session_from_args(args, 'generate_all_teams_data'):
+        generate_all_teams_data(...)
+"""
+
+import cProfile
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROFILE_DIR = PROJECT_ROOT / 'benchmarks' / 'profiles'
+
+# 계측 세션 상태 (profile_session에서 설정)
+_state = {
+    'active': False,
+    'stages': {},
+    'stack': [],
+}
+
+
+def is_active():
+    """계측 세션 실행 중 여부"""
+    return _state['active']
+
+
+@contextmanager
+def stage(name):
+    """
+    단계 타이머 (계측 세션이 없으면 기록하지 않음)
+
+    기록: 경로별 호출 횟수, 누적 시간, 할당량 변화, 최대 할당량
+    """
+    if not _state['active']:
+        yield
+        return
+
+    stack = _state['stack']
+    path = f"{stack[-1]['path']}/{name}" if stack else name
+    record = _state['stages'].setdefault(path, {
+        'path': path, 'stage': name, 'calls': 0, 'total_time': 0.0,
+        'allocated_bytes': 0, 'peak_bytes': 0,
+    })
+
+    tracing = tracemalloc.is_tracing()
+    current = 0
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+    frame = {'path': path, 'memory': current, 'peak': current}
+    stack.append(frame)
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        record['calls'] += 1
+        record['total_time'] += elapsed
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            frame['peak'] = max(frame['peak'], peak)
+            record['allocated_bytes'] += current - frame['memory']
+            record['peak_bytes'] = max(record['peak_bytes'], frame['peak'] - frame['memory'])
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+
+
+def timed(name):
+    """함수 전체를 단계로 계측하는 데코레이터 (계측 세션이 없으면 함수만 호출)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state['active']:
+                return func(*args, **kwargs)
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _build_report(name, total_time, peak_bytes, trace_memory, cprofile_path):
+    """기록된 단계 → 리포트 딕셔너리 (단계는 처음 시작된 순서)"""
+    stages = []
+    for record in _state['stages'].values():
+        stages.append({
+            'path': record['path'],
+            'stage': record['stage'],
+            'calls': record['calls'],
+            'total_time': record['total_time'],
+            'mean_time': record['total_time'] / record['calls'] if record['calls'] else 0.0,
+            'share': record['total_time'] / total_time if total_time > 0 else 0.0,
+            'allocated_mb': record['allocated_bytes'] / 1024**2 if trace_memory else None,
+            'peak_mb': record['peak_bytes'] / 1024**2 if trace_memory else None,
+        })
+    return {
+        'script': name,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'total_time': total_time,
+        'peak_memory_mb': peak_bytes / 1024**2 if trace_memory else None,
+        'trace_memory': trace_memory,
+        'cprofile': None if cprofile_path is None else str(cprofile_path),
+        'stages': stages,
+    }
+
+
+def print_report(report):
+    """단계별 계측 결과 요약 출력"""
+    print("\n" + "=" * 80)
+    print(f"단계별 계측 결과 ({report['script']}, 전체 {report['total_time']:.3f}초)")
+    print("=" * 80)
+    for entry in report['stages']:
+        memory_text = ''
+        if entry['peak_mb'] is not None:
+            memory_text = f", 할당 {entry['allocated_mb']:+.1f} MB, 최대 {entry['peak_mb']:.1f} MB"
+        print(f"  {entry['path']:30s} {entry['calls']:6d}회 {entry['total_time']:9.3f}초 "
+              f"({entry['share']:6.1%}){memory_text}")
+
+
+@contextmanager
+def profile_session(report_path=None, cprofile_path=None, name='analysis', trace_memory=True):
+    """
+    계측 세션 (report_path와 cprofile_path가 모두 None이면 계측 없이 실행)
+
+    report_path: 단계별 계측 리포트 JSON 경로
+    cprofile_path: cProfile 통계 파일 경로 (pstats 형식, snakeviz 등으로 확인)
+    trace_memory: tracemalloc으로 메모리 할당 기록 (실행 시간 오버헤드 있음)
+    """
+    if report_path is None and cprofile_path is None:
+        yield
+        return
+
+    trace_memory = trace_memory and report_path is not None
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _state.update(active=report_path is not None, stages={}, stack=[])
+
+    profiler = cProfile.Profile() if cprofile_path is not None else None
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        total_time = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+        peak_bytes = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if started_tracing:
+            tracemalloc.stop()
+
+        if profiler is not None:
+            cprofile_path = Path(cprofile_path)
+            cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(cprofile_path)
+            print(f"\n✓ cProfile 통계 저장 완료: {cprofile_path}")
+
+        if report_path is not None:
+            report = _build_report(name, total_time, peak_bytes, trace_memory, cprofile_path)
+            report_path = Path(report_path)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print_report(report)
+            print(f"\n✓ 계측 리포트 저장 완료: {report_path}")
+
+        _state.update(active=False, stages={}, stack=[])
+
+
+def add_profile_arguments(parser):
+    """--profile [JSON] / --cprofile PROF 옵션 추가"""
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='JSON',
+                        help='단계별 실행 시간/메모리 계측 리포트 저장 (경로 생략 시 benchmarks/profiles/<스크립트>.json)')
+    parser.add_argument('--cprofile', type=Path, default=None, metavar='PROF',
+                        help='cProfile 통계 저장 (pstats 형식)')
+
+
+def profile_session_from_args(args, name):
+    """add_profile_arguments로 받은 옵션 → profile_session"""
+    report_path = None
+    if args.profile is not None:
+        report_path = Path(args.profile) if args.profile else PROFILE_DIR / f'{name}.json'
+    return profile_session(report_path, args.cprofile, name)
@@ -8,20 +8,23 @@
 4. 마크다운 문서 생성
 """
 
-import pandas as pd
+import argparse
 import numpy as np
 import json
 from pathlib import Path
-from scipy.spatial.distance import cosine, euclidean
 from collections import defaultdict
 
-PROJECT_ROOT = Path(__file__).parent.parent
+from profile_engine import (PROFILE_METRICS, PROFILE_VERSION, calculate_all_player_profiles, get_player_profile,
+                            without_war)
+from profile_cache import cached_profiles
+from role_fit import SCORE_KEYS, score_profiles, templates_to_matrix
+from fit_bootstrap import (BOOTSTRAP_SAMPLES, CI_LEVEL, bootstrap_fit_scores, bootstrap_profiles,
+                           rank_intervals, score_intervals)
+from event_store import add_partition_arguments, load_data, partition_filters_from_args
+from event_index import select_player
+from instrumentation import add_profile_arguments, profile_session_from_args, stage, timed
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+PROJECT_ROOT = Path(__file__).parent.parent
 
 def load_role_templates():
     """롤 템플릿 로딩"""
@@ -30,207 +33,19 @@ def load_role_templates():
         return json.load(f)
 
 def calculate_player_profile(df, player_id, match_info_df=None):
-    """선수 행동 프로파일 계산"""
-    player_data = df[df['player_id'] == player_id].copy()
+    """
+    선수 행동 프로파일 계산
+
+    단일 선수용 래퍼: 지표 정의와 계산은 profile_engine.calculate_all_player_profiles를 사용
+    여러 선수를 계산할 때는 calculate_all_player_profiles로 한 번에 계산할 것
+    """
+    player_data = select_player(df, player_id)
     
     if len(player_data) == 0:
         return None
     
-    # 경기 수 및 이벤트 수 계산 (표본 크기)
-    game_count = player_data['game_id'].nunique()
-    event_count = len(player_data)
-    
-    # WAR (Wins Above Replacement) 계산
-    # 선수가 뛴 경기에서의 팀 승률 vs 선수가 뛰지 않은 경기에서의 팀 승률 비교
-    team_win_rate = None
-    war = None
-    war_games_with = 0
-    war_games_without = 0
-    
-    if match_info_df is not None:
-        player_games = player_data['game_id'].unique()
-        player_team_id = player_data['team_id'].iloc[0] if len(player_data) > 0 else None
-        
-        if player_team_id is not None:
-            # 선수가 뛴 경기에서의 팀 승률
-            wins_with = 0
-            games_with = len(player_games)
-            
-            for game_id in player_games:
-                game_info = match_info_df[match_info_df['game_id'] == game_id]
-                if len(game_info) > 0:
-                    is_home = game_info['home_team_id'].iloc[0] == player_team_id
-                    home_score = game_info['home_score'].iloc[0]
-                    away_score = game_info['away_score'].iloc[0]
-                    
-                    if is_home:
-                        if home_score > away_score:
-                            wins_with += 1
-                    else:
-                        if away_score > home_score:
-                            wins_with += 1
-            
-            if games_with > 0:
-                team_win_rate = wins_with / games_with
-            
-            # 선수가 뛰지 않은 경기에서의 팀 승률
-            # 해당 팀의 모든 경기 찾기
-            team_games = match_info_df[
-                (match_info_df['home_team_id'] == player_team_id) | 
-                (match_info_df['away_team_id'] == player_team_id)
-            ]['game_id'].unique()
-            
-            # 선수가 뛰지 않은 경기
-            games_without = [g for g in team_games if g not in player_games]
-            wins_without = 0
-            games_without_count = len(games_without)
-            
-            for game_id in games_without:
-                game_info = match_info_df[match_info_df['game_id'] == game_id]
-                if len(game_info) > 0:
-                    is_home = game_info['home_team_id'].iloc[0] == player_team_id
-                    home_score = game_info['home_score'].iloc[0]
-                    away_score = game_info['away_score'].iloc[0]
-                    
-                    if is_home:
-                        if home_score > away_score:
-                            wins_without += 1
-                    else:
-                        if away_score > home_score:
-                            wins_without += 1
-            
-            # WAR 계산: 선수가 뛴 경기 승률 - 선수가 뛰지 않은 경기 승률
-            if games_with > 0 and games_without_count > 0:
-                win_rate_with = wins_with / games_with
-                win_rate_without = wins_without / games_without_count
-                war = win_rate_with - win_rate_without
-                war_games_with = games_with
-                war_games_without = games_without_count
-            elif games_with > 0:
-                # 선수가 뛰지 않은 경기가 없으면 (모든 경기 출전) WAR는 0으로 설정
-                war = 0.0
-                war_games_with = games_with
-                war_games_without = 0
-    
-    # 패스 관련
-    passes = player_data[player_data['type_name'] == 'Pass'].copy()
-    if len(passes) > 0:
-        passes['pass_length'] = np.sqrt(
-            (passes['end_x'] - passes['start_x'])**2 + 
-            (passes['end_y'] - passes['start_y'])**2
-        )
-        passes['is_forward'] = passes['end_y'] > passes['start_y']
-        passes['is_long'] = passes['pass_length'] >= 20
-        passes['is_very_long'] = passes['pass_length'] >= 30
-        passes['is_short'] = passes['pass_length'] <= 10
-        
-        forward_passes = passes[passes['is_forward']]
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        forward_successful = forward_passes[forward_passes['result_name'] == 'Successful']
-        
-        forward_pass_ratio = len(forward_passes) / len(passes) if len(passes) > 0 else 0
-        long_pass_ratio = len(passes[passes['is_long']]) / len(passes) if len(passes) > 0 else 0
-        very_long_pass_ratio = len(passes[passes['is_very_long']]) / len(passes) if len(passes) > 0 else 0
-        short_pass_ratio = len(passes[passes['is_short']]) / len(passes) if len(passes) > 0 else 0
-        pass_success_rate = len(successful_passes) / len(passes) if len(passes) > 0 else 0
-        average_pass_length = passes['pass_length'].mean() if len(passes) > 0 else 0
-        
-        if len(forward_passes) > 0:
-            forward_passes = forward_passes.copy()
-            forward_passes['forward_distance'] = forward_passes['end_y'] - forward_passes['start_y']
-            average_forward_pass_distance = forward_passes['forward_distance'].mean()
-            forward_pass_success_rate = len(forward_successful) / len(forward_passes) if len(forward_passes) > 0 else 0
-        else:
-            average_forward_pass_distance = 0
-            forward_pass_success_rate = 0
-    else:
-        forward_pass_ratio = 0
-        long_pass_ratio = 0
-        very_long_pass_ratio = 0
-        short_pass_ratio = 0
-        pass_success_rate = 0
-        average_pass_length = 0
-        average_forward_pass_distance = 0
-        forward_pass_success_rate = 0
-    
-    # 캐리 관련
-    carries = player_data[player_data['type_name'] == 'Carry'].copy()
-    if len(carries) > 0:
-        carries['carry_length'] = np.sqrt(
-            (carries['end_x'] - carries['start_x'])**2 + 
-            (carries['end_y'] - carries['start_y'])**2
-        )
-        average_carry_length = carries['carry_length'].mean()
-        carry_frequency = len(carries) / len(player_data) if len(player_data) > 0 else 0
-    else:
-        average_carry_length = 0
-        carry_frequency = 0
-    
-    # 터치 위치
-    touches = player_data[player_data['type_name'].isin(['Pass', 'Carry', 'Shot', 'Pass Received'])].copy()
-    if len(touches) > 0:
-        average_touch_x = touches['start_x'].mean()
-        average_touch_y = touches['start_y'].mean()
-        
-        # 터치 존
-        touch_zone_central = len(touches[(touches['start_x'] >= 33) & (touches['start_x'] <= 67)]) / len(touches)
-        touch_zone_wide = 1 - touch_zone_central
-        touch_zone_defensive = len(touches[touches['start_y'] <= 50]) / len(touches)
-        touch_zone_midfield = len(touches[(touches['start_y'] >= 25) & (touches['start_y'] <= 75)]) / len(touches)
-        touch_zone_forward = len(touches[touches['start_y'] >= 50]) / len(touches)
-    else:
-        average_touch_x = 50
-        average_touch_y = 50
-        touch_zone_central = 0.5
-        touch_zone_wide = 0.5
-        touch_zone_defensive = 0.5
-        touch_zone_midfield = 0.5
-        touch_zone_forward = 0.5
-    
-    # 수비 행동
-    defensive_actions = player_data[player_data['type_name'].isin(['Intervention', 'Tackle', 'Block', 'Clearance'])].copy()
-    defensive_action_frequency = len(defensive_actions) / len(player_data) if len(player_data) > 0 else 0
-    tackle_frequency = len(player_data[player_data['type_name'] == 'Tackle']) / len(player_data) if len(player_data) > 0 else 0
-    clearance_frequency = len(player_data[player_data['type_name'] == 'Clearance']) / len(player_data) if len(player_data) > 0 else 0
-    
-    # 슈팅
-    shots = player_data[player_data['type_name'] == 'Shot']
-    shot_frequency = len(shots) / len(player_data) if len(player_data) > 0 else 0
-    
-    # 패스 빈도
-    pass_frequency = len(passes) / len(player_data) if len(player_data) > 0 else 0
-    pass_received_frequency = len(player_data[player_data['type_name'] == 'Pass Received']) / len(player_data) if len(player_data) > 0 else 0
-    
-    profile = {
-        'forward_pass_ratio': forward_pass_ratio,
-        'long_pass_ratio': long_pass_ratio,
-        'very_long_pass_ratio': very_long_pass_ratio,
-        'short_pass_ratio': short_pass_ratio,
-        'average_pass_length': average_pass_length,
-        'pass_success_rate': pass_success_rate,
-        'forward_pass_success_rate': forward_pass_success_rate,
-        'average_forward_pass_distance': average_forward_pass_distance,
-        'average_carry_length': average_carry_length,
-        'carry_frequency': carry_frequency,
-        'average_touch_x': average_touch_x,
-        'average_touch_y': average_touch_y,
-        'touch_zone_central': touch_zone_central,
-        'touch_zone_wide': touch_zone_wide,
-        'touch_zone_defensive': touch_zone_defensive,
-        'touch_zone_midfield': touch_zone_midfield,
-        'touch_zone_forward': touch_zone_forward,
-        'defensive_action_frequency': defensive_action_frequency,
-        'tackle_frequency': tackle_frequency,
-        'clearance_frequency': clearance_frequency,
-        'shot_frequency': shot_frequency,
-        'pass_frequency': pass_frequency,
-        'pass_received_frequency': pass_received_frequency,
-        'game_count': game_count,
-        'event_count': event_count,
-        'team_win_rate': team_win_rate if team_win_rate is not None else 0.5,  # 기본값 50%
-    }
-    
-    return profile
+    profiles = without_war(calculate_all_player_profiles(player_data, match_info_df))
+    return get_player_profile(profiles, player_id)
 
 def calculate_role_fit_score(player_profile, role_template, position_average=None, apply_sample_size_correction=True):
     """
@@ -245,154 +60,36 @@ def calculate_role_fit_score(player_profile, role_template, position_average=Non
     - 최소 경기 수: 5경기
     - 최소 이벤트 수: 200개
     - 베이지안 평균 방식으로 신뢰도 가중치 적용
+    
+    단일 선수-템플릿용 래퍼: 계산은 role_fit.calculate_role_fit_matrix를 사용
+    반환: (final_score, raw_score, confidence, cosine, euclidean, game_bonus, war_bonus, win_rate_bonus)
     """
     if player_profile is None or role_template is None:
         return None
     
-    # 공통 지표 추출
-    metrics = [
-        'forward_pass_ratio', 'long_pass_ratio', 'very_long_pass_ratio', 'short_pass_ratio',
-        'average_pass_length', 'pass_success_rate', 'forward_pass_success_rate',
-        'average_forward_pass_distance', 'average_carry_length', 'carry_frequency',
-        'average_touch_x', 'average_touch_y', 'touch_zone_central', 'touch_zone_wide',
-        'touch_zone_defensive', 'touch_zone_midfield', 'touch_zone_forward',
-        'defensive_action_frequency', 'tackle_frequency', 'clearance_frequency',
-        'shot_frequency', 'pass_frequency', 'pass_received_frequency'
-    ]
-    
-    player_vector = np.array([player_profile.get(m, 0) for m in metrics])
-    role_vector = np.array([role_template.get(m, 0) for m in metrics])
-    
-    # 1. 코사인 유사도 (방향 유사성)
-    player_norm = player_vector / (np.linalg.norm(player_vector) + 1e-10)
-    role_norm = role_vector / (np.linalg.norm(role_vector) + 1e-10)
-    cosine_sim = 1 - cosine(player_norm, role_norm)
-    
-    # 2. 유클리드 거리 기반 점수 (크기 차이)
-    # 각 지표를 0~1 범위로 정규화 (최대값 기준)
-    max_values = np.maximum(np.abs(player_vector), np.abs(role_vector))
-    max_values = np.maximum(max_values, 1.0)  # 최소 1.0
-    
-    player_normalized = player_vector / max_values
-    role_normalized = role_vector / max_values
-    
-    # 유클리드 거리 (0~1 범위로 정규화)
-    euclidean_dist = euclidean(player_normalized, role_normalized)
-    max_possible_dist = np.sqrt(len(metrics))  # 최대 가능한 거리
-    euclidean_score = 1 - (euclidean_dist / max_possible_dist)
-    euclidean_score = max(0, min(1, euclidean_score))  # 0~1 범위로 클리핑
-    
-    # 3. 가중 평균 (코사인 60%, 유클리드 40%)
-    combined_score = 0.6 * cosine_sim + 0.4 * euclidean_score
-    raw_score = combined_score * 100  # 0~100점
-    
-    # 표본 크기 보정 적용
-    if apply_sample_size_correction:
-        game_count = player_profile.get('game_count', 0)
-        event_count = player_profile.get('event_count', 0)
-        
-        # 최소 기준
-        min_games = 5
-        min_events = 200
-        
-        # 신뢰도 가중치 계산 (0~1)
-        game_confidence = min(1.0, game_count / min_games) if game_count > 0 else 0
-        event_confidence = min(1.0, event_count / min_events) if event_count > 0 else 0
-        
-        # 종합 신뢰도 (경기 수와 이벤트 수의 기하평균)
-        confidence = np.sqrt(game_confidence * event_confidence)
-        
-        # 베이지안 평균 방식
-        prior_score = 50.0  # 사전 점수 (중간값)
-        adjusted_score = confidence * raw_score + (1 - confidence) * prior_score
-        
-        # 경기 수 보너스 (한 시즌 꾸준히 뛴 선수에게 가치 부여)
-        # 20경기 이상: +1점, 25경기 이상: +2점, 30경기 이상: +3점
-        game_bonus = 0.0
-        if game_count >= 30:
-            game_bonus = 3.0
-        elif game_count >= 25:
-            game_bonus = 2.0
-        elif game_count >= 20:
-            game_bonus = 1.0
-        elif game_count >= 15:
-            game_bonus = 0.5
-        
-        # WAR 기반 보너스 (Wins Above Replacement)
-        # WAR는 선수가 뛴 경기 승률 - 선수가 뛰지 않은 경기 승률
-        # 약팀에서도 승리에 기여한 선수를 평가할 수 있음
-        war = player_profile.get('war', 0.0)
-        war_bonus = 0.0
-        
-        # WAR가 높을수록 보너스 (최대 +3.0점)
-        if war >= 0.3:  # 30%p 이상 개선
-            war_bonus = 3.0
-        elif war >= 0.2:  # 20%p 이상 개선
-            war_bonus = 2.0
-        elif war >= 0.1:  # 10%p 이상 개선
-            war_bonus = 1.0
-        elif war >= 0.05:  # 5%p 이상 개선
-            war_bonus = 0.5
-        elif war <= -0.3:  # 30%p 이상 악화
-            war_bonus = -3.0
-        elif war <= -0.2:  # 20%p 이상 악화
-            war_bonus = -2.0
-        elif war <= -0.1:  # 10%p 이상 악화
-            war_bonus = -1.0
-        elif war <= -0.05:  # 5%p 이상 악화
-            war_bonus = -0.5
-        
-        # 기존 팀 승률도 보조 지표로 유지 (하지만 가중치 낮춤)
-        team_win_rate = player_profile.get('team_win_rate', 0.5)
-        win_rate_bonus = 0.0
-        if team_win_rate >= 0.6:  # 60% 이상 승률
-            win_rate_bonus = 0.5  # 기존 1.0에서 0.5로 감소
-        elif team_win_rate >= 0.5:  # 50% 이상 승률
-            win_rate_bonus = 0.25  # 기존 0.5에서 0.25로 감소
-        elif team_win_rate < 0.3:  # 30% 미만 승률
-            win_rate_bonus = -0.5  # 기존 -1.0에서 -0.5로 완화
-        elif team_win_rate < 0.4:  # 40% 미만 승률
-            win_rate_bonus = -0.25  # 기존 -0.5에서 -0.25로 완화
-        
-        # 최종 점수에 보너스 추가
-        final_score = adjusted_score + game_bonus + war_bonus + win_rate_bonus
-        
-        return final_score, raw_score, confidence, cosine_sim * 100, euclidean_score * 100, game_bonus, war_bonus, win_rate_bonus
-    
-    return raw_score, raw_score, 1.0, cosine_sim * 100, euclidean_score * 100, 0.0, 0.0, 0.0
+    template_matrix = np.array([[role_template.get(m, 0) for m in PROFILE_METRICS]], dtype=float)
+    scores = score_profiles([player_profile], template_matrix, apply_sample_size_correction)
+    return tuple(float(scores[key][0, 0]) for key in SCORE_KEYS)
 
 def find_best_role_for_player(player_profile, role_templates, player_position, position_average=None):
-    """선수에게 가장 적합한 롤 찾기"""
-    if player_profile is None:
-        return None, 0, 0, 1.0, 0, 0, 0.0, 0.0, 0.0
-    
-    best_role = None
-    best_score = 0
-    best_raw_score = 0
-    best_confidence = 1.0
-    best_cosine = 0
-    best_euclidean = 0
+    """선수에게 가장 적합한 롤 찾기 (포지션의 모든 롤을 한 번에 계산)"""
+    no_role = (None, 0, 0, 1.0, 0, 0, 0.0, 0.0, 0.0)
     
     # 포지션에 맞는 롤만 검사
-    if player_position in role_templates:
-        for role_name, role_info in role_templates[player_position].items():
-            template = role_info.get('template', {})
-            result = calculate_role_fit_score(player_profile, template, position_average, apply_sample_size_correction=True)
-            
-            if result is not None:
-                score, raw_score, confidence, cosine_score, euclidean_score, game_bonus, war_bonus, win_rate_bonus = result
-                if score > best_score:
-                    best_score = score
-                    best_raw_score = raw_score
-                    best_confidence = confidence
-                    best_cosine = cosine_score
-                    best_euclidean = euclidean_score
-                    best_game_bonus = game_bonus
-                    best_war_bonus = war_bonus
-                    best_win_rate_bonus = win_rate_bonus
-                    best_role = role_name
+    if player_profile is None or player_position not in role_templates:
+        return no_role
     
-    return best_role, best_score, best_raw_score, best_confidence, best_cosine, best_euclidean, best_game_bonus, best_war_bonus, best_win_rate_bonus
+    role_names, template_matrix = templates_to_matrix(role_templates, player_position)
+    if len(role_names) == 0:
+        return no_role
+    
+    scores = score_profiles([player_profile], template_matrix)
+    fit_scores = np.nan_to_num(scores['fit_score'][0], nan=-np.inf)
+    best = int(np.argmax(fit_scores))
+    if not fit_scores[best] > 0:
+        return no_role
+    
+    return (role_names[best],) + tuple(float(scores[key][0, best]) for key in SCORE_KEYS)
 
 def get_jeonbuk_players(df):
     """전북 현대 모터스 선수 목록 추출"""
@@ -816,18 +513,36 @@ def suggest_improvements(player_profile, role_template, top_players_profiles, ro
     
     return suggestions
 
-def create_rankings_for_all_roles(df, role_templates, match_info_df, min_games=5, min_events=200):
+def get_player_main_teams(df):
+    """선수별 가장 많이 뛴 팀 이름 (player_id → team_name_ko)"""
+    team_counts = df.groupby(['player_id', 'team_name_ko'], observed=True).size()
+    if len(team_counts) == 0:
+        return {}
+    most_common = team_counts.groupby(level='player_id').idxmax()
+    return {player_id: team_name for player_id, team_name in most_common}
+
+@timed('rank')
+def create_rankings_for_all_roles(df, role_templates, match_info_df, min_games=5, min_events=200, profiles=None,
+                                  bootstrap_samples=BOOTSTRAP_SAMPLES):
     """
     모든 롤에 대한 K리그 전체 선수 랭킹 생성
     
     포지션별로 구분하여 랭킹 생성 (롤은 포지션 내에서만 비교)
     표본 크기 보정 적용
+    
+    profiles: calculate_all_player_profiles 결과 (None이면 여기서 한 번 계산)
+    bootstrap_samples: 경기 재표집 횟수 (fit_bootstrap, 0이면 신뢰구간 생략)
+                       선수마다 fit_score_ci_low/high (점수 95% 구간), rank_ci_low/high (순위 95% 구간) 추가
     """
     print("\nK리그 전체 선수 랭킹 생성 중...")
     print(f"  최소 기준: {min_games}경기 이상, {min_events}개 이벤트 이상")
     
+    if profiles is None:
+        profiles = calculate_all_player_profiles(df, match_info_df)
+    profiles = without_war(profiles)
+    
     # 모든 선수 목록 (경기 수와 이벤트 수 계산)
-    player_stats = df.groupby(['player_id', 'player_name_ko', 'main_position']).agg({
+    player_stats = df.groupby(['player_id', 'player_name_ko', 'main_position'], observed=True).agg({
         'game_id': 'nunique',
         'action_id': 'count'
     }).reset_index()
@@ -839,52 +554,76 @@ def create_rankings_for_all_roles(df, role_templates, match_info_df, min_games=5
         (player_stats['event_count'] >= min_events)
     ]
     
+    # 선수의 팀 정보 (가장 많이 뛴 팀) - 선수당 한 번만 계산
+    player_teams = get_player_main_teams(df)
+    
+    # 경기 재표집 프로파일 (랭킹 대상 선수 전체를 한 번에)
+    samples = None
+    if bootstrap_samples > 0:
+        ranked_ids = player_stats.loc[player_stats['player_id'].isin(profiles.index), 'player_id'].unique()
+        print(f"  부트스트랩 신뢰구간 계산 중 ({bootstrap_samples}회 경기 재표집)...")
+        samples = bootstrap_profiles(df, ranked_ids, n_samples=bootstrap_samples)
+    
     rankings = defaultdict(list)
     
     for position in role_templates.keys():
         print(f"  {position} 포지션 처리 중...")
         position_players = player_stats[player_stats['main_position'] == position]
+        position_players = position_players[position_players['player_id'].isin(profiles.index)]
         
-        for role_name, role_info in role_templates[position].items():
-            template = role_info.get('template', {})
+        # 포지션 선수 × 롤 템플릿 점수 행렬 (한 번에 계산)
+        role_names, template_matrix = templates_to_matrix(role_templates, position)
+        scores = score_profiles(profiles.loc[position_players['player_id']], template_matrix)
+        
+        # 선수별 프로파일/팀은 포지션의 모든 롤에서 재사용
+        position_profiles = [get_player_profile(profiles, pid) for pid in position_players['player_id']]
+        
+        # 점수 / 포지션-롤 내 순위 신뢰구간 (선수 × 롤)
+        intervals = None
+        if samples is not None and len(position_players) > 0:
+            player_profiles = profiles.loc[position_players['player_id']]
+            fit_samples = bootstrap_fit_scores(
+                samples, position_players['player_id'], template_matrix,
+                team_win_rate=player_profiles['team_win_rate'], war=player_profiles['war']
+            )
+            intervals = score_intervals(fit_samples) + rank_intervals(fit_samples)
+        
+        for role_idx, role_name in enumerate(role_names):
             role_rankings = []
             
-            for _, player_row in position_players.iterrows():
+            for player_idx, (_, player_row) in enumerate(position_players.iterrows()):
                 player_id = player_row['player_id']
                 player_name = player_row['player_name_ko']
-                
-                # 선수의 팀 정보 가져오기 (가장 많이 뛴 팀)
-                player_teams = df[df['player_id'] == player_id]
-                if len(player_teams) > 0:
-                    team_counts = player_teams['team_name_ko'].value_counts()
-                    most_common_team = team_counts.index[0] if len(team_counts) > 0 else '알 수 없음'
-                else:
-                    most_common_team = '알 수 없음'
-                
-                profile = calculate_player_profile(df, player_id, match_info_df)
-                if profile is None:
-                    continue
-                
-                result = calculate_role_fit_score(profile, template, None, apply_sample_size_correction=True)
-                if result is not None:
-                    score, raw_score, confidence, cosine_score, euclidean_score, game_bonus, war_bonus, win_rate_bonus = result
-                    role_rankings.append({
-                        'player_id': player_id,
-                        'player_name': player_name,
-                        'team_name': most_common_team,
-                        'position': position,
-                        'fit_score': score,
-                        'raw_score': raw_score,
-                        'confidence': confidence,
-                        'game_bonus': game_bonus,
-                        'war_bonus': war_bonus,
-                        'win_rate_bonus': win_rate_bonus,
-                        'team_win_rate': profile.get('team_win_rate', 0.5),
-                        'war': profile.get('war', 0.0),
-                        'war_games_with': profile.get('war_games_with', 0),
-                        'war_games_without': profile.get('war_games_without', 0),
-                        'game_count': profile.get('game_count', 0),
-                        'event_count': profile.get('event_count', 0)
+                most_common_team = player_teams.get(player_id, '알 수 없음')
+                profile = position_profiles[player_idx]
+                score, raw_score, confidence, cosine_score, euclidean_score, game_bonus, war_bonus, win_rate_bonus = (
+                    float(scores[key][player_idx, role_idx]) for key in SCORE_KEYS
+                )
+                role_rankings.append({
+                    'player_id': player_id,
+                    'player_name': player_name,
+                    'team_name': most_common_team,
+                    'position': position,
+                    'fit_score': score,
+                    'raw_score': raw_score,
+                    'confidence': confidence,
+                    'game_bonus': game_bonus,
+                    'war_bonus': war_bonus,
+                    'win_rate_bonus': win_rate_bonus,
+                    'team_win_rate': profile.get('team_win_rate', 0.5),
+                    'war': profile.get('war', 0.0),
+                    'war_games_with': profile.get('war_games_with', 0),
+                    'war_games_without': profile.get('war_games_without', 0),
+                    'game_count': profile.get('game_count', 0),
+                    'event_count': profile.get('event_count', 0)
+                })
+                if intervals is not None:
+                    score_low, score_high, rank_low, rank_high = (values[player_idx, role_idx] for values in intervals)
+                    role_rankings[-1].update({
+                        'fit_score_ci_low': float(score_low),
+                        'fit_score_ci_high': float(score_high),
+                        'rank_ci_low': int(rank_low),
+                        'rank_ci_high': int(rank_high),
                     })
             
             # 점수 순으로 정렬 (보정된 점수 기준)
@@ -975,6 +714,9 @@ def generate_markdown_report(jeonbuk_players_data, rankings, role_templates):
         win_rate_bonus = player_info.get('win_rate_bonus', 0)
         team_win_rate = player_info.get('team_win_rate', 0.5)
         md_content.append(f"- **롤 적합도**: {fit_score:.1f}점 (신뢰도: {confidence:.1%})")
+        if 'fit_score_ci_low' in player_info:
+            md_content.append(f"  - {CI_LEVEL:.0%} 신뢰구간: {player_info['fit_score_ci_low']:.1f} ~ "
+                              f"{player_info['fit_score_ci_high']:.1f}점 (경기 재표집 부트스트랩)")
         md_content.append(f"  - 코사인 유사도: {cosine_score:.1f}점 (방향 유사성)")
         md_content.append(f"  - 유클리드 거리 점수: {euclidean_score:.1f}점 (크기 차이)")
         if game_bonus != 0:
@@ -1005,6 +747,8 @@ def generate_markdown_report(jeonbuk_players_data, rankings, role_templates):
             md_content.append(f"- **K리그 랭킹**: {rank}위 / {total_players}명 ({position} 포지션 내)")
             md_content.append(f"  - **랭킹 근거**: 같은 포지션({position}) 내에서 같은 롤({role})을 가진 선수들과 비교")
             md_content.append(f"  - **상위 비율**: {rank/total_players*100:.1f}%")
+            if 'rank_ci_low' in player_info:
+                md_content.append(f"  - **랭킹 {CI_LEVEL:.0%} 구간**: {player_info['rank_ci_low']}위 ~ {player_info['rank_ci_high']}위")
         else:
             md_content.append(f"- **K리그 랭킹**: 랭킹 정보 없음 (최소 기준 미달: 5경기, 200개 이벤트)")
         md_content.append(f"- **표본 크기**: {game_count}경기, {event_count}개 이벤트")
@@ -1115,19 +859,29 @@ def generate_markdown_report(jeonbuk_players_data, rankings, role_templates):
     
     return "\n".join(md_content)
 
-def main():
+def main(filters=None):
+    """
+    filters: 시즌/대회 조건 (load_data 인자, None이면 전체 - 해당 파티션만 로딩하고 랭킹도 그 안에서 계산)
+    """
     print("="*80)
     print("전북 현대 모터스 팀 선수 스타일 분석")
     print("="*80)
     
     # 데이터 로딩
-    df, match_info_df = load_data()
+    filters = filters or {}
+    df, match_info_df = load_data(**filters)
     role_templates = load_role_templates()
     
     # match_info_df를 전역에서 사용할 수 있도록 저장 (calculate_player_profile에서 사용)
     global _match_info_df
     _match_info_df = match_info_df
     
+    # 전체 선수 프로파일 (이벤트 로그 1회 스캔, 데이터가 같으면 프로파일 캐시 사용)
+    print("\n전체 선수 프로파일 계산 중...")
+    profiles = cached_profiles('ranking', PROFILE_VERSION, lambda: calculate_all_player_profiles(df, match_info_df),
+                               filters=filters)
+    profiles = without_war(profiles)
+    
     # 전북 선수 목록
     jeonbuk_players = get_jeonbuk_players(df)
     print(f"\n전북 현대 모터스 선수 수: {len(jeonbuk_players)}명")
@@ -1147,7 +901,7 @@ def main():
         
         print(f"  {player_name} ({position}) 분석 중...")
         
-        profile = calculate_player_profile(df, player_id, match_info_df)
+        profile = get_player_profile(profiles, player_id)
         if profile is None:
             continue
         
@@ -1182,7 +936,7 @@ def main():
     print(f"\n분석 완료: {len(jeonbuk_players_data)}명")
     
     # 전체 랭킹 생성 (표본 크기 보정 적용)
-    rankings = create_rankings_for_all_roles(df, role_templates, match_info_df, min_games=5, min_events=200)
+    rankings = create_rankings_for_all_roles(df, role_templates, match_info_df, min_games=5, min_events=200, profiles=profiles)
     
     # 전북 선수들의 랭킹 위치 확인 및 랭킹에서 계산된 점수로 업데이트
     print("\n전북 선수들의 랭킹 위치 확인 중...")
@@ -1208,15 +962,21 @@ def main():
                     player_info['war_games_without'] = rank_info.get('war_games_without', player_info.get('war_games_without', 0))
                     player_info['game_count'] = rank_info.get('game_count', player_info.get('game_count', 0))
                     player_info['event_count'] = rank_info.get('event_count', player_info.get('event_count', 0))
+                    for key in ('fit_score_ci_low', 'fit_score_ci_high', 'rank_ci_low', 'rank_ci_high'):
+                        if key in rank_info:
+                            player_info[key] = rank_info[key]
                     
                     # 개선 방안 제안을 위한 상위 선수 프로파일 수집
+                    # (랭킹 생성에 사용한 프로파일 테이블 재사용)
                     top_10_profiles = []
                     for top_player in rankings[role_key][:10]:
-                        top_profile = calculate_player_profile(df, top_player['player_id'], match_info_df)
+                        top_profile = get_player_profile(profiles, top_player['player_id'])
                         if top_profile:
                             top_10_profiles.append(top_profile)
                     
                     # 롤 템플릿 가져오기
+                    position = player_info['position']
+                    role = player_info['role']
                     role_template = role_templates.get(position, {}).get(role, {}).get('template', {})
                     if role_template:
                         suggestions = suggest_improvements(
@@ -1229,14 +989,14 @@ def main():
                         player_info['suggestions'] = suggestions
                     break
     
-    # 마크다운 리포트 생성
-    print("\n마크다운 리포트 생성 중...")
-    md_content = generate_markdown_report(jeonbuk_players_data, rankings, role_templates)
-    
-    # 파일 저장
-    output_path = PROJECT_ROOT / 'analysis' / 'JEONBUK_TEAM_ANALYSIS.md'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
+    # 마크다운 리포트 생성 및 저장
+    with stage('export'):
+        print("\n마크다운 리포트 생성 중...")
+        md_content = generate_markdown_report(jeonbuk_players_data, rankings, role_templates)
+        
+        output_path = PROJECT_ROOT / 'analysis' / 'JEONBUK_TEAM_ANALYSIS.md'
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(md_content)
     
     print(f"\n✓ 리포트 저장 완료: {output_path}")
     print(f"\n분석된 전북 선수 수: {len(jeonbuk_players_data)}명")
@@ -1251,5 +1011,14 @@ def main():
         print(f"{player_info['player_name']} ({player_info['position']}): {player_info['role']} - {rank_str}")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='전북 현대 모터스 팀 선수 스타일 분석 및 K리그 랭킹')
+    add_partition_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    with profile_session_from_args(args, 'jeonbuk_team_analysis'):
+        try:
+            main(filters=partition_filters_from_args(args))
+        except ValueError as error:
+            parser.error(str(error))
 
@@ -7,20 +7,17 @@
 4. 공간 활용 조합 분석
 """
 
-import pandas as pd
-import numpy as np
 import json
 from pathlib import Path
 from collections import defaultdict
-from itertools import combinations
 
-PROJECT_ROOT = Path(__file__).parent.parent
+from event_store import load_data
+from event_index import EventIndex, select_team, select_team_game
+from pass_network import build_pass_edges, select_team_edges
+from game_results import aggregate_team_games, build_team_game_results
+from synergy import calculate_synergy
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+PROJECT_ROOT = Path(__file__).parent.parent
 
 def load_role_templates():
     """롤 템플릿 로딩"""
@@ -34,7 +31,7 @@ def get_player_roles(df, match_info_df, team_id, role_templates):
     # 여기서는 간단히 포지션별 첫 번째 롤 사용
     player_roles = {}
     
-    team_players = df[df['team_id'] == team_id].groupby(['player_id', 'player_name_ko', 'main_position']).size().reset_index(name='count')
+    team_players = select_team(df, team_id).groupby(['player_id', 'player_name_ko', 'main_position'], observed=True).size().reset_index(name='count')
     
     for _, row in team_players.iterrows():
         player_id = row['player_id']
@@ -50,83 +47,59 @@ def get_player_roles(df, match_info_df, team_id, role_templates):
     
     return player_roles
 
-def analyze_pass_network_detailed(df, team_id):
-    """상세 패스 네트워크 분석"""
-    team_data = df[df['team_id'] == team_id]
-    passes = team_data[team_data['type_name'] == 'Pass'].copy()
+def analyze_pass_network_detailed(df, team_id, edges=None):
+    """
+    상세 패스 네트워크 분석
     
-    if len(passes) == 0:
-        return None
+    edges: build_pass_edges 결과 (여러 팀을 분석할 때 미리 한 번 계산)
+    """
+    team_data = select_team(df, team_id)
     
-    # 패스 연결 추적
-    pass_connections = defaultdict(lambda: {'count': 0, 'successful': 0, 'total_length': 0})
+    if not (team_data['type_name'] == 'Pass').any():
+        return None
     
-    for idx, pass_row in passes.iterrows():
-        passer_id = pass_row['player_id']
-        
-        # 패스를 받은 선수 찾기
-        next_events = team_data[
-            (team_data['game_id'] == pass_row['game_id']) &
-            (team_data['action_id'] > pass_row['action_id']) &
-            (team_data['action_id'] <= pass_row['action_id'] + 5)
-        ]
-        
-        received = next_events[next_events['type_name'] == 'Pass Received']
-        if len(received) > 0:
-            receiver_id = received.iloc[0]['player_id']
-            
-            if passer_id != receiver_id:
-                pass_length = np.sqrt(
-                    (pass_row['end_x'] - pass_row['start_x'])**2 + 
-                    (pass_row['end_y'] - pass_row['start_y'])**2
-                )
-                
-                pass_connections[(passer_id, receiver_id)]['count'] += 1
-                pass_connections[(passer_id, receiver_id)]['total_length'] += pass_length
-                if pass_row['result_name'] == 'Successful':
-                    pass_connections[(passer_id, receiver_id)]['successful'] += 1
+    # 패스 연결 추적 (다음 5개 이벤트 내 Pass Received 선수)
+    if edges is None:
+        team_edges = build_pass_edges(team_data)
+    else:
+        team_edges = select_team_edges(edges, team_id)
     
     # 선수 이름 매핑
-    player_names = {}
-    for player_id in team_data['player_id'].unique():
-        player_data = team_data[team_data['player_id'] == player_id]
-        if len(player_data) > 0:
-            player_names[player_id] = player_data['player_name_ko'].iloc[0]
+    named = team_data[team_data['player_id'].notna()].drop_duplicates('player_id')
+    player_names = dict(zip(named['player_id'], named['player_name_ko']))
     
     # 결과 정리
     connections = []
-    for (passer_id, receiver_id), stats in pass_connections.items():
-        if stats['count'] >= 10:  # 최소 10회 이상 패스
-            connections.append({
-                'passer_id': passer_id,
-                'passer_name': player_names.get(passer_id, '알 수 없음'),
-                'receiver_id': receiver_id,
-                'receiver_name': player_names.get(receiver_id, '알 수 없음'),
-                'count': stats['count'],
-                'successful': stats['successful'],
-                'success_rate': stats['successful'] / stats['count'] if stats['count'] > 0 else 0,
-                'avg_length': stats['total_length'] / stats['count'] if stats['count'] > 0 else 0
-            })
+    for edge in team_edges[team_edges['count'] >= 10].itertuples(index=False):  # 최소 10회 이상 패스
+        connections.append({
+            'passer_id': edge.passer_id,
+            'passer_name': player_names.get(edge.passer_id, '알 수 없음'),
+            'receiver_id': edge.receiver_id,
+            'receiver_name': player_names.get(edge.receiver_id, '알 수 없음'),
+            'count': int(edge.count),
+            'successful': int(edge.successful),
+            'success_rate': edge.successful / edge.count if edge.count > 0 else 0,
+            'avg_length': edge.total_length / edge.count if edge.count > 0 else 0
+        })
     
     connections.sort(key=lambda x: x['count'], reverse=True)
     
     return connections
 
-def analyze_role_combination_performance(df, match_info_df, team_id, player_roles):
-    """롤 조합별 성과 분석"""
-    team_games = df[df['team_id'] == team_id]['game_id'].unique()
+def analyze_role_combination_performance(df, match_info_df, team_id, player_roles, result_table=None):
+    """
+    롤 조합별 성과 분석
+    
+    result_table: build_team_game_results 결과 (None이면 팀 경기로 생성)
+    """
+    team_games = select_team(df, team_id)['game_id'].unique()
+    if result_table is None:
+        result_table = build_team_game_results(match_info_df, team_games)
     
-    role_combo_stats = defaultdict(lambda: {
-        'games': [],
-        'wins': 0,
-        'draws': 0,
-        'losses': 0,
-        'goals_for': 0,
-        'goals_against': 0
-    })
+    role_combo_games = defaultdict(list)
     
     for game_id in team_games:
-        game_data = df[(df['game_id'] == game_id) & (df['team_id'] == team_id)]
+        game_data = select_team_game(df, team_id, game_id)
         if len(game_data) == 0:
             continue
         
@@ -142,46 +115,14 @@ def analyze_role_combination_performance(df, match_info_df, team_id, player_role
         if len(game_roles) >= 10:  # 최소 10명 이상 출전
             # 롤 조합을 정렬하여 순서 무관하게
             role_combo = tuple(sorted(set(game_roles)))  # 중복 제거
-            
-            role_combo_stats[role_combo]['games'].append(game_id)
-            
-            # 경기 결과
-            game_info = match_info_df[match_info_df['game_id'] == game_id]
-            if len(game_info) > 0:
-                is_home = game_info['home_team_id'].iloc[0] == team_id
-                home_score = game_info['home_score'].iloc[0]
-                away_score = game_info['away_score'].iloc[0]
-                
-                if is_home:
-                    goals_for = home_score
-                    goals_against = away_score
-                    if home_score > away_score:
-                        role_combo_stats[role_combo]['wins'] += 1
-                    elif home_score == away_score:
-                        role_combo_stats[role_combo]['draws'] += 1
-                    else:
-                        role_combo_stats[role_combo]['losses'] += 1
-                else:
-                    goals_for = away_score
-                    goals_against = home_score
-                    if away_score > home_score:
-                        role_combo_stats[role_combo]['wins'] += 1
-                    elif away_score == home_score:
-                        role_combo_stats[role_combo]['draws'] += 1
-                    else:
-                        role_combo_stats[role_combo]['losses'] += 1
-                
-                role_combo_stats[role_combo]['goals_for'] += goals_for
-                role_combo_stats[role_combo]['goals_against'] += goals_against
+            role_combo_games[role_combo].append(game_id)
     
-    # 결과 정리
+    # 결과 정리 (조합별 경기 집합의 성과를 결과 테이블에서 집계)
     results = []
-    for role_combo, stats in role_combo_stats.items():
-        game_count = len(stats['games'])
+    for role_combo, games in role_combo_games.items():
+        game_count = len(games)
         if game_count >= 2:  # 최소 2경기 이상
-            win_rate = stats['wins'] / game_count
-            avg_goals_for = stats['goals_for'] / game_count
-            avg_goals_against = stats['goals_against'] / game_count
+            stats = aggregate_team_games(result_table, team_id, games)
             
             results.append({
                 'role_combination': role_combo,
@@ -189,120 +130,41 @@ def analyze_role_combination_performance(df, match_info_df, team_id, player_role
                 'wins': stats['wins'],
                 'draws': stats['draws'],
                 'losses': stats['losses'],
-                'win_rate': win_rate,
-                'avg_goals_for': avg_goals_for,
-                'avg_goals_against': avg_goals_against,
-                'goal_difference': avg_goals_for - avg_goals_against
+                'win_rate': stats['win_rate'],
+                'avg_goals_for': stats['avg_goals_for'],
+                'avg_goals_against': stats['avg_goals_against'],
+                'goal_difference': stats['avg_goals_for'] - stats['avg_goals_against']
             })
     
     results.sort(key=lambda x: (x['win_rate'], x['goal_difference']), reverse=True)
     return results
 
-def analyze_player_synergy_pairs(df, match_info_df, team_id, min_games_together=3):
-    """선수 쌍별 시너지 효과 분석"""
-    team_data = df[df['team_id'] == team_id]
-    team_players = team_data['player_id'].unique()
-    
-    # 각 선수의 경기 목록 (NaN 제외)
-    player_games = {}
-    for player_id in team_players:
-        if pd.notna(player_id):
-            player_games[player_id] = set(team_data[team_data['player_id'] == player_id]['game_id'].unique())
-    
-    # 선수 쌍별 시너지 분석
-    synergy_results = []
-    
-    # NaN 제외한 선수 목록
-    valid_players = [pid for pid in team_players if pd.notna(pid)]
-    
-    for player1_id, player2_id in combinations(valid_players, 2):
-        if player1_id == player2_id:
-            continue
-        
-        together_games = player_games[player1_id] & player_games[player2_id]
-        
-        if len(together_games) >= min_games_together:
-            # 함께 뛴 경기의 성과
-            together_performance = calculate_team_performance(match_info_df, together_games, team_id)
-            
-            # 각자 따로 뛴 경기
-            player1_alone = player_games[player1_id] - player_games[player2_id]
-            player2_alone = player_games[player2_id] - player_games[player1_id]
-            separate_games = player1_alone | player2_alone
-            
-            if len(separate_games) > 0:
-                separate_performance = calculate_team_performance(match_info_df, separate_games, team_id)
-                
-                # 선수 이름
-                player1_data = team_data[team_data['player_id'] == player1_id]
-                player2_data = team_data[team_data['player_id'] == player2_id]
-                player1_name = player1_data['player_name_ko'].iloc[0] if len(player1_data) > 0 else '알 수 없음'
-                player2_name = player2_data['player_name_ko'].iloc[0] if len(player2_data) > 0 else '알 수 없음'
-                
-                synergy_results.append({
-                    'player1_id': player1_id,
-                    'player1_name': player1_name,
-                    'player2_id': player2_id,
-                    'player2_name': player2_name,
-                    'together_games': len(together_games),
-                    'separate_games': len(separate_games),
-                    'together_win_rate': together_performance['win_rate'],
-                    'separate_win_rate': separate_performance['win_rate'],
-                    'win_rate_improvement': together_performance['win_rate'] - separate_performance['win_rate'],
-                    'together_avg_goals_for': together_performance['avg_goals_for'],
-                    'separate_avg_goals_for': separate_performance['avg_goals_for'],
-                    'goals_improvement': together_performance['avg_goals_for'] - separate_performance['avg_goals_for']
-                })
-    
-    # 시너지 효과가 큰 순으로 정렬
-    synergy_results.sort(key=lambda x: x['win_rate_improvement'], reverse=True)
-    
-    return synergy_results
+def analyze_player_synergy_pairs(df, match_info_df, team_id, min_games_together=3, top_k=None):
+    """
+    선수 쌍별 시너지 효과 분석
+    
+    출전 행렬 × 경기 결과 벡터로 모든 쌍을 한 번에 계산 (synergy.calculate_synergy)
+    """
+    return calculate_synergy(select_team(df, team_id), match_info_df, team_id,
+                             min_games_together=min_games_together, top_k=top_k)
 
-def calculate_team_performance(match_info_df, game_ids, team_id):
-    """팀의 경기 성과 계산"""
+def calculate_team_performance(match_info_df, game_ids, team_id, result_table=None):
+    """
+    팀의 경기 성과 계산
+    
+    result_table: build_team_game_results 결과 (None이면 match_info_df로 생성)
+    """
     if len(game_ids) == 0:
         return {'win_rate': 0, 'avg_goals_for': 0, 'avg_goals_against': 0}
     
-    wins = 0
-    draws = 0
-    losses = 0
-    goals_for = 0
-    goals_against = 0
-    
-    for game_id in game_ids:
-        game_info = match_info_df[match_info_df['game_id'] == game_id]
-        if len(game_info) == 0:
-            continue
-        
-        is_home = game_info['home_team_id'].iloc[0] == team_id
-        home_score = game_info['home_score'].iloc[0]
-        away_score = game_info['away_score'].iloc[0]
-        
-        if is_home:
-            goals_for += home_score
-            goals_against += away_score
-            if home_score > away_score:
-                wins += 1
-            elif home_score == away_score:
-                draws += 1
-            else:
-                losses += 1
-        else:
-            goals_for += away_score
-            goals_against += home_score
-            if away_score > home_score:
-                wins += 1
-            elif away_score == home_score:
-                draws += 1
-            else:
-                losses += 1
+    if result_table is None:
+        result_table = build_team_game_results(match_info_df)
+    stats = aggregate_team_games(result_table, team_id, game_ids)
     
-    game_count = len(game_ids)
     return {
-        'win_rate': wins / game_count if game_count > 0 else 0,
-        'avg_goals_for': goals_for / game_count if game_count > 0 else 0,
-        'avg_goals_against': goals_against / game_count if game_count > 0 else 0
+        'win_rate': stats['win_rate'],
+        'avg_goals_for': stats['avg_goals_for'],
+        'avg_goals_against': stats['avg_goals_against']
     }
 
 def generate_combination_report(df, match_info_df, team_id, team_name):
@@ -429,8 +291,8 @@ if __name__ == '__main__':
         
         print(f"\n팀: {jeonbuk_team_name} (team_id: {jeonbuk_team_id})")
         
-        # 리포트 생성
-        report = generate_combination_report(df, match_info_df, jeonbuk_team_id, jeonbuk_team_name)
+        # 리포트 생성 (팀/경기 구간 조회는 이벤트 인덱스 사용)
+        report = generate_combination_report(EventIndex(df), match_info_df, jeonbuk_team_id, jeonbuk_team_name)
         
         # 파일 저장
         output_path = PROJECT_ROOT / 'analysis' / 'JEONBUK_COMBINATION_ANALYSIS.md'
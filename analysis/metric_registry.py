@@ -0,0 +1,652 @@
+"""
+선수 지표 레지스트리 및 일괄 계산 실행기
+
+목적: 스크립트마다 복사되어 조금씩 다르게 구현된 calculate_player_profile
+      (선수마다 이벤트 로그를 다시 필터링) 대신, 각 지표가 이벤트 필터와 리듀서를 선언하고
+      하나의 실행기가 요청된 지표 전체를 이벤트 로그 한 번 스캔(bincount 집계)으로 모든 선수에 대해 계산
+
+구성:
+- FILTERS: 이벤트 필터 이름 → 이벤트 단위 불리언 마스크 (다른 필터를 조합하여 정의 가능)
+- VALUES: 값 이름 → 이벤트 단위 값 (길이, 위치 등)
+- METRICS: 지표 ID → 리듀서 선언
+    ratio(필터, 분모 필터)   분모 이벤트 중 필터 이벤트 비율 (분모가 0이면 기본값)
+    complement(필터, 분모)   1 - ratio (분모가 0이면 기본값)
+    mean(값, 필터)           필터 이벤트의 값 평균 (NaN 제외, 대상 이벤트가 없으면 기본값, 값이 모두 NaN이면 NaN)
+    sum_per(값, 필터, 분모)  필터 이벤트 값 합계 / 분모 이벤트 수 (예: 점유당 전진 거리)
+    per_game(필터)           경기당 필터 이벤트 수
+    count(필터) / games()    필터 이벤트 수 / 출전 경기 수 (정수)
+- PROFILE_SETS: 스크립트별 프로파일 (출력 컬럼 → 지표 ID)
+
+점유 지표(possession_*)는 이벤트 스토어의 점유 라벨 컬럼(possession.py)을 사용하며
+by='possession_team_id'로 집계하면 팀 단위 지표 (점유 수, 체인 길이, 점유당 전진, 턴오버 비율)
+
+기존 복사본 간 정의 차이는 결과가 바뀌지 않도록 통일하지 않고 지표 ID로 구분:
+- 전진 패스: end_y > start_y (forward_pass) / dx > 0 (forward_pass_dx)
+- 길이: 시작-끝 좌표 (length, float64, 롱패스 >= 20) / dx·dy (length_dx, 원래 dtype, 롱패스 > 20)
+- 터치 위치/구역: 터치 이벤트 기준 (touch_*) / 모든 이벤트 기준 (event_*), 구역 경계도 프로파일마다 다름
+- 수비 행동: 이벤트 유형 집합이 프로파일마다 다름 (defensive_action / ball_winning / block)
+
+임계값 비교는 컬럼의 원래 dtype(float32 좌표)으로 수행하므로 경계값 판정은 기존 복사본과 동일하고,
+평균은 float64로 누적 (선수별 pandas float32 평균과는 1e-6 수준 차이)
+
+집계는 가산 통계(필터별 개수, 값 합계, 출전 경기 수)를 먼저 만든 뒤 지표로 변환하므로
+(metric_stats → finalize_metrics) 경기 묶음별 통계를 더해 증분 갱신에도 사용 (season_state)
+청크 단위 스트리밍 집계(stream_profiles)는 stat_arrays에 앞 청크 통계를 넘겨 전체 집계와 같은 값을 얻음
+"""
+
+import numpy as np
+import pandas as pd
+
+from event_index import event_frame, select_player
+from event_windows import BUILD_UP_WINDOW, window_has_event
+
+# 지표/프로파일 정의가 바뀌면 증가시켜 프로파일 캐시(profile_cache)를 무효화
+METRICS_VERSION = 2
+
+TOUCH_TYPES = ['Pass', 'Carry', 'Shot', 'Pass Received']
+DEFENSIVE_TYPES = ['Intervention', 'Tackle', 'Block', 'Clearance']
+BALL_WINNING_TYPES = ['Tackle', 'Interception', 'Clearance', 'Recovery']
+BLOCK_TYPES = ['Intervention', 'Block']
+
+
+def _type_is(*types):
+    return lambda c: c.column('type_name').isin(types).to_numpy()
+
+
+def _coord(name):
+    return lambda c: c.column(name).to_numpy()
+
+
+FILTERS = {
+    'event': lambda c: np.ones(c.n, dtype=bool),
+    'pass': _type_is('Pass'),
+    'carry': _type_is('Carry'),
+    'touch': _type_is(*TOUCH_TYPES),
+    'tackle': _type_is('Tackle'),
+    'clearance': _type_is('Clearance'),
+    'shot': _type_is('Shot'),
+    'pass_received': _type_is('Pass Received'),
+    'defensive_action': _type_is(*DEFENSIVE_TYPES),
+    'ball_winning': _type_is(*BALL_WINNING_TYPES),
+    'block': _type_is(*BLOCK_TYPES),
+    'successful_pass': lambda c: c['pass'] & c.column('result_name').eq('Successful').to_numpy(),
+
+    # 패스 (시작-끝 좌표 기준)
+    'forward_pass': lambda c: c['pass'] & (c['end_y'] > c['start_y']),
+    'successful_forward_pass': lambda c: c['forward_pass'] & c['successful_pass'],
+    'long_pass': lambda c: c['pass'] & (c['length'] >= 20),
+    'very_long_pass': lambda c: c['pass'] & (c['length'] >= 30),
+    'short_pass': lambda c: c['pass'] & (c['length'] <= 10),
+
+    # 패스 (dx/dy 기준)
+    'forward_pass_dx': lambda c: c['pass'] & (c['dx'] > 0),
+    'successful_forward_pass_dx': lambda c: c['forward_pass_dx'] & c['successful_pass'],
+    'long_pass_dx': lambda c: c['pass'] & (c['length_dx'] > 20),
+    'very_long_pass_dx': lambda c: c['pass'] & (c['length_dx'] > 30),
+    'short_pass_dx': lambda c: c['pass'] & (c['length_dx'] <= 10),
+
+    # 터치 구역 (터치 이벤트 기준)
+    'touch_central': lambda c: c['touch'] & (c['start_x'] >= 33) & (c['start_x'] <= 67),
+    'touch_defensive': lambda c: c['touch'] & (c['start_y'] <= 50),
+    'touch_midfield': lambda c: c['touch'] & (c['start_y'] >= 25) & (c['start_y'] <= 75),
+    'touch_forward': lambda c: c['touch'] & (c['start_y'] >= 50),
+
+    # 이벤트 구역 (모든 이벤트 기준)
+    'event_central': lambda c: (c['start_x'] >= 30) & (c['start_x'] <= 70),
+    'event_wide': lambda c: (c['start_x'] < 30) | (c['start_x'] > 70),
+    'defensive_third': lambda c: c['start_y'] < 33.3,
+    'middle_third': lambda c: (c['start_y'] >= 33.3) & (c['start_y'] <= 66.6),
+    'attacking_third': lambda c: c['start_y'] > 66.6,
+    'defensive_zone': lambda c: c['start_y'] < 30,
+    'midfield_zone': lambda c: (c['start_y'] >= 30) & (c['start_y'] < 50),
+    'forward_zone': lambda c: c['start_y'] >= 50,
+    'forward_half': lambda c: c['start_y'] > 50,
+
+    # 빌드업 시퀀스 (같은 선수/경기/피리어드 안에서 BUILD_UP_WINDOW초 이내, event_windows)
+    'received_then_pass': lambda c: window_has_event(
+        c.events, c['pass_received'], c['pass'], BUILD_UP_WINDOW, 'after'),
+    'received_without_prior_pass': lambda c: c['pass_received'] & ~window_has_event(
+        c.events, c['pass_received'], c['pass'], BUILD_UP_WINDOW, 'before'),
+
+    # 점유 (이벤트 스토어 점유 라벨, possession.py)
+    'possession_start': lambda c: c.column('action_id').to_numpy() == c.column('possession_start').to_numpy(),
+    'in_possession': lambda c: c.column('team_id').to_numpy() == c.column('possession_team_id').to_numpy(),
+    'possession_progressive': lambda c: (
+        c['in_possession'] & c.column('type_name').isin(['Pass', 'Carry']).to_numpy() &
+        c.column('result_name').eq('Successful').to_numpy()),
+    'possession_turnover': lambda c: c['possession_start'] & c.column('possession_outcome').eq('turnover').to_numpy(),
+    'possession_shot': lambda c: c['possession_start'] & c.column('possession_outcome').eq('shot').to_numpy(),
+}
+
+
+def _float(name):
+    return lambda c: c.column(name).to_numpy(dtype=float)
+
+
+VALUES = {
+    # 원래 dtype (임계값 비교용)
+    'start_x': _coord('start_x'),
+    'start_y': _coord('start_y'),
+    'end_y': _coord('end_y'),
+    'dx': _coord('dx'),
+    'dy': _coord('dy'),
+    'length_dx': lambda c: np.sqrt(c['dx']**2 + c['dy']**2),
+    # float64 (profile_engine 정의)
+    'length': lambda c: np.sqrt((c['end_x64'] - c['start_x64'])**2 + (c['end_y64'] - c['start_y64'])**2),
+    'forward_distance': lambda c: c['end_y64'] - c['start_y64'],
+    'start_x64': _float('start_x'),
+    'start_y64': _float('start_y'),
+    'end_x64': _float('end_x'),
+    'end_y64': _float('end_y'),
+}
+
+
+def ratio(filter_name, base='event', default=0.0):
+    return {'reducer': 'ratio', 'filter': filter_name, 'base': base, 'default': default}
+
+
+def complement(filter_name, base, default=0.0):
+    return {'reducer': 'complement', 'filter': filter_name, 'base': base, 'default': default}
+
+
+def mean(value, filter_name, default=0.0):
+    return {'reducer': 'mean', 'value': value, 'filter': filter_name, 'default': default}
+
+
+def sum_per(value, filter_name, base):
+    return {'reducer': 'sum_per', 'value': value, 'filter': filter_name, 'base': base}
+
+
+def per_game(filter_name):
+    return {'reducer': 'per_game', 'filter': filter_name}
+
+
+def count(filter_name):
+    return {'reducer': 'count', 'filter': filter_name}
+
+
+def games():
+    return {'reducer': 'games'}
+
+
+METRICS = {
+    # 패스 (시작-끝 좌표 기준, 랭킹 정의)
+    'forward_pass_ratio': ratio('forward_pass', 'pass'),
+    'long_pass_ratio': ratio('long_pass', 'pass'),
+    'very_long_pass_ratio': ratio('very_long_pass', 'pass'),
+    'short_pass_ratio': ratio('short_pass', 'pass'),
+    'average_pass_length': mean('length', 'pass'),
+    'pass_success_rate': ratio('successful_pass', 'pass'),
+    'forward_pass_success_rate': ratio('successful_forward_pass', 'forward_pass'),
+    'average_forward_pass_distance': mean('forward_distance', 'forward_pass'),
+    'average_forward_pass_length': mean('length', 'forward_pass'),
+
+    # 패스 (dx/dy 기준)
+    'forward_pass_ratio_dx': ratio('forward_pass_dx', 'pass'),
+    'long_pass_ratio_dx': ratio('long_pass_dx', 'pass'),
+    'very_long_pass_ratio_dx': ratio('very_long_pass_dx', 'pass'),
+    'short_pass_ratio_dx': ratio('short_pass_dx', 'pass'),
+    'average_pass_length_dx': mean('length_dx', 'pass'),
+    'forward_pass_success_rate_dx': ratio('successful_forward_pass_dx', 'forward_pass_dx'),
+    'average_forward_pass_length_dx': mean('length_dx', 'forward_pass_dx'),
+
+    # 캐리
+    'average_carry_length': mean('length', 'carry'),
+    'average_carry_length_dx': mean('length_dx', 'carry'),
+    'carry_frequency': ratio('carry'),
+
+    # 터치 위치 (터치 이벤트 기준, 터치가 없는 선수는 중앙값)
+    'average_touch_x': mean('start_x64', 'touch', default=50),
+    'average_touch_y': mean('start_y64', 'touch', default=50),
+    'touch_zone_central': ratio('touch_central', 'touch', default=0.5),
+    'touch_zone_wide': complement('touch_central', 'touch', default=0.5),
+    'touch_zone_defensive': ratio('touch_defensive', 'touch', default=0.5),
+    'touch_zone_midfield': ratio('touch_midfield', 'touch', default=0.5),
+    'touch_zone_forward': ratio('touch_forward', 'touch', default=0.5),
+
+    # 이벤트 위치 (모든 이벤트 기준)
+    'average_event_x': mean('start_x', 'event', default=np.nan),
+    'average_event_y': mean('start_y', 'event', default=np.nan),
+    'event_zone_central': ratio('event_central'),
+    'event_zone_wide': ratio('event_wide'),
+    'event_zone_defensive_third': ratio('defensive_third'),
+    'event_zone_middle_third': ratio('middle_third'),
+    'event_zone_attacking_third': ratio('attacking_third'),
+    'event_zone_defensive': ratio('defensive_zone'),
+    'event_zone_midfield': ratio('midfield_zone'),
+    'event_zone_forward': ratio('forward_zone'),
+    'event_zone_forward_half': ratio('forward_half'),
+
+    # 수비 행동
+    'defensive_action_frequency': ratio('defensive_action'),
+    'ball_winning_frequency': ratio('ball_winning'),
+    'block_frequency': ratio('block'),
+    'tackle_frequency': ratio('tackle'),
+    'clearance_frequency': ratio('clearance'),
+
+    # 슈팅/패스 빈도
+    'shot_frequency': ratio('shot'),
+    'pass_frequency': ratio('pass'),
+    'pass_received_frequency': ratio('pass_received'),
+    'passes_per_game': per_game('pass'),
+    # 빌드업: 패스를 받은 후 바로 패스 (중간 참여) / 받기 전 패스 없음 (시작점)
+    'build_up_participation_ratio': ratio('received_then_pass', 'pass_received'),
+    'build_up_start_ratio': ratio('received_without_prior_pass', 'pass_received'),
+    'events_per_game': per_game('event'),
+
+    # 점유 (by='possession_team_id'면 팀 단위): 체인 길이는 점유 팀 이벤트 수,
+    # 전진은 점유 팀의 성공한 패스/캐리 전진 거리 (end_y - start_y) 합계
+    'possession_count': count('possession_start'),
+    'possession_chain_length': ratio('in_possession', 'possession_start'),
+    'possession_progression': sum_per('forward_distance', 'possession_progressive', 'possession_start'),
+    'possession_turnover_rate': ratio('possession_turnover', 'possession_start'),
+    'possession_shot_rate': ratio('possession_shot', 'possession_start'),
+
+    # 표본 크기
+    'event_count': count('event'),
+    'pass_count': count('pass'),
+    'game_count': games(),
+}
+
+# 롤 적합도 계산에 사용하는 23개 지표 (순서 고정)
+PROFILE_METRICS = [
+    'forward_pass_ratio', 'long_pass_ratio', 'very_long_pass_ratio', 'short_pass_ratio',
+    'average_pass_length', 'pass_success_rate', 'forward_pass_success_rate',
+    'average_forward_pass_distance', 'average_carry_length', 'carry_frequency',
+    'average_touch_x', 'average_touch_y', 'touch_zone_central', 'touch_zone_wide',
+    'touch_zone_defensive', 'touch_zone_midfield', 'touch_zone_forward',
+    'defensive_action_frequency', 'tackle_frequency', 'clearance_frequency',
+    'shot_frequency', 'pass_frequency', 'pass_received_frequency'
+]
+
+# 역할 검증 스크립트 공통 프로파일 (validate_roles, validate_park_jinseop)
+_ROLE_VALIDATION = {
+    'forward_pass_ratio': 'forward_pass_ratio_dx',
+    'long_pass_ratio': 'long_pass_ratio_dx',
+    'pass_success_rate': 'pass_success_rate',
+    'average_pass_length': 'average_pass_length_dx',
+    'average_carry_length': 'average_carry_length_dx',
+    'carry_frequency': 'carry_frequency',
+    'touch_zone_central': 'event_zone_central',
+    'touch_zone_wide': 'event_zone_wide',
+    'touch_zone_forward': 'event_zone_forward_half',
+    'average_touch_x': 'average_event_x',
+    'average_touch_y': 'average_event_y',
+    'defensive_action_frequency': 'block_frequency',
+    'shot_frequency': 'shot_frequency',
+}
+
+PROFILE_SETS = {
+    # 롤 랭킹 (profile_engine, jeonbuk_team_analysis)
+    'ranking': {
+        **{metric: metric for metric in PROFILE_METRICS},
+        'game_count': 'game_count',
+        'event_count': 'event_count',
+    },
+    # 웹 데이터 (generate_all_teams_data)
+    'teams_data': {
+        'forward_pass_ratio': 'forward_pass_ratio_dx',
+        'long_pass_ratio': 'long_pass_ratio_dx',
+        'very_long_pass_ratio': 'very_long_pass_ratio_dx',
+        'short_pass_ratio': 'short_pass_ratio_dx',
+        'average_pass_length': 'average_pass_length_dx',
+        'pass_success_rate': 'pass_success_rate',
+        'forward_pass_success_rate': 'forward_pass_success_rate_dx',
+        'average_forward_pass_distance': 'average_forward_pass_length_dx',
+        'average_carry_length': 'average_carry_length_dx',
+        'carry_frequency': 'carry_frequency',
+        'average_touch_x': 'average_event_x',
+        'average_touch_y': 'average_event_y',
+        'touch_zone_central': 'event_zone_central',
+        'touch_zone_wide': 'event_zone_wide',
+        'touch_zone_defensive': 'event_zone_defensive_third',
+        'touch_zone_midfield': 'event_zone_middle_third',
+        'touch_zone_forward': 'event_zone_attacking_third',
+        'defensive_action_frequency': 'ball_winning_frequency',
+        'tackle_frequency': 'tackle_frequency',
+        'clearance_frequency': 'clearance_frequency',
+        'shot_frequency': 'shot_frequency',
+        'pass_frequency': 'pass_frequency',
+        'pass_received_frequency': 'pass_received_frequency',
+        'game_count': 'game_count',
+        'event_count': 'event_count',
+    },
+    # 데이터 기반 롤 정의 (define_roles_from_data)
+    'comprehensive': {
+        'forward_pass_ratio': 'forward_pass_ratio_dx',
+        'long_pass_ratio': 'long_pass_ratio_dx',
+        'very_long_pass_ratio': 'very_long_pass_ratio_dx',
+        'short_pass_ratio': 'short_pass_ratio_dx',
+        'average_pass_length': 'average_pass_length_dx',
+        'pass_success_rate': 'pass_success_rate',
+        'forward_pass_success_rate': 'forward_pass_success_rate',
+        'average_forward_pass_distance': 'average_forward_pass_length',
+        'average_carry_length': 'average_carry_length_dx',
+        'carry_frequency': 'carry_frequency',
+        'average_touch_x': 'average_event_x',
+        'average_touch_y': 'average_event_y',
+        'touch_zone_central': 'event_zone_central',
+        'touch_zone_wide': 'event_zone_wide',
+        'touch_zone_defensive': 'event_zone_defensive',
+        'touch_zone_midfield': 'event_zone_midfield',
+        'touch_zone_forward': 'event_zone_forward',
+        'defensive_action_frequency': 'block_frequency',
+        'tackle_frequency': 'tackle_frequency',
+        'clearance_frequency': 'clearance_frequency',
+        'shot_frequency': 'shot_frequency',
+        'pass_frequency': 'pass_frequency',
+        'pass_received_frequency': 'pass_received_frequency',
+        'passes_per_game': 'passes_per_game',
+        'events_per_game': 'events_per_game',
+    },
+    # 롤 기반 비교 (role_based_comparison)
+    'role_comparison': {
+        'forward_pass_ratio': 'forward_pass_ratio_dx',
+        'long_pass_ratio': 'long_pass_ratio_dx',
+        'pass_success_rate': 'pass_success_rate',
+        'average_pass_length': 'average_pass_length_dx',
+        'forward_pass_success_rate': 'forward_pass_success_rate_dx',
+        'average_carry_length': 'average_carry_length_dx',
+        'carry_frequency': 'carry_frequency',
+        'touch_zone_central': 'event_zone_central',
+        'touch_zone_wide': 'event_zone_wide',
+        'touch_zone_forward': 'event_zone_forward_half',
+        'average_touch_x': 'average_event_x',
+        'average_touch_y': 'average_event_y',
+        'defensive_action_frequency': 'block_frequency',
+        'shot_frequency': 'shot_frequency',
+        'pass_frequency': 'pass_frequency',
+        'event_frequency': 'event_count',
+        'passes_per_game': 'passes_per_game',
+        'events_per_game': 'events_per_game',
+        'game_count': 'game_count',
+    },
+    # 딥라잉 플레이메이커 vs 빌드업형 센터백 (compare_deep_lying_vs_build_up_cb)
+    'build_up': {
+        'forward_pass_ratio': 'forward_pass_ratio_dx',
+        'long_pass_ratio': 'long_pass_ratio_dx',
+        'very_long_pass_ratio': 'very_long_pass_ratio_dx',
+        'pass_success_rate': 'pass_success_rate',
+        'average_pass_length': 'average_pass_length_dx',
+        'short_pass_ratio': 'short_pass_ratio_dx',
+        'forward_pass_success_rate': 'forward_pass_success_rate_dx',
+        'average_touch_x': 'average_event_x',
+        'average_touch_y': 'average_event_y',
+        'touch_zone_defensive': 'event_zone_defensive',
+        'touch_zone_midfield': 'event_zone_midfield',
+        'touch_zone_forward': 'event_zone_forward',
+        'touch_zone_central': 'event_zone_central',
+        'pass_received_frequency': 'pass_received_frequency',
+        'pass_frequency': 'pass_frequency',
+        'passes_per_game': 'passes_per_game',
+    },
+    # 롤 클러스터 검증 (validate_role_clusters, 간단 버전)
+    'cluster_validation': {
+        'long_pass_ratio': 'long_pass_ratio_dx',
+        'average_touch_y': 'average_event_y',
+        'pass_success_rate': 'pass_success_rate',
+    },
+    # 역할 검증 (validate_roles, validate_park_jinseop)
+    'role_validation': {
+        **_ROLE_VALIDATION,
+        'event_frequency': 'event_count',
+    },
+    # 딥라잉 플레이메이커 비교 (compare_deep_lying_playmakers)
+    'deep_lying_playmaker': {
+        **_ROLE_VALIDATION,
+        'pass_frequency': 'pass_frequency',
+        'event_frequency': 'event_count',
+    },
+    # 팀 점유 지표 (by='possession_team_id')
+    'possession': {
+        'possessions': 'possession_count',
+        'chain_length': 'possession_chain_length',
+        'progression_per_possession': 'possession_progression',
+        'turnover_rate': 'possession_turnover_rate',
+        'shot_rate': 'possession_shot_rate',
+    },
+}
+
+
+class EventColumns:
+    """이벤트 컬럼 + 필터/값 계산 결과 캐시 (실행기 한 번 동안 필터/값마다 한 번만 계산)"""
+
+    def __init__(self, events):
+        self.events = events
+        self.n = len(events)
+        self._cache = {}
+
+    def column(self, name):
+        return self.events[name]
+
+    def __getitem__(self, name):
+        if name not in self._cache:
+            definition = FILTERS.get(name) or VALUES.get(name)
+            if definition is None:
+                raise KeyError(f"등록되지 않은 필터/값: {name}")
+            self._cache[name] = definition(self)
+        return self._cache[name]
+
+
+def _requirements(metric_ids):
+    """지표 목록 → 필요한 (필터 개수, (값, 필터) 합계, 경기 수 여부)"""
+    counts = {'event': None}
+    sums = {}
+    need_games = False
+    for metric_id in metric_ids:
+        spec = METRICS[metric_id]
+        reducer = spec['reducer']
+        if reducer == 'games':
+            need_games = True
+            continue
+        counts[spec['filter']] = None
+        if reducer in ('ratio', 'complement'):
+            counts[spec['base']] = None
+        elif reducer == 'mean':
+            sums[(spec['value'], spec['filter'])] = None
+        elif reducer == 'sum_per':
+            counts[spec['base']] = None
+            sums[(spec['value'], spec['filter'])] = None
+        elif reducer == 'per_game':
+            need_games = True
+    return list(counts), list(sums), need_games
+
+
+def group_codes(events, by, sort):
+    """그룹 키 (컬럼 하나 또는 여러 개) → (그룹 코드, 키 Index - 여러 개면 MultiIndex)"""
+    if isinstance(by, str):
+        codes, keys = pd.factorize(events[by], sort=sort)
+        return codes, pd.Index(keys, name=by)
+    codes, keys = pd.MultiIndex.from_arrays([events[col].to_numpy() for col in by]).factorize(sort=sort)
+    return codes, keys.set_names(list(by))
+
+
+def _continued(previous, key, n):
+    """앞 청크까지의 통계 배열을 그룹 수 n으로 늘림 (새 그룹은 0)"""
+    values = previous[key]
+    if len(values) == n:
+        return values
+    return np.concatenate([values, np.zeros(n - len(values), dtype=values.dtype)])
+
+
+def stat_arrays(events, codes, n, metric_ids, filters=(), previous=None):
+    """
+    그룹 코드별 가산 통계 배열 (metric_stats의 집계 단계)
+
+    events: 그룹 키가 결측인 행을 제외한 이벤트 DataFrame
+    codes: 이벤트별 그룹 코드 (0 ~ n-1)
+    previous: 앞 청크까지의 통계 배열 (같은 그룹 코드, 그룹 수는 n 이하 - 청크 단위 스트리밍 집계용)
+              합계는 그룹별 이전 합계를 첫 항으로 두고 이어서 더하므로 전체를 한 번에 집계한 것과 덧셈 순서가 같음
+              (경기 수는 청크가 경기 단위로 나뉘어 있어야 가산)
+
+    반환: {통계 이름: 길이 n 배열}
+    """
+    columns = EventColumns(events)
+    counts, sums, need_games = _requirements(metric_ids)
+    counts = list(dict.fromkeys(counts + list(filters)))
+
+    def added(key, values):
+        return values if previous is None else values + _continued(previous, key, n)
+
+    stats = {}
+    for name in counts:
+        key = f'count:{name}'
+        stats[key] = added(key, np.bincount(codes[columns[name]], minlength=n))
+    for value, name in sums:
+        values = columns[value]
+        valid = columns[name] & ~np.isnan(values)
+        key = f'sum:{value}:{name}'
+        if previous is None:
+            stats[key] = np.bincount(codes[valid], weights=values[valid], minlength=n)
+        else:
+            stats[key] = np.bincount(np.concatenate([np.arange(n), codes[valid]]),
+                                     weights=np.concatenate([_continued(previous, key, n), values[valid]]),
+                                     minlength=n)
+        key = f'valid:{value}:{name}'
+        stats[key] = added(key, np.bincount(codes[valid], minlength=n))
+    if need_games:
+        pairs = pd.DataFrame({'code': codes, 'game_id': events['game_id'].to_numpy()}).drop_duplicates()
+        stats['games'] = added('games', np.bincount(pairs['code'].to_numpy(), minlength=n))
+    return stats
+
+
+def metric_stats(df, metric_ids, by='player_id', sort=True, filters=()):
+    """
+    지표 계산에 필요한 그룹별 가산 통계 (이벤트 로그 한 번 스캔)
+
+    df: 이벤트 DataFrame 또는 EventIndex
+    by: 그룹 키 컬럼 (기본 선수, 예: 'main_position'이면 포지션 전체를 한 그룹으로 집계,
+        ['player_id', 'game_id']처럼 여러 개면 MultiIndex - 선수-경기별 통계)
+    sort: True면 키 순서, False면 이벤트 로그에 처음 나온 순서
+    filters: 지표와 별도로 개수를 집계할 필터 (그룹 선택 조건 등)
+
+    반환: by 인덱스 DataFrame
+          (count:필터, sum:값:필터, valid:값:필터, games 컬럼 - 그룹별로 더할 수 있는 값)
+    """
+    events = event_frame(df)
+    if isinstance(by, str):
+        events = events[events[by].notna()]
+    else:
+        events = events[events[list(by)].notna().all(axis=1)]
+    codes, index = group_codes(events, by, sort)
+    return pd.DataFrame(stat_arrays(events, codes, len(index), metric_ids, filters), index=index)
+
+
+def _ratio(numerator, denominator, default=0.0):
+    """분모가 0인 그룹은 기본값으로 채우는 비율 계산"""
+    return np.divide(numerator, denominator, out=np.full(len(numerator), default, dtype=float),
+                     where=denominator > 0)
+
+
+def finalize_metrics(stats, metric_ids):
+    """
+    가산 통계 → 지표 테이블
+
+    반환: stats와 같은 인덱스의 DataFrame (컬럼: metric_ids, count/games 지표는 int)
+    """
+    def counted(name):
+        return stats[f'count:{name}'].to_numpy(dtype=float)
+
+    metrics = {}
+    for metric_id in metric_ids:
+        spec = METRICS[metric_id]
+        reducer = spec['reducer']
+        if reducer == 'ratio':
+            metrics[metric_id] = _ratio(counted(spec['filter']), counted(spec['base']), spec['default'])
+        elif reducer == 'complement':
+            base = counted(spec['base'])
+            share = _ratio(counted(spec['filter']), base)
+            metrics[metric_id] = np.where(base > 0, 1 - share, spec['default'])
+        elif reducer == 'mean':
+            key = f"{spec['value']}:{spec['filter']}"
+            total = stats[f'sum:{key}'].to_numpy(dtype=float)
+            valid = stats[f'valid:{key}'].to_numpy(dtype=float)
+            average = np.divide(total, valid, out=np.full(len(total), np.nan), where=valid > 0)
+            metrics[metric_id] = np.where(counted(spec['filter']) > 0, average, spec['default'])
+        elif reducer == 'sum_per':
+            total = stats[f"sum:{spec['value']}:{spec['filter']}"].to_numpy(dtype=float)
+            metrics[metric_id] = _ratio(total, counted(spec['base']))
+        elif reducer == 'per_game':
+            metrics[metric_id] = _ratio(counted(spec['filter']), stats['games'].to_numpy(dtype=float))
+        elif reducer == 'count':
+            metrics[metric_id] = counted(spec['filter']).astype(int)
+        elif reducer == 'games':
+            metrics[metric_id] = stats['games'].to_numpy(dtype=float).astype(int)
+        else:
+            raise ValueError(f"알 수 없는 리듀서: {reducer}")
+
+    return pd.DataFrame(metrics, index=stats.index)
+
+
+def profile_set_metrics(name):
+    """프로파일 구성에 필요한 지표 ID 목록 (중복 제거)"""
+    return list(dict.fromkeys(PROFILE_SETS[name].values()))
+
+
+def finalize_profile_set(stats, name):
+    """가산 통계 → 프로파일 구성 테이블 (컬럼 이름은 PROFILE_SETS[name]의 출력 컬럼)"""
+    columns = PROFILE_SETS[name]
+    metrics = finalize_metrics(stats, profile_set_metrics(name))
+    return pd.DataFrame({column: metrics[metric_id] for column, metric_id in columns.items()},
+                        index=stats.index)
+
+
+def filter_groups(table, stats, min_events, require):
+    """최소 이벤트 수 / 필수 필터 조건을 만족하는 그룹만"""
+    keep = stats['count:event'].to_numpy() >= min_events
+    if require is not None:
+        keep &= stats[f'count:{require}'].to_numpy() > 0
+    return table[keep]
+
+
+def calculate_metrics(df, metric_ids, min_events=0, require=None, by='player_id', sort=True):
+    """
+    요청된 지표를 모든 그룹(선수)에 대해 한 번의 스캔으로 계산
+
+    min_events: 최소 이벤트 수 (미만인 그룹 제외)
+    require: 해당 필터 이벤트가 하나도 없는 그룹 제외 (예: 'pass')
+    반환: by 인덱스 DataFrame (컬럼: metric_ids)
+    """
+    metric_ids = list(dict.fromkeys(metric_ids))
+    extra = [] if require is None else [require]
+    stats = metric_stats(df, metric_ids, by=by, sort=sort, filters=extra)
+    return filter_groups(finalize_metrics(stats, metric_ids), stats, min_events, require)
+
+
+def calculate_profile_set(df, name, min_events=0, require=None, by='player_id', sort=True):
+    """
+    스크립트별 프로파일 구성(PROFILE_SETS[name])을 모든 그룹(선수)에 대해 한 번의 스캔으로 계산
+
+    반환: by 인덱스 DataFrame (컬럼: 프로파일 출력 컬럼)
+    """
+    extra = [] if require is None else [require]
+    stats = metric_stats(df, profile_set_metrics(name), by=by, sort=sort, filters=extra)
+    return filter_groups(finalize_profile_set(stats, name), stats, min_events, require)
+
+
+def profile_row(profiles, key):
+    """
+    프로파일 테이블의 한 행 → 딕셔너리 (정수 컬럼은 int, 나머지는 float)
+
+    반환: 테이블에 없으면 None
+    """
+    if key not in profiles.index:
+        return None
+    profile = {}
+    for column in profiles.columns:
+        value = profiles.at[key, column]
+        profile[column] = int(value) if pd.api.types.is_integer_dtype(profiles[column]) else float(value)
+    return profile
+
+
+def player_profile(df, player_id, name, min_events=0, require=None):
+    """
+    한 선수의 프로파일 (선수 이벤트 구간만 집계, calculate_profile_set과 같은 정의)
+
+    반환: 딕셔너리 (이벤트가 없거나 조건을 만족하지 않으면 None)
+    """
+    player_data = select_player(df, player_id)
+    if len(player_data) == 0:
+        return None
+    profiles = calculate_profile_set(player_data, name, min_events=min_events, require=require)
+    return profile_row(profiles, player_id)
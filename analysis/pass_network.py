@@ -0,0 +1,108 @@
+"""
+패스 네트워크 (패스 주는 선수 → 받는 선수) 엣지 리스트 일괄 생성
+
+목적: 패스마다 iterrows()로 팀 전체 이벤트를 다시 필터링해 다음 Pass Received를 찾는 대신,
+      (팀, 경기, action_id) 정렬 키에 searchsorted를 한 번 적용해 모든 패스의 수신자를 선형 시간에 연결
+
+연결 규칙 (기존 analyze_pass_network와 동일):
+- 같은 팀, 같은 경기에서 패스 이후 5개 action_id 이내의 첫 Pass Received 선수가 수신자
+- 자기 자신에게 연결된 패스는 제외
+"""
+
+import numpy as np
+import pandas as pd
+
+# 패스 이후 수신 이벤트를 찾는 action_id 범위
+RECEIVE_WINDOW = 5
+
+EDGE_COLUMNS = ['count', 'successful', 'total_length']
+
+
+def link_pass_receivers(df, window=RECEIVE_WINDOW):
+    """
+    각 패스에 수신자 연결
+
+    반환: 패스 행 DataFrame (원래 순서) + receiver_id 컬럼 (수신 이벤트가 없으면 NaN)
+    """
+    type_name = df['type_name']
+    is_pass = type_name.eq('Pass').to_numpy()
+    is_received = type_name.eq('Pass Received').to_numpy()
+
+    # (팀, 경기) 그룹 코드와 action_id를 하나의 정렬 키로 결합
+    group = df.groupby(['team_id', 'game_id'], sort=False, observed=True).ngroup().to_numpy().astype(np.int64)
+    action = df['action_id'].to_numpy().astype(np.int64)
+    action_min = action.min() if len(action) > 0 else 0
+    span = (action.max() - action_min if len(action) > 0 else 0) + window + 1
+    key = group * span + (action - action_min)
+
+    received_rows = np.flatnonzero(is_received)
+    order = np.argsort(key[received_rows], kind='stable')
+    received_rows = received_rows[order]
+    received_key = key[received_rows]
+
+    pass_rows = np.flatnonzero(is_pass)
+    pass_key = key[pass_rows]
+
+    # 패스 action_id보다 큰 첫 수신 이벤트 → 같은 그룹이고 window 이내면 연결
+    pos = np.searchsorted(received_key, pass_key, side='right')
+    found = pos < len(received_rows)
+    if len(received_rows) > 0:
+        candidate = received_rows[np.minimum(pos, len(received_rows) - 1)]
+    else:
+        candidate = pass_rows  # 수신 이벤트 없음 (found는 모두 False)
+    found &= group[candidate] == group[pass_rows]
+    found &= action[candidate] <= action[pass_rows] + window
+
+    passes = df.iloc[pass_rows].copy()
+    receiver_id = df['player_id'].to_numpy(dtype=float)[candidate]
+    passes['receiver_id'] = np.where(found, receiver_id, np.nan)
+    return passes
+
+
+def build_pass_edges(df, per_game=False, window=RECEIVE_WINDOW):
+    """
+    모든 팀(및 경기)의 패스 연결 엣지 리스트
+
+    per_game: True면 경기별 엣지 (game_id 컬럼 포함)
+
+    반환: DataFrame (team_id, [game_id,] passer_id, receiver_id, count, successful, total_length)
+          엣지 순서는 각 연결이 처음 나온 패스 순서
+    """
+    passes = link_pass_receivers(df, window)
+    linked = passes[
+        passes['player_id'].notna() & passes['receiver_id'].notna() &
+        (passes['player_id'] != passes['receiver_id'])
+    ]
+
+    keys = ['team_id', 'game_id'] if per_game else ['team_id']
+    edges = pd.DataFrame({
+        **{col: linked[col].to_numpy() for col in keys},
+        'passer_id': linked['player_id'].to_numpy(dtype=float),
+        'receiver_id': linked['receiver_id'].to_numpy(),
+        'successful': linked['result_name'].eq('Successful').to_numpy().astype(int),
+        'length': np.sqrt(
+            (linked['end_x'].to_numpy(dtype=float) - linked['start_x'].to_numpy(dtype=float))**2 +
+            (linked['end_y'].to_numpy(dtype=float) - linked['start_y'].to_numpy(dtype=float))**2
+        ),
+    })
+
+    return edges.groupby(keys + ['passer_id', 'receiver_id'], sort=False).agg(
+        count=('successful', 'size'),
+        successful=('successful', 'sum'),
+        total_length=('length', 'sum'),
+    ).reset_index()
+
+
+def select_team_edges(edges, team_id, game_id=None):
+    """
+    엣지 리스트에서 팀(및 경기)의 엣지만 추출
+
+    game_id 지정 시 경기별 엣지(per_game=True) 필요, 경기별 엣지에서 game_id가 없으면 시즌 합산
+    """
+    team_edges = edges[edges['team_id'] == team_id]
+    if game_id is not None:
+        return team_edges[team_edges['game_id'] == game_id]
+    if 'game_id' in team_edges.columns:
+        team_edges = team_edges.groupby(['team_id', 'passer_id', 'receiver_id'], sort=False)[EDGE_COLUMNS].sum()
+        team_edges = team_edges.reset_index()
+    return team_edges
@@ -7,20 +7,19 @@
 4. 시너지 효과 분석
 """
 
-import pandas as pd
 import numpy as np
 import json
 from pathlib import Path
 from collections import defaultdict
 from itertools import combinations
 
-PROJECT_ROOT = Path(__file__).parent.parent
+from event_store import load_data
+from event_index import EventIndex, select_player, select_team, select_team_game
+from game_results import aggregate_team_games, build_team_game_results, player_game_teams
+from pass_network import build_pass_edges, select_team_edges
+from spatial_grid import calculate_grids, zone_ratios
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+PROJECT_ROOT = Path(__file__).parent.parent
 
 def load_role_templates():
     """롤 템플릿 로딩"""
@@ -28,95 +27,77 @@ def load_role_templates():
     with open(template_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def analyze_pass_network(df, team_id, game_id=None):
+def analyze_pass_network(df, team_id, game_id=None, edges=None):
     """
     팀의 패스 네트워크 분석
     
+    edges: build_pass_edges 결과 (여러 팀을 분석할 때 미리 한 번 계산, 경기 지정 시 per_game=True)
+    
     반환:
     - 선수 간 패스 연결 매트릭스
     - 패스 성공률
     - 패스 빈도
     """
     if game_id is not None:
-        team_data = df[(df['team_id'] == team_id) & (df['game_id'] == game_id)]
+        team_data = select_team_game(df, team_id, game_id)
     else:
-        team_data = df[df['team_id'] == team_id]
+        team_data = select_team(df, team_id)
     
     # 패스 데이터만 추출
-    passes = team_data[team_data['type_name'] == 'Pass'].copy()
+    total_passes = int((team_data['type_name'] == 'Pass').sum())
     
-    if len(passes) == 0:
+    if total_passes == 0:
         return None
     
-    # 패스 연결 매트릭스 생성
-    pass_network = defaultdict(lambda: {'count': 0, 'successful': 0})
-    
-    for idx, pass_row in passes.iterrows():
-        passer_id = pass_row['player_id']
-        
-        # 패스를 받은 선수 찾기 (다음 이벤트가 Pass Received인 경우)
-        next_events = team_data[
-            (team_data['game_id'] == pass_row['game_id']) &
-            (team_data['action_id'] > pass_row['action_id']) &
-            (team_data['action_id'] <= pass_row['action_id'] + 5)  # 5개 이벤트 내
-        ]
-        
-        received = next_events[next_events['type_name'] == 'Pass Received']
-        if len(received) > 0:
-            receiver_id = received.iloc[0]['player_id']
-            
-            if passer_id != receiver_id:  # 자기 자신에게 패스한 경우 제외
-                pass_network[(passer_id, receiver_id)]['count'] += 1
-                if pass_row['result_name'] == 'Successful':
-                    pass_network[(passer_id, receiver_id)]['successful'] += 1
+    # 패스 연결 엣지 (다음 5개 이벤트 내 Pass Received 선수)
+    if edges is None:
+        team_edges = build_pass_edges(team_data)
+    else:
+        team_edges = select_team_edges(edges, team_id, game_id)
     
     # 선수 목록
-    players = team_data['player_id'].unique()
-    player_names = {}
-    for player_id in players:
-        player_data = team_data[team_data['player_id'] == player_id]
-        if len(player_data) > 0:
-            player_names[player_id] = player_data['player_name_ko'].iloc[0]
+    named = team_data[team_data['player_id'].notna()].drop_duplicates('player_id')
+    player_names = dict(zip(named['player_id'], named['player_name_ko']))
     
     # 네트워크 매트릭스 생성
     network_matrix = {}
-    for (passer_id, receiver_id), stats in pass_network.items():
+    for passer_id, receiver_id, count, successful in zip(
+        team_edges['passer_id'], team_edges['receiver_id'], team_edges['count'], team_edges['successful']
+    ):
         network_matrix[(passer_id, receiver_id)] = {
             'passer_name': player_names.get(passer_id, '알 수 없음'),
             'receiver_name': player_names.get(receiver_id, '알 수 없음'),
-            'count': stats['count'],
-            'successful': stats['successful'],
-            'success_rate': stats['successful'] / stats['count'] if stats['count'] > 0 else 0
+            'count': int(count),
+            'successful': int(successful),
+            'success_rate': successful / count if count > 0 else 0
         }
     
     return {
         'network_matrix': network_matrix,
         'players': player_names,
-        'total_passes': len(passes)
+        'total_passes': total_passes
     }
 
-def analyze_role_combinations(df, match_info_df, team_id, role_templates):
+def analyze_role_combinations(df, match_info_df, team_id, role_templates, result_table=None):
     """
     롤 조합 분석
     
     같은 경기에 출전한 선수들의 롤 조합과 그 효과 분석
+    result_table: build_team_game_results 결과 (None이면 팀 경기로 생성)
     """
     # 팀의 모든 경기
-    team_games = df[df['team_id'] == team_id]['game_id'].unique()
+    team_games = select_team(df, team_id)['game_id'].unique()
+    if result_table is None:
+        result_table = build_team_game_results(match_info_df, team_games)
     
     role_combinations = defaultdict(lambda: {
         'games': [],
-        'wins': 0,
-        'draws': 0,
-        'losses': 0,
-        'goals_for': 0,
-        'goals_against': 0,
         'players': set()
     })
     
     # 각 경기별로 분석
     for game_id in team_games:
-        game_data = df[(df['game_id'] == game_id) & (df['team_id'] == team_id)]
+        game_data = select_team_game(df, team_id, game_id)
         if len(game_data) == 0:
             continue
         
@@ -142,44 +123,13 @@ def analyze_role_combinations(df, match_info_df, team_id, role_templates):
             role_combo = tuple(sorted([(pos, role) for _, pos, role in game_roles]))
             role_combinations[role_combo]['games'].append(game_id)
             role_combinations[role_combo]['players'].update([pid for pid, _, _ in game_roles])
-            
-            # 경기 결과
-            game_info = match_info_df[match_info_df['game_id'] == game_id]
-            if len(game_info) > 0:
-                is_home = game_info['home_team_id'].iloc[0] == team_id
-                home_score = game_info['home_score'].iloc[0]
-                away_score = game_info['away_score'].iloc[0]
-                
-                if is_home:
-                    goals_for = home_score
-                    goals_against = away_score
-                    if home_score > away_score:
-                        role_combinations[role_combo]['wins'] += 1
-                    elif home_score == away_score:
-                        role_combinations[role_combo]['draws'] += 1
-                    else:
-                        role_combinations[role_combo]['losses'] += 1
-                else:
-                    goals_for = away_score
-                    goals_against = home_score
-                    if away_score > home_score:
-                        role_combinations[role_combo]['wins'] += 1
-                    elif away_score == away_score:
-                        role_combinations[role_combo]['draws'] += 1
-                    else:
-                        role_combinations[role_combo]['losses'] += 1
-                
-                role_combinations[role_combo]['goals_for'] += goals_for
-                role_combinations[role_combo]['goals_against'] += goals_against
-    
-    # 결과 정리
+    
+    # 결과 정리 (조합별 경기 집합의 성과를 결과 테이블에서 집계)
     results = []
-    for role_combo, stats in role_combinations.items():
-        game_count = len(stats['games'])
+    for role_combo, combo_info in role_combinations.items():
+        game_count = len(combo_info['games'])
         if game_count > 0:
-            win_rate = stats['wins'] / game_count
-            avg_goals_for = stats['goals_for'] / game_count
-            avg_goals_against = stats['goals_against'] / game_count
+            stats = aggregate_team_games(result_table, team_id, combo_info['games'])
             
             results.append({
                 'role_combination': role_combo,
@@ -187,11 +137,11 @@ def analyze_role_combinations(df, match_info_df, team_id, role_templates):
                 'wins': stats['wins'],
                 'draws': stats['draws'],
                 'losses': stats['losses'],
-                'win_rate': win_rate,
-                'avg_goals_for': avg_goals_for,
-                'avg_goals_against': avg_goals_against,
-                'goal_difference': avg_goals_for - avg_goals_against,
-                'player_count': len(stats['players'])
+                'win_rate': stats['win_rate'],
+                'avg_goals_for': stats['avg_goals_for'],
+                'avg_goals_against': stats['avg_goals_against'],
+                'goal_difference': stats['avg_goals_for'] - stats['avg_goals_against'],
+                'player_count': len(combo_info['players'])
             })
     
     # 승률 순으로 정렬
@@ -206,9 +156,9 @@ def analyze_player_synergy(df, match_info_df, player_id_1, player_id_2):
     두 선수가 함께 뛴 경기 vs 따로 뛴 경기의 성과 비교
     """
     # 선수 1의 경기
-    player1_games = set(df[df['player_id'] == player_id_1]['game_id'].unique())
+    player1_games = set(select_player(df, player_id_1)['game_id'].unique())
     # 선수 2의 경기
-    player2_games = set(df[df['player_id'] == player_id_2]['game_id'].unique())
+    player2_games = set(select_player(df, player_id_2)['game_id'].unique())
     
     # 함께 뛴 경기
     together_games = player1_games & player2_games
@@ -218,10 +168,12 @@ def analyze_player_synergy(df, match_info_df, player_id_1, player_id_2):
     if len(together_games) == 0:
         return None
     
+    result_table = build_team_game_results(match_info_df)
+    
     # 함께 뛴 경기의 성과
-    together_stats = calculate_game_performance(match_info_df, together_games, df, player_id_1)
+    together_stats = calculate_game_performance(match_info_df, together_games, df, player_id_1, result_table)
     # 따로 뛴 경기의 성과
-    separate_stats = calculate_game_performance(match_info_df, separate_games, df, player_id_1)
+    separate_stats = calculate_game_performance(match_info_df, separate_games, df, player_id_1, result_table)
     
     return {
         'together_games': len(together_games),
@@ -235,8 +187,13 @@ def analyze_player_synergy(df, match_info_df, player_id_1, player_id_2):
         }
     }
 
-def calculate_game_performance(match_info_df, game_ids, df, player_id):
-    """경기들의 성과 계산"""
+def calculate_game_performance(match_info_df, game_ids, df, player_id, result_table=None):
+    """
+    경기들의 성과 계산
+    
+    경기마다 선수의 팀(해당 경기 첫 이벤트 팀) 관점으로 집계, 선수가 뛰지 않은 경기는 결과 제외
+    result_table: build_team_game_results 결과 (None이면 match_info_df로 생성)
+    """
     if len(game_ids) == 0:
         return {
             'win_rate': 0,
@@ -244,51 +201,17 @@ def calculate_game_performance(match_info_df, game_ids, df, player_id):
             'avg_goals_against': 0
         }
     
-    wins = 0
-    draws = 0
-    losses = 0
-    goals_for = 0
-    goals_against = 0
+    if result_table is None:
+        result_table = build_team_game_results(match_info_df)
+    
+    game_ids = list(game_ids)
+    team_ids = player_game_teams(select_player(df, player_id), game_ids)
+    stats = aggregate_team_games(result_table, team_ids, game_ids)
     
-    for game_id in game_ids:
-        game_info = match_info_df[match_info_df['game_id'] == game_id]
-        if len(game_info) == 0:
-            continue
-        
-        # 선수의 팀 찾기
-        player_data = df[(df['game_id'] == game_id) & (df['player_id'] == player_id)]
-        if len(player_data) == 0:
-            continue
-        
-        team_id = player_data['team_id'].iloc[0]
-        is_home = game_info['home_team_id'].iloc[0] == team_id
-        home_score = game_info['home_score'].iloc[0]
-        away_score = game_info['away_score'].iloc[0]
-        
-        if is_home:
-            goals_for += home_score
-            goals_against += away_score
-            if home_score > away_score:
-                wins += 1
-            elif home_score == away_score:
-                draws += 1
-            else:
-                losses += 1
-        else:
-            goals_for += away_score
-            goals_against += home_score
-            if away_score > home_score:
-                wins += 1
-            elif away_score == home_score:
-                draws += 1
-            else:
-                losses += 1
-    
-    game_count = len(game_ids)
     return {
-        'win_rate': wins / game_count if game_count > 0 else 0,
-        'avg_goals_for': goals_for / game_count if game_count > 0 else 0,
-        'avg_goals_against': goals_against / game_count if game_count > 0 else 0
+        'win_rate': stats['win_rate'],
+        'avg_goals_for': stats['avg_goals_for'],
+        'avg_goals_against': stats['avg_goals_against']
     }
 
 def analyze_spatial_coverage(df, team_id, game_id=None):
@@ -296,40 +219,51 @@ def analyze_spatial_coverage(df, team_id, game_id=None):
     공간 활용 조합 분석
     
     선수들의 평균 위치와 공간 커버리지 분석
+    (히트맵: 3x3 터치 그리드, 행 = 공격 방향 3등분 - spatial_grid)
     """
     if game_id is not None:
-        team_data = df[(df['team_id'] == team_id) & (df['game_id'] == game_id)]
+        team_data = select_team_game(df, team_id, game_id)
     else:
-        team_data = df[df['team_id'] == team_id]
+        team_data = select_team(df, team_id)
     
-    # 각 선수의 평균 터치 위치
-    player_positions = {}
+    # 각 선수의 평균 터치 위치 및 터치 히트맵 (선수별 반복 필터링 없이 한 번에 집계)
     touches = team_data[team_data['type_name'].isin(['Pass', 'Carry', 'Shot', 'Pass Received'])]
+    if len(touches) == 0:
+        return None
     
-    for player_id in touches['player_id'].unique():
-        player_touches = touches[touches['player_id'] == player_id]
-        if len(player_touches) > 0:
-            player_name = player_touches['player_name_ko'].iloc[0]
-            player_positions[player_id] = {
-                'name': player_name,
-                'avg_x': player_touches['start_x'].mean(),
-                'avg_y': player_touches['start_y'].mean(),
-                'touch_count': len(player_touches)
-            }
+    summary = touches.groupby('player_id', sort=False).agg(
+        name=('player_name_ko', 'first'),
+        avg_x=('start_x', 'mean'),
+        avg_y=('start_y', 'mean'),
+        touch_count=('type_name', 'size'),
+    )
+    player_grids = calculate_grids(touches, by='player_id', sort=False)
+    team_grids = calculate_grids(touches, by='team_id')
+    heatmaps = dict(zip(player_grids['keys'], player_grids['grids']['3x3']['counts'].tolist()))
     
-    # 공간 커버리지 계산 (간단한 방법: 선수들의 위치 분산)
-    if len(player_positions) > 0:
-        x_positions = [p['avg_x'] for p in player_positions.values()]
-        y_positions = [p['avg_y'] for p in player_positions.values()]
-        
-        spatial_coverage = {
-            'x_variance': np.var(x_positions),
-            'y_variance': np.var(y_positions),
-            'total_variance': np.var(x_positions) + np.var(y_positions),
-            'player_positions': player_positions
+    player_positions = {}
+    for player_id, row in summary.iterrows():
+        player_positions[player_id] = {
+            'name': row['name'],
+            'avg_x': float(row['avg_x']),
+            'avg_y': float(row['avg_y']),
+            'touch_count': int(row['touch_count']),
+            'heatmap': heatmaps[player_id]
         }
-    else:
-        spatial_coverage = None
+    
+    # 공간 커버리지 계산 (간단한 방법: 선수들의 위치 분산)
+    x_positions = summary['avg_x'].to_numpy(dtype=float)
+    y_positions = summary['avg_y'].to_numpy(dtype=float)
+    team_grid = team_grids['grids']['3x3']
+    
+    spatial_coverage = {
+        'x_variance': np.var(x_positions),
+        'y_variance': np.var(y_positions),
+        'total_variance': np.var(x_positions) + np.var(y_positions),
+        'team_heatmap': team_grid['counts'][0].tolist(),
+        'zone_ratios': {zone: float(values[0]) for zone, values in zone_ratios(team_grid).items()},
+        'player_positions': player_positions
+    }
     
     return spatial_coverage
 
@@ -338,6 +272,7 @@ if __name__ == '__main__':
     print("="*80)
     
     df, match_info_df = load_data()
+    events = EventIndex(df)
     role_templates = load_role_templates()
     
     # 전북 현대 모터스 team_id
@@ -348,7 +283,7 @@ if __name__ == '__main__':
         
         # 패스 네트워크 분석
         print("\n[1. 패스 네트워크 분석]")
-        pass_network = analyze_pass_network(df, jeonbuk_team_id)
+        pass_network = analyze_pass_network(events, jeonbuk_team_id)
         if pass_network:
             print(f"  총 패스 수: {pass_network['total_passes']}")
             print(f"  연결된 선수 쌍: {len(pass_network['network_matrix'])}")
@@ -366,7 +301,7 @@ if __name__ == '__main__':
         
         # 롤 조합 분석
         print("\n[2. 롤 조합 분석]")
-        role_combos = analyze_role_combinations(df, match_info_df, jeonbuk_team_id, role_templates)
+        role_combos = analyze_role_combinations(events, match_info_df, jeonbuk_team_id, role_templates)
         print(f"  발견된 롤 조합 수: {len(role_combos)}")
         
         if role_combos:
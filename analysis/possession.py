@@ -0,0 +1,144 @@
+"""
+점유(포제션) 시퀀스 분할
+
+목적: 분석마다 점유를 제각각 근사하는 대신 (shift()로 팀 변경 횟수 세기, 패스 후 5개 액션 앞 보기 등)
+      이벤트 로그를 (경기, 피리어드, action_id) 순으로 한 번 정렬하고 벡터 연산으로 점유 단위로 나누어
+      모든 이벤트에 점유 라벨을 붙임 (이벤트 스토어 컬럼으로 저장되므로 점유 기반 지표는 추가 스캔 없이 계산)
+
+점유 규칙:
+- 같은 경기/피리어드 안에서 공을 가진 팀이 바뀌면 새 점유 시작 (경기/피리어드가 바뀌어도 새 점유)
+- 상대 팀의 실패한 수비 행동 (CONTESTING_TYPES 중 Unsuccessful)은 공을 뺏지 못한 것이므로
+  점유를 끊지 않고 현재 점유에 포함
+- Shot / Out 이벤트는 점유를 끝냄 (다음 이벤트부터 새 점유, 같은 팀이어도)
+
+라벨 컬럼 (POSSESSION_COLUMNS):
+- possession_id: 경기 내 점유 번호 (1부터, (game_id, possession_id)가 점유 키 - 경기 묶음 증분 적재에도 그대로 유지)
+- possession_start / possession_end: 점유 첫/마지막 이벤트 action_id
+- possession_team_id: 점유 팀 (점유 중 상대 팀 이벤트도 같은 값)
+- possession_outcome: 점유 결과
+    shot      슈팅으로 종료
+    out       아웃으로 종료
+    turnover  상대 팀 점유로 넘어감
+    end       피리어드 종료
+"""
+
+import numpy as np
+import pandas as pd
+
+from event_windows import sorted_groups
+
+# 점유 구간 키 (없는 컬럼은 건너뜀)
+POSSESSION_KEYS = ['game_id', 'period_id']
+
+# 실패하면 점유를 끊지 않는 상대 팀 수비 행동
+CONTESTING_TYPES = ['Block', 'Intervention', 'Tackle', 'Interception', 'Clearance', 'Recovery']
+
+# 점유를 끝내는 이벤트 → 결과
+ENDING_TYPES = {'Shot': 'shot', 'Out': 'out'}
+
+OUTCOMES = ['shot', 'out', 'turnover', 'end']
+
+POSSESSION_COLUMNS = ['possession_id', 'possession_start', 'possession_end',
+                      'possession_team_id', 'possession_outcome']
+
+# 라벨 계산에 필요한 이벤트 컬럼
+REQUIRED_COLUMNS = ['game_id', 'action_id', 'team_id', 'type_name', 'result_name']
+
+
+def _forward_fill_index(mask):
+    """각 위치에서 mask가 True인 가장 최근 위치 (첫 위치는 항상 True여야 함)"""
+    return np.maximum.accumulate(np.where(mask, np.arange(len(mask)), 0))
+
+
+def label_possessions(df):
+    """
+    모든 이벤트의 점유 라벨 계산 (한 번의 정렬 + 벡터 연산)
+
+    df: 이벤트 DataFrame (행 순서 무관, REQUIRED_COLUMNS 필요)
+
+    반환: df와 같은 인덱스의 DataFrame (컬럼: POSSESSION_COLUMNS)
+    """
+    n = len(df)
+    if n == 0:
+        return pd.DataFrame({
+            'possession_id': np.zeros(0, dtype=np.int32),
+            'possession_start': df['action_id'].to_numpy(),
+            'possession_end': df['action_id'].to_numpy(),
+            'possession_team_id': df['team_id'].to_numpy(),
+            'possession_outcome': pd.Categorical([], categories=OUTCOMES),
+        }, index=df.index)
+
+    keys = [key for key in POSSESSION_KEYS if key in df.columns]
+    order, group, _ = sorted_groups(df, keys)
+
+    team = df['team_id'].to_numpy()[order]
+    action = df['action_id'].to_numpy()[order]
+    type_name = df['type_name']
+    contested = (type_name.isin(CONTESTING_TYPES) & df['result_name'].eq('Unsuccessful')).to_numpy()[order]
+    is_shot = type_name.eq('Shot').to_numpy()[order]
+    is_out = type_name.eq('Out').to_numpy()[order]
+
+    group_start = np.ones(n, dtype=bool)
+    group_start[1:] = group[1:] != group[:-1]
+    group_end = np.ones(n, dtype=bool)
+    group_end[:-1] = group_start[1:]
+
+    # 공을 가진 팀: 실패한 수비 행동은 직전 이벤트의 점유 팀 (구간 첫 이벤트는 자기 팀)
+    control = team[_forward_fill_index(~contested | group_start)]
+
+    start = group_start.copy()
+    start[1:] |= (control[1:] != control[:-1]) | is_shot[:-1] | is_out[:-1]
+    sequence = np.cumsum(start) - 1
+    first = np.flatnonzero(start)
+    last = np.append(first[1:] - 1, n - 1)
+
+    # 경기 내 점유 번호 (경기 첫 점유가 1)
+    game = df['game_id'].to_numpy()[order]
+    game_start = np.ones(n, dtype=bool)
+    game_start[1:] = game[1:] != game[:-1]
+    possession_id = sequence - sequence[_forward_fill_index(game_start)] + 1
+
+    outcome = np.select(
+        [is_shot[last], is_out[last], ~group_end[last]],
+        [OUTCOMES.index('shot'), OUTCOMES.index('out'), OUTCOMES.index('turnover')],
+        OUTCOMES.index('end'),
+    )
+
+    labels = {
+        'possession_id': possession_id.astype(np.int32),
+        'possession_start': action[first][sequence],
+        'possession_end': action[last][sequence],
+        'possession_team_id': control[first][sequence],
+        'possession_outcome': outcome[sequence],
+    }
+    inverse = np.empty(n, dtype=np.intp)
+    inverse[order] = np.arange(n)
+    result = pd.DataFrame({col: values[inverse] for col, values in labels.items()}, index=df.index)
+    result['possession_outcome'] = pd.Categorical.from_codes(
+        result['possession_outcome'].to_numpy(), categories=OUTCOMES)
+    return result
+
+
+def add_possession_columns(df):
+    """이벤트 DataFrame에 점유 라벨 컬럼 추가 (필요한 컬럼이 없으면 그대로 반환)"""
+    if any(col not in df.columns for col in REQUIRED_COLUMNS):
+        return df
+    labels = label_possessions(df)
+    for col in POSSESSION_COLUMNS:
+        df[col] = labels[col]
+    return df
+
+
+def possession_table(df):
+    """
+    점유 단위 테이블 (점유마다 한 행, 이벤트 스토어의 점유 라벨 컬럼 사용)
+
+    반환: DataFrame (game_id, possession_id, possession_team_id, possession_start, possession_end,
+          possession_outcome, events - 점유 이벤트 수), 경기/점유 번호 순
+    """
+    keys = ['game_id', 'possession_id']
+    first = df['action_id'].to_numpy() == df['possession_start'].to_numpy()
+    table = df.loc[first, keys + POSSESSION_COLUMNS[1:]].sort_values(keys)
+    events = df.groupby(keys, sort=True).size()
+    table['events'] = events.reindex(pd.MultiIndex.from_frame(table[keys])).to_numpy()
+    return table.reset_index(drop=True)
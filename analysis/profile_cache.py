@@ -0,0 +1,93 @@
+"""
+선수 프로파일 디스크 캐시 (프로파일 종류별 컬럼형 파일 1개)
+
+목적: 롤 정의(define_roles_from_data), 랭킹(jeonbuk_team_analysis), 웹 데이터 생성(generate_all_teams_data)
+      단계가 스크립트를 실행할 때마다 같은 프로파일을 다시 계산하는 대신,
+      한 번 계산한 player_id 인덱스 프로파일 테이블을 저장해 두고 다음 실행부터 바로 로딩
+
+캐시 키: 이벤트 스토어 내용 해시 (raw_data.csv + match_info.csv SHA-1) + 지표 정의 버전
+         (지표 정의를 바꾸면 metric_registry.METRICS_VERSION을 증가시켜 캐시 무효화)
+형식: event_store 캐시와 동일 (pyarrow가 있으면 Parquet, 없으면 pickle, dtype 보존)
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from event_store import CACHE_DIR, cache_format, data_hash, filter_label
+from instrumentation import timed
+
+PROFILE_CACHE_DIR = CACHE_DIR / 'profiles'
+
+
+def _cache_path(name, cache_dir=PROFILE_CACHE_DIR):
+    return Path(cache_dir) / f'{name}.{cache_format()}'
+
+
+def _meta_path(cache_path):
+    return cache_path.with_suffix('.meta.json')
+
+
+def load_profiles(name, version, data_key, cache_dir=PROFILE_CACHE_DIR):
+    """
+    캐시된 프로파일 테이블 로딩
+
+    반환: player_id 인덱스 DataFrame (캐시가 없거나 키가 다르면 None)
+    """
+    cache_path = _cache_path(name, cache_dir)
+    meta_path = _meta_path(cache_path)
+    if not cache_path.exists() or not meta_path.exists():
+        return None
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('data_hash') != data_key or meta.get('version') != version:
+        return None
+
+    if cache_path.suffix == '.parquet':
+        return pd.read_parquet(cache_path)
+    return pd.read_pickle(cache_path)
+
+
+def save_profiles(name, version, data_key, profiles, cache_dir=PROFILE_CACHE_DIR):
+    """프로파일 테이블을 캐시로 저장"""
+    cache_path = _cache_path(name, cache_dir)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if cache_path.suffix == '.parquet':
+        profiles.to_parquet(cache_path)
+    else:
+        profiles.to_pickle(cache_path)
+
+    with open(_meta_path(cache_path), 'w', encoding='utf-8') as f:
+        json.dump({'data_hash': data_key, 'version': version, 'players': len(profiles)}, f, indent=2)
+
+
+@timed('profile_cache')
+def cached_profiles(name, version, compute, use_cache=True, filters=None):
+    """
+    프로파일 테이블 조회 (캐시가 유효하면 로딩, 아니면 compute()로 계산하여 저장)
+
+    name: 프로파일 종류 (캐시 파일 이름)
+    version: 지표 정의 버전
+    compute: 인자 없이 호출하는 계산 함수 (player_id 인덱스 DataFrame 반환)
+    filters: load_data 시즌/대회/팀 조건 (조건별로 다른 캐시 파일, 예: ranking_season-2024_competition-1)
+    """
+    if not use_cache:
+        return compute()
+
+    label = filter_label(**(filters or {}))
+    if label:
+        name = f'{name}_{label}'
+
+    data_key = data_hash()
+    profiles = load_profiles(name, version, data_key)
+    if profiles is not None:
+        print(f"  프로파일 캐시 사용: {name} ({len(profiles)}명)")
+        return profiles
+
+    profiles = compute()
+    save_profiles(name, version, data_key, profiles)
+    print(f"  프로파일 캐시 저장: {name} ({len(profiles)}명)")
+    return profiles
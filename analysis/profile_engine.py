@@ -0,0 +1,96 @@
+"""
+선수 행동 프로파일 일괄 계산 엔진
+
+목적: 선수마다 df[df['player_id'] == player_id]로 이벤트 로그 전체를 다시 필터링하는 대신,
+      이벤트 로그를 한 번만 훑어(bincount 집계) 모든 선수의 프로파일을 동시에 계산
+
+지표 정의: metric_registry의 'ranking' 프로파일 (jeonbuk_team_analysis.py의 calculate_player_profile과 동일)
+반환 형태: player_id를 인덱스로 하는 DataFrame (리그 전체 랭킹을 한 번의 스캔으로 계산 가능)
+"""
+
+import numpy as np
+
+from game_results import calculate_league_war
+from instrumentation import timed
+from metric_registry import METRICS_VERSION, PROFILE_METRICS, calculate_profile_set
+
+# 지표 정의가 바뀌면 metric_registry.METRICS_VERSION을 증가시켜 프로파일 캐시(profile_cache)를 무효화
+PROFILE_VERSION = METRICS_VERSION
+
+# 표본 크기 지표 (정수)
+COUNT_COLUMNS = ['game_count', 'event_count', 'war_games_with', 'war_games_without']
+
+# 전체 프로파일 컬럼 (23개 지표 + 표본 크기 + 팀 승률/WAR)
+PROFILE_COLUMNS = PROFILE_METRICS + ['game_count', 'event_count', 'team_win_rate', 'war',
+                                     'war_games_with', 'war_games_without']
+
+# 기존 선수별 프로파일 계산은 WAR를 프로파일에 넣지 않았음 (WAR 보너스 항상 0)
+# 랭킹 점수/순위를 유지하기 위해 랭킹에서는 WAR 컬럼을 0으로 둠 (WAR 보너스 적용은 순위 변화를 확인한 뒤 별도로 변경)
+WAR_COLUMNS = ['war', 'war_games_with', 'war_games_without']
+
+
+@timed('profile')
+def calculate_all_player_profiles(df, match_info_df=None):
+    """
+    모든 선수의 행동 프로파일을 한 번의 이벤트 로그 스캔으로 계산
+
+    df: 이벤트 로그 (raw_data.csv)
+    match_info_df: 경기 정보 (None이면 팀 승률 0.5, WAR 0.0)
+
+    반환: player_id를 인덱스로 하는 DataFrame (컬럼: PROFILE_COLUMNS)
+    """
+    events = df[df['player_id'].notna()]
+    profiles = calculate_profile_set(events, 'ranking')
+    return add_war_columns(profiles, events, match_info_df)
+
+
+def add_war_columns(profiles, events, match_info_df=None):
+    """
+    랭킹 프로파일에 팀 승률 / WAR 컬럼 추가 (선수의 첫 이벤트 팀 기준, 팀 × 경기 결과 행렬로 일괄 계산)
+
+    events: WAR 계산용 이벤트 (player_id, game_id, team_id 컬럼만 사용 -
+            선수-경기-팀 출전 목록(처음 나온 순서)이어도 같은 결과)
+    반환: 컬럼이 PROFILE_COLUMNS인 DataFrame
+    """
+    n = len(profiles)
+    team_win_rate = np.full(n, 0.5)
+    war = np.zeros(n)
+    war_games_with = np.zeros(n, dtype=int)
+    war_games_without = np.zeros(n, dtype=int)
+
+    if match_info_df is not None:
+        war_table = calculate_league_war(events, match_info_df).reindex(profiles.index)
+        team_win_rate = war_table['team_win_rate'].to_numpy()
+        war = war_table['war'].to_numpy()
+        war_games_with = war_table['war_games_with'].to_numpy()
+        war_games_without = war_table['war_games_without'].to_numpy()
+
+    profiles['team_win_rate'] = team_win_rate
+    profiles['war'] = war
+    profiles['war_games_with'] = war_games_with
+    profiles['war_games_without'] = war_games_without
+
+    return profiles[PROFILE_COLUMNS]
+
+
+def without_war(profiles):
+    """랭킹용 프로파일 테이블 (WAR 컬럼 0 - WAR 보너스 없이 기존 랭킹 점수와 동일)"""
+    profiles = profiles.copy()
+    profiles[WAR_COLUMNS] = 0
+    return profiles
+
+
+def get_player_profile(profiles, player_id):
+    """
+    프로파일 테이블에서 한 선수의 프로파일을 딕셔너리로 반환
+
+    calculate_player_profile의 반환 형태와 동일 (표본 크기 지표는 int)
+    """
+    if player_id not in profiles.index:
+        return None
+
+    row = profiles.loc[player_id]
+    profile = {col: float(row[col]) for col in PROFILE_COLUMNS}
+    for col in COUNT_COLUMNS:
+        profile[col] = int(profile[col])
+    return profile
@@ -7,7 +7,6 @@
 3. 특정 선수가 해당 롤의 상위 선수들과 비교한 레이더 차트 생성
 """
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
 from scipy.spatial.distance import cosine
@@ -15,90 +14,23 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from math import pi
 
+from event_store import load_data
+from event_index import EventIndex, event_frame
+from metric_registry import calculate_profile_set, player_profile, profile_row
+from similarity_index import SimilarityIndex
+
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'  # macOS
 plt.rcParams['axes.unicode_minus'] = False
 
 PROJECT_ROOT = Path(__file__).parent.parent
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+# 선수 간 유사도 비교에서 제외하는 표본 크기 컬럼
+SAMPLE_SIZE_COLUMNS = ['event_frequency', 'game_count']
 
 def calculate_player_profile(df, player_id):
-    """선수별 행동 프로파일 계산"""
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    if len(player_data) < 50:  # 최소 이벤트 수 체크
-        return None
-    
-    profile = {}
-    
-    # 패스 관련 지표
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        forward_passes = passes[passes['dx'] > 0]
-        profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        profile['long_pass_ratio'] = long_passes / len(passes)
-        
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        profile['average_pass_length'] = pass_lengths.mean()
-        
-        # 전진 패스 성공률
-        forward_successful = forward_passes[forward_passes['result_name'] == 'Successful']
-        profile['forward_pass_success_rate'] = len(forward_successful) / len(forward_passes) if len(forward_passes) > 0 else 0
-    else:
-        profile['forward_pass_ratio'] = 0
-        profile['long_pass_ratio'] = 0
-        profile['pass_success_rate'] = 0
-        profile['average_pass_length'] = 0
-        profile['forward_pass_success_rate'] = 0
-    
-    # 캐리 관련 지표
-    carries = player_data[player_data['type_name'] == 'Carry']
-    if len(carries) > 0:
-        carry_lengths = np.sqrt(carries['dx']**2 + carries['dy']**2)
-        profile['average_carry_length'] = carry_lengths.mean()
-        profile['carry_frequency'] = len(carries) / len(player_data)
-    else:
-        profile['average_carry_length'] = 0
-        profile['carry_frequency'] = 0
-    
-    # 공간 활용 지표
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & 
-                                     (player_data['start_x'] <= 70)).sum() / len(player_data)
-    profile['touch_zone_wide'] = ((player_data['start_x'] < 30) | 
-                                  (player_data['start_x'] > 70)).sum() / len(player_data)
-    profile['touch_zone_forward'] = (player_data['start_y'] > 50).sum() / len(player_data)
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    
-    # 수비/압박 지표
-    interventions = player_data[player_data['type_name'] == 'Intervention']
-    blocks = player_data[player_data['type_name'] == 'Block']
-    profile['defensive_action_frequency'] = (len(interventions) + len(blocks)) / len(player_data)
-    
-    # 공격 관련 지표
-    shots = player_data[player_data['type_name'] == 'Shot']
-    profile['shot_frequency'] = len(shots) / len(player_data)
-    
-    # 빌드업 참여도
-    profile['pass_frequency'] = len(passes) / len(player_data)
-    profile['event_frequency'] = len(player_data)
-    
-    # 경기당 평균 지표 (정규화)
-    games = player_data['game_id'].nunique()
-    profile['passes_per_game'] = len(passes) / games if games > 0 else 0
-    profile['events_per_game'] = len(player_data) / games if games > 0 else 0
-    
-    return profile
+    """선수별 행동 프로파일 계산 (metric_registry의 'role_comparison' 프로파일)"""
+    return player_profile(df, player_id, 'role_comparison', min_events=50)
 
 def define_role_template(role_name):
     """롤 템플릿 정의"""
@@ -148,6 +80,8 @@ def calculate_performance_score(player_profile, role_name):
     """
     행동 프로파일 기반 성과 지표 계산
     
+    player_profile: 프로파일 딕셔너리 또는 프로파일 DataFrame (DataFrame이면 선수별 점수 Series)
+    
     딥라잉 플레이메이커의 경우:
     - 패스 성공률 (높을수록 좋음)
     - 롱패스 비율 (높을수록 좋음)
@@ -164,17 +98,38 @@ def calculate_performance_score(player_profile, role_name):
             player_profile.get('pass_success_rate', 0) * 0.3 +
             player_profile.get('long_pass_ratio', 0) * 0.2 +
             player_profile.get('forward_pass_success_rate', 0) * 0.2 +
-            min(player_profile.get('passes_per_game', 0) / 50, 1.0) * 0.15 +  # 정규화 (50개 이상이면 1.0)
+            np.minimum(player_profile.get('passes_per_game', 0) / 50, 1.0) * 0.15 +  # 정규화 (50개 이상이면 1.0)
             player_profile.get('pass_frequency', 0) * 0.15
         )
         return performance_score
     
     return None
 
-def find_players_by_role(df, role_name, min_events=100):
+def build_similarity_index(df, min_events=100):
+    """
+    롤 비교 프로파일 유사도 인덱스 (모든 선수 프로파일을 한 번의 스캔으로 계산)
+    
+    필터: 포지션(첫 이벤트의 main_position), 최소 경기 수
+    """
+    profiles = calculate_profile_set(df, 'role_comparison', min_events=max(min_events, 50), sort=False)
+    players = _player_info(df).reindex(profiles.index)
+    metrics = [col for col in profiles.columns if col not in SAMPLE_SIZE_COLUMNS]
+    return SimilarityIndex(profiles, metrics, positions=players['main_position'], games=profiles['game_count'])
+
+def _player_info(df):
+    """선수별 첫 이벤트의 이름/포지션/팀 (player_id 인덱스)"""
+    events = event_frame(df)
+    first = events[events['player_id'].notna()].drop_duplicates('player_id')
+    return first.set_index('player_id')[['player_name_ko', 'main_position', 'team_name_ko']]
+
+def find_players_by_role(df, role_name, min_events=100, position=None, min_games=0, top_k=None, index=None):
     """
     특정 롤에 속한 선수들 찾기
     
+    position / min_games: 포지션(문자열 또는 목록) / 최소 경기 수 필터
+    top_k: 종합 점수 상위 k명만 반환 (None이면 전체)
+    index: build_similarity_index 결과 (여러 롤을 검색할 때 미리 한 번 생성)
+    
     반환: [(player_id, player_name, position, team, fit_score, performance_score), ...]
     """
     print(f"\n{'='*80}")
@@ -186,48 +141,40 @@ def find_players_by_role(df, role_name, min_events=100):
         print(f"❌ 롤 템플릿이 정의되지 않았습니다: {role_name}")
         return []
     
-    player_ids = df['player_id'].dropna().unique()
-    results = []
+    players = _player_info(df)
+    print(f"총 {len(players)}명의 선수 중 검색 중...")
     
-    print(f"총 {len(player_ids)}명의 선수 중 검색 중...")
+    if index is None:
+        index = build_similarity_index(df, min_events)
+    profiles = index.profiles
     
-    for player_id in player_ids:
-        player_data = df[df['player_id'] == player_id]
-        
-        if len(player_data) < min_events:
-            continue
-        
-        profile = calculate_player_profile(df, player_id)
-        if profile is None:
-            continue
-        
-        fit_score = calculate_role_fit_score(profile, role_template)
-        if fit_score is None:
-            continue
-        
-        performance_score = calculate_performance_score(profile, role_name)
-        if performance_score is None:
-            continue
-        
-        player_name = player_data['player_name_ko'].iloc[0]
-        position = player_data['main_position'].iloc[0]
-        team = player_data['team_name_ko'].iloc[0]
-        
-        results.append({
-            'player_id': player_id,
-            'player_name': player_name,
-            'position': position,
-            'team': team,
-            'fit_score': fit_score,
-            'performance_score': performance_score,
-            'profile': profile
-        })
+    # 모든 선수의 적합도/성과 점수를 한 번에 계산
+    fit_scores = index.template_scores(role_template, position, min_games)
+    performance_scores = calculate_performance_score(profiles, role_name)
+    if performance_scores is None:
+        print("\n✓ 0명의 선수를 찾았습니다.")
+        return []
     
     # 적합도와 성과 점수로 정렬 (가중 평균)
-    for result in results:
-        result['combined_score'] = result['fit_score'] * 0.5 + result['performance_score'] * 0.5
+    combined_scores = fit_scores * 0.5 + performance_scores.to_numpy(dtype=float) * 0.5
+    candidates = np.flatnonzero(~np.isnan(fit_scores))
+    order = candidates[np.argsort(-combined_scores[candidates], kind='stable')]
+    if top_k is not None:
+        order = order[:top_k]
     
-    results.sort(key=lambda x: x['combined_score'], reverse=True)
+    results = []
+    for i in order:
+        player_id = profiles.index[i]
+        results.append({
+            'player_id': player_id,
+            'player_name': players.at[player_id, 'player_name_ko'],
+            'position': players.at[player_id, 'main_position'],
+            'team': players.at[player_id, 'team_name_ko'],
+            'fit_score': float(fit_scores[i]),
+            'performance_score': float(performance_scores.iloc[i]),
+            'profile': profile_row(profiles, player_id),
+            'combined_score': float(combined_scores[i])
+        })
     
     print(f"\n✓ {len(results)}명의 선수를 찾았습니다.")
     
@@ -306,7 +253,8 @@ def compare_player_with_top_players(df, target_player_id, role_name, top_n=5):
     print(f"{'='*80}")
     
     # 1. 해당 롤에 속한 모든 선수 찾기
-    all_players = find_players_by_role(df, role_name)
+    index = build_similarity_index(df)
+    all_players = find_players_by_role(df, role_name, index=index)
     
     if len(all_players) == 0:
         print("❌ 해당 롤에 속한 선수를 찾을 수 없습니다.")
@@ -337,7 +285,15 @@ def compare_player_with_top_players(df, target_player_id, role_name, top_n=5):
     for i, player in enumerate(top_players, 1):
         print(f"  {i}. {player['player_name']} ({player['position']}, {player['team']})")
         print(f"     적합도: {player['fit_score']:.3f}, 성과: {player['performance_score']:.3f}, 종합: {player['combined_score']:.3f}")
-    
+
+    # 리그 전체에서 행동 프로파일이 가장 비슷한 선수 (롤과 무관, 표준화 지표 거리)
+    comparables = index.nearest_players(target_player_id, k=top_n)
+    players = _player_info(df)
+    print(f"\n리그에서 가장 비슷한 {top_n}명 (표준화 지표 거리):")
+    for i, (player_id, distance) in enumerate(comparables.items(), 1):
+        print(f"  {i}. {players.at[player_id, 'player_name_ko']} "
+              f"({players.at[player_id, 'main_position']}, {players.at[player_id, 'team_name_ko']}) - 거리 {distance:.3f}")
+
     # 4. 레이더 차트 생성
     player_profiles = [target_player['profile']] + [p['profile'] for p in top_players]
     player_names = [target_player['player_name']] + [p['player_name'] for p in top_players]
@@ -384,7 +340,7 @@ def main():
     target_player_id = 246402.0  # 박진섭
     role_name = '딥라잉 플레이메이커'
     
-    result = compare_player_with_top_players(df, target_player_id, role_name, top_n=5)
+    result = compare_player_with_top_players(EventIndex(df), target_player_id, role_name, top_n=5)
     
     if result:
         print(f"\n{'='*80}")
@@ -0,0 +1,240 @@
+"""
+데이터 기반 롤 발견 엔진 (포지션별 KMeans 모델 선택)
+
+목적: 포지션마다 프로파일을 다시 계산하고 선수 수로 정한 클러스터 수 하나로만 KMeans를 돌리는 대신,
+      미리 계산한 프로파일 테이블 하나에서 포지션별 행렬을 잘라 여러 k를 평가(실루엣/관성)하고
+      가장 잘 나뉘는 k의 클러스터 평균을 롤 템플릿으로 사용 (포지션별 작업은 프로세스 풀에서 병렬 처리)
+
+- 후보 k: 2 ~ max_roles(포지션 선수 수) (30명 이상 3, 15명 이상 2, 그 외 롤 구분 없음 - 기존 규칙을 상한으로 사용)
+  k_values를 지정하면 해당 후보 (선수 수 - 1 이하만)
+- 선택: 실루엣 점수 최대 (동점이면 작은 k)
+- 롤 구분 없음: 포지션 전체 선수 평균 프로파일 하나 (롤_0)
+- 진단 정보: 후보 k별 관성/실루엣, 선택된 k, 기존 규칙의 롤 수(max_roles), 롤별 선수 수/선수 목록
+  선택된 k가 기존 규칙과 다르면 롤_N 키가 바뀌므로 role_templates_named.json(assign_fm_role_names.py)을 다시 생성해야 함
+"""
+
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from event_index import event_frame
+
+# 롤 정의 대상 포지션 최소 선수 수
+MIN_POSITION_PLAYERS = 10
+
+# 클러스터링 대상 선수의 해당 포지션 최소 이벤트 수
+MIN_POSITION_EVENTS = 100
+
+# 클러스터링에서 제외하는 지표 (경기 수 영향이 큰 볼륨 지표)
+EXCLUDED_FEATURES = ['passes_per_game', 'events_per_game']
+
+RANDOM_STATE = 42
+N_INIT = 10
+
+
+def max_roles(player_count):
+    """포지션 선수 수 → 최대 롤 수 (1이면 롤 구분 없음)"""
+    if player_count >= 30:
+        return 3
+    if player_count >= 15:
+        return 2
+    return 1
+
+
+def position_players(df, min_players=MIN_POSITION_PLAYERS):
+    """
+    포지션별 선수 목록 (이벤트 로그 한 번 집계)
+
+    반환: (포지션별 선수 수 Series - 내림차순, 최소 선수 수 이상만,
+           {포지션: 포지션 이벤트 수 Series (player_id 인덱스, 이벤트 로그에 처음 나온 순서)})
+    """
+    events = event_frame(df)
+    position_counts = events.groupby('main_position', observed=True)['player_id'].nunique().sort_values(ascending=False)
+    position_counts = position_counts[position_counts >= min_players]
+
+    pairs = events[events['player_id'].notna()]
+    event_counts = pairs.groupby(['main_position', 'player_id'], sort=False, observed=True).size()
+    players = {
+        position: event_counts.xs(position, level='main_position')
+        for position in position_counts.index
+    }
+    return position_counts, players
+
+
+def _column_means(matrix):
+    """열별 평균 (열마다 연속 배열로 계산하여 선수별 값 리스트의 np.mean과 같은 결과)"""
+    return np.array([np.mean(np.ascontiguousarray(matrix[:, j])) for j in range(matrix.shape[1])])
+
+
+def evaluate_clusterings(X_scaled, k_values):
+    """
+    후보 k별 KMeans 평가
+
+    반환: [{'k', 'inertia', 'silhouette', 'labels'}] (k <= 선수 수 - 1인 후보만)
+    """
+    n = len(X_scaled)
+    results = []
+    for k in k_values:
+        if k < 2 or k > n - 1:
+            continue
+        kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE, n_init=N_INIT)
+        labels = kmeans.fit_predict(X_scaled)
+        silhouette = silhouette_score(X_scaled, labels) if len(np.unique(labels)) > 1 else np.nan
+        results.append({
+            'k': k,
+            'inertia': float(kmeans.inertia_),
+            'silhouette': float(silhouette),
+            'labels': labels,
+        })
+    return results
+
+
+def select_clustering(results):
+    """실루엣 점수가 가장 높은 후보 (동점이면 작은 k, 모두 NaN이면 첫 후보)"""
+    scored = [r for r in results if not np.isnan(r['silhouette'])]
+    if not scored:
+        return results[0] if results else None
+    return max(scored, key=lambda r: (r['silhouette'], -r['k']))
+
+
+def discover_position_roles(task):
+    """
+    한 포지션의 롤 발견 (프로세스 풀 작업 단위)
+
+    task: {'position', 'player_count', 'player_ids', 'X', 'feature_cols', 'k_values',
+           'all_player_ids', 'all_X', 'all_cols'}  (all_*: 롤 구분 없음일 때 평균을 낼 전체 선수 프로파일)
+
+    반환: (포지션, 롤 템플릿 {롤 이름: 템플릿}, 진단 정보)  - 클러스터링할 선수가 부족하면 템플릿 None
+    """
+    position = task['position']
+    diagnostics = {
+        'player_count': int(task['player_count']),
+        'clustered_players': len(task['player_ids']),
+        'candidates': [],
+        'selected_k': None,
+        'max_roles': max_roles(task['player_count']),
+    }
+
+    if not task['k_values']:
+        # 롤 구분 없음: 포지션 전체 선수 평균 프로파일
+        if len(task['all_player_ids']) == 0:
+            return position, None, diagnostics
+        template = dict(zip(task['all_cols'], _column_means(task['all_X']).tolist()))
+        diagnostics['selected_k'] = 1
+        diagnostics['roles'] = {'롤_0': {'player_count': len(task['all_player_ids']),
+                                         'player_ids': list(task['all_player_ids'])}}
+        return position, {'롤_0': template}, diagnostics
+
+    X = task['X']
+    if len(X) < min(task['k_values']):
+        return position, None, diagnostics
+
+    X_scaled = StandardScaler().fit_transform(X)
+    results = evaluate_clusterings(X_scaled, task['k_values'])
+    diagnostics['candidates'] = [
+        {'k': r['k'], 'inertia': r['inertia'], 'silhouette': r['silhouette']} for r in results
+    ]
+    selected = select_clustering(results)
+    if selected is None:
+        return position, None, diagnostics
+
+    diagnostics['selected_k'] = selected['k']
+    diagnostics['silhouette'] = selected['silhouette']
+    diagnostics['inertia'] = selected['inertia']
+
+    templates = {}
+    diagnostics['roles'] = {}
+    for cluster_id in range(selected['k']):
+        indices = np.flatnonzero(selected['labels'] == cluster_id)
+        role_name = f'롤_{cluster_id}'
+        templates[role_name] = dict(zip(task['feature_cols'], _column_means(X[indices]).tolist()))
+        diagnostics['roles'][role_name] = {
+            'player_count': len(indices),
+            'player_ids': [task['player_ids'][i] for i in indices],
+        }
+    return position, templates, diagnostics
+
+
+def build_position_tasks(df, profiles, k_values=None, min_events=MIN_POSITION_EVENTS,
+                         min_players=MIN_POSITION_PLAYERS):
+    """
+    포지션별 롤 발견 작업 (프로파일 테이블에서 포지션 행렬만 잘라냄)
+
+    profiles: player_id 인덱스 프로파일 DataFrame (define_roles_from_data.calculate_comprehensive_profiles)
+    k_values: 후보 k 목록 (None이면 2 ~ max_roles(선수 수))
+    """
+    position_counts, players = position_players(df, min_players)
+    feature_cols = [col for col in profiles.columns if col not in EXCLUDED_FEATURES]
+    all_cols = list(profiles.columns)
+
+    tasks = []
+    for position, player_count in position_counts.items():
+        event_counts = players[position]
+        has_profile = event_counts.index.isin(profiles.index)
+        all_ids = event_counts.index[has_profile]
+        clustered = event_counts[has_profile & (event_counts.to_numpy() >= min_events)].index
+
+        limit = max_roles(player_count)
+        if limit == 1:
+            candidates = []
+        elif k_values is None:
+            candidates = list(range(2, limit + 1))
+        else:
+            candidates = sorted(k for k in k_values if k >= 2)
+
+        tasks.append({
+            'position': position,
+            'player_count': player_count,
+            'player_ids': clustered.tolist(),
+            'X': profiles.loc[clustered, feature_cols].to_numpy(dtype=float),
+            'feature_cols': feature_cols,
+            'k_values': candidates,
+            'all_player_ids': all_ids.tolist(),
+            'all_X': profiles.loc[all_ids, all_cols].to_numpy(dtype=float),
+            'all_cols': all_cols,
+        })
+    return tasks
+
+
+def discover_roles(df, profiles, k_values=None, workers=1, min_events=MIN_POSITION_EVENTS):
+    """
+    모든 포지션의 롤 발견
+
+    workers: 포지션 병렬 처리 프로세스 수 (1이면 단일 프로세스, 결과는 동일)
+
+    반환: (롤 템플릿 {포지션: {롤 이름: 템플릿}}, 진단 정보 {포지션: {...}})
+          포지션 순서는 선수 수 내림차순
+    """
+    tasks = build_position_tasks(df, profiles, k_values, min_events)
+    if workers <= 1 or len(tasks) <= 1:
+        results = [discover_position_roles(task) for task in tasks]
+    else:
+        with Pool(min(workers, len(tasks))) as pool:
+            results = pool.map(discover_position_roles, tasks)
+
+    templates = {}
+    diagnostics = {}
+    for position, position_templates, position_diagnostics in results:
+        diagnostics[position] = position_diagnostics
+        if position_templates is not None:
+            templates[position] = position_templates
+    return templates, diagnostics
+
+
+def diagnostics_table(diagnostics):
+    """진단 정보 → 포지션 × 후보 k 표 (position, k, inertia, silhouette, selected)"""
+    rows = []
+    for position, info in diagnostics.items():
+        for candidate in info['candidates']:
+            rows.append({
+                'position': position,
+                'k': candidate['k'],
+                'inertia': candidate['inertia'],
+                'silhouette': candidate['silhouette'],
+                'selected': candidate['k'] == info['selected_k'],
+            })
+    return pd.DataFrame(rows, columns=['position', 'k', 'inertia', 'silhouette', 'selected'])
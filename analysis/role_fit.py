@@ -0,0 +1,180 @@
+"""
+롤 적합도 일괄 계산 (선수 × 롤 템플릿)
+
+목적: 선수-템플릿 쌍마다 딕셔너리에서 23개 지표 벡터를 만들고 scipy cosine/euclidean을 호출하는 대신,
+      선수 지표 행렬(players × metrics)과 템플릿 지표 행렬(templates × metrics)로
+      모든 쌍의 점수를 한 번의 NumPy 연산으로 계산
+
+점수 정의: jeonbuk_team_analysis.py의 calculate_role_fit_score와 동일
+1. 코사인 유사도 (방향 유사성) - 60%
+2. 유클리드 거리 기반 점수 (크기 차이, 지표별 최대값으로 정규화) - 40%
+3. 표본 크기 보정 (베이지안 평균) + 경기 수 / WAR / 팀 승률 보너스
+"""
+
+import numpy as np
+
+from instrumentation import timed
+from profile_engine import PROFILE_METRICS
+
+# 표본 크기 보정 기준
+MIN_GAMES = 5
+MIN_EVENTS = 200
+PRIOR_SCORE = 50.0
+
+# 점수 텐서 키 (players × templates)
+SCORE_KEYS = ['fit_score', 'raw_score', 'confidence', 'cosine_score', 'euclidean_score',
+              'game_bonus', 'war_bonus', 'win_rate_bonus']
+
+
+def profiles_to_matrix(profiles, metrics=PROFILE_METRICS):
+    """
+    프로파일 → 선수 지표 행렬
+
+    profiles: calculate_all_player_profiles 결과 DataFrame 또는 프로파일 딕셔너리 리스트
+    반환: (players × metrics) float 배열 (없는 지표는 0)
+    """
+    if isinstance(profiles, list):
+        return np.array([[p.get(m, 0) for m in metrics] for p in profiles], dtype=float).reshape(-1, len(metrics))
+    return profiles.reindex(columns=metrics, fill_value=0).to_numpy(dtype=float)
+
+
+def templates_to_matrix(role_templates, position, metrics=PROFILE_METRICS):
+    """
+    포지션의 롤 템플릿 → 템플릿 지표 행렬
+
+    반환: (role_names, (templates × metrics) float 배열)
+    """
+    role_names = list(role_templates.get(position, {}).keys())
+    matrix = np.array([
+        [role_templates[position][role].get('template', {}).get(m, 0) for m in metrics]
+        for role in role_names
+    ], dtype=float).reshape(-1, len(metrics))
+    return role_names, matrix
+
+
+def _game_bonus(game_count):
+    """경기 수 보너스 (한 시즌 꾸준히 뛴 선수에게 가치 부여)"""
+    return np.select(
+        [game_count >= 30, game_count >= 25, game_count >= 20, game_count >= 15],
+        [3.0, 2.0, 1.0, 0.5], default=0.0
+    )
+
+
+def _war_bonus(war):
+    """WAR 기반 보너스 (최대 ±3.0점)"""
+    return np.select(
+        [war >= 0.3, war >= 0.2, war >= 0.1, war >= 0.05,
+         war <= -0.3, war <= -0.2, war <= -0.1, war <= -0.05],
+        [3.0, 2.0, 1.0, 0.5, -3.0, -2.0, -1.0, -0.5], default=0.0
+    )
+
+
+def _win_rate_bonus(team_win_rate):
+    """팀 승률 보너스 (보조 지표, 낮은 가중치)"""
+    return np.select(
+        [team_win_rate >= 0.6, team_win_rate >= 0.5, team_win_rate < 0.3, team_win_rate < 0.4],
+        [0.5, 0.25, -0.5, -0.25], default=0.0
+    )
+
+
+@timed('score')
+def calculate_role_fit_matrix(player_matrix, template_matrix, game_count=None, event_count=None,
+                              war=None, team_win_rate=None, apply_sample_size_correction=True):
+    """
+    모든 선수 × 템플릿 쌍의 롤 적합도 점수 계산
+
+    player_matrix: (players × metrics), template_matrix: (templates × metrics)
+    game_count, event_count, war, team_win_rate: 선수별 배열 (players,)
+
+    반환: SCORE_KEYS를 키로 하는 (players × templates) 배열 딕셔너리
+    """
+    players = np.asarray(player_matrix, dtype=float)
+    templates = np.asarray(template_matrix, dtype=float)
+    n_players, n_metrics = players.shape
+    n_templates = len(templates)
+
+    # 1. 코사인 유사도 (방향 유사성)
+    player_norm = players / (np.linalg.norm(players, axis=1, keepdims=True) + 1e-10)
+    template_norm = templates / (np.linalg.norm(templates, axis=1, keepdims=True) + 1e-10)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cosine_sim = (player_norm @ template_norm.T) / np.outer(
+            np.linalg.norm(player_norm, axis=1), np.linalg.norm(template_norm, axis=1)
+        )
+
+    # 2. 유클리드 거리 기반 점수 (쌍별 지표 최대값으로 0~1 정규화)
+    p = players[:, None, :]
+    t = templates[None, :, :]
+    max_values = np.maximum(np.maximum(np.abs(p), np.abs(t)), 1.0)
+    euclidean_dist = np.sqrt((((p - t) / max_values) ** 2).sum(axis=2))
+    euclidean_score = np.clip(1 - euclidean_dist / np.sqrt(n_metrics), 0, 1)
+
+    # 3. 가중 평균 (코사인 60%, 유클리드 40%)
+    raw_score = (0.6 * cosine_sim + 0.4 * euclidean_score) * 100
+
+    shape = (n_players, n_templates)
+    if not apply_sample_size_correction:
+        zeros = np.zeros(shape)
+        return {
+            'fit_score': raw_score,
+            'raw_score': raw_score,
+            'confidence': np.ones(shape),
+            'cosine_score': cosine_sim * 100,
+            'euclidean_score': euclidean_score * 100,
+            'game_bonus': zeros,
+            'war_bonus': zeros.copy(),
+            'win_rate_bonus': zeros.copy(),
+        }
+
+    def per_player(values, default):
+        if values is None:
+            return np.full(n_players, default, dtype=float)
+        return np.asarray(values, dtype=float)
+
+    game_count = per_player(game_count, 0)
+    event_count = per_player(event_count, 0)
+    war = per_player(war, 0.0)
+    team_win_rate = per_player(team_win_rate, 0.5)
+
+    # 신뢰도 (경기 수와 이벤트 수 신뢰도의 기하평균) 및 베이지안 평균
+    game_confidence = np.clip(game_count / MIN_GAMES, 0, 1)
+    event_confidence = np.clip(event_count / MIN_EVENTS, 0, 1)
+    confidence = np.sqrt(game_confidence * event_confidence)[:, None]
+    adjusted_score = confidence * raw_score + (1 - confidence) * PRIOR_SCORE
+
+    game_bonus = _game_bonus(game_count)[:, None]
+    war_bonus = _war_bonus(war)[:, None]
+    win_rate_bonus = _win_rate_bonus(team_win_rate)[:, None]
+
+    return {
+        'fit_score': adjusted_score + game_bonus + war_bonus + win_rate_bonus,
+        'raw_score': raw_score,
+        'confidence': np.broadcast_to(confidence, shape).copy(),
+        'cosine_score': cosine_sim * 100,
+        'euclidean_score': euclidean_score * 100,
+        'game_bonus': np.broadcast_to(game_bonus, shape).copy(),
+        'war_bonus': np.broadcast_to(war_bonus, shape).copy(),
+        'win_rate_bonus': np.broadcast_to(win_rate_bonus, shape).copy(),
+    }
+
+
+def score_profiles(profiles, template_matrix, apply_sample_size_correction=True):
+    """
+    프로파일 테이블(또는 딕셔너리 리스트)과 템플릿 행렬로 점수 텐서 계산
+    """
+    if isinstance(profiles, list):
+        def column(name, default):
+            return np.array([p.get(name, default) for p in profiles], dtype=float)
+    else:
+        def column(name, default):
+            if name not in profiles.columns:
+                return np.full(len(profiles), default, dtype=float)
+            return profiles[name].to_numpy(dtype=float)
+
+    return calculate_role_fit_matrix(
+        profiles_to_matrix(profiles), template_matrix,
+        game_count=column('game_count', 0),
+        event_count=column('event_count', 0),
+        war=column('war', 0.0),
+        team_win_rate=column('team_win_rate', 0.5),
+        apply_sample_size_correction=apply_sample_size_correction,
+    )
@@ -0,0 +1,446 @@
+"""
+시즌 누적 상태 (선수별 가산 충분 통계) 및 경기일 단위 증분 반영
+
+목적: 주말마다 새 경기가 들어올 때 시즌 전체 raw_data.csv로 프로파일/WAR/랭킹을 다시 계산하는 대신,
+      선수별로 더할 수 있는 통계(이벤트 수, 패스 길이 합, 구역별 터치 수, 출전/미출전 경기 집계)만 보관하고
+      새 game_id 묶음의 통계를 더한 뒤 영향받은 선수의 프로파일/WAR/랭킹 위치만 갱신하여 teams_data.json을 다시 생성
+
+- 랭킹용/웹 데이터용 프로파일: metric_registry의 'ranking' / 'teams_data' 프로파일
+  (metric_stats 가산 통계를 경기 묶음마다 더한 뒤 finalize_profile_set으로 변환)
+- 영향받은 선수: 새 경기에 이벤트를 남긴 선수 + 새 경기를 치른 팀의 선수 (미출전 경기 집계가 바뀜)
+
+제약:
+- 이미 반영된 game_id는 다시 반영할 수 없음 (ValueError)
+- 선수의 팀(WAR 기준)은 처음 반영된 이벤트의 팀 (경기 순서대로 반영하면 전체 계산과 동일)
+
+사용 예:
+    python season_state.py --rebuild                                   # 시즌 전체로 상태 생성
+    python season_state.py --events new.csv --match-info new_match.csv # 새 경기 반영
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from event_store import CACHE_DIR, load_data, load_event_batch
+from generate_all_teams_data import build_player_entry, load_role_templates, save_teams_data
+from metric_registry import finalize_profile_set, metric_stats, profile_set_metrics
+from profile_engine import PROFILE_COLUMNS, get_player_profile, without_war
+from role_fit import SCORE_KEYS, score_profiles, templates_to_matrix
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STATE_PATH = CACHE_DIR / 'season_state.pkl'
+
+# 통계 항목/상태 구조가 바뀌면 증가시켜 기존 상태를 무효화
+STATE_VERSION = 3
+
+# 가산 통계로 보관하는 프로파일 (metric_registry.PROFILE_SETS)
+RANKING_PROFILE = 'ranking'
+EXPORT_PROFILE = 'teams_data'
+STAT_METRICS = list(dict.fromkeys(profile_set_metrics(RANKING_PROFILE) + profile_set_metrics(EXPORT_PROFILE)))
+
+# 랭킹 최소 기준 (create_rankings_for_all_roles 기본값)
+MIN_GAMES = 5
+MIN_EVENTS = 200
+
+# teams_data.json 팀 선수 최소 이벤트 수
+MIN_TEAM_EVENTS = 200
+
+PLAYER_GROUP_KEYS = ['player_id', 'player_name_ko', 'main_position']
+
+
+def _add(total, batch):
+    """가산 통계 테이블 합산 (인덱스 합집합, 정렬)"""
+    if total is None or len(total) == 0:
+        return batch.sort_index()
+    if len(batch) == 0:
+        return total
+    return total.add(batch, fill_value=0).sort_index()
+
+
+def _batch_results(match_info_df):
+    """새 경기의 팀 관점 결과 (경기별 홈/원정)"""
+    matches = match_info_df.drop_duplicates('game_id')
+    home_score = matches['home_score'].to_numpy()
+    away_score = matches['away_score'].to_numpy()
+    return pd.DataFrame({
+        'home_team_id': matches['home_team_id'].to_numpy(),
+        'away_team_id': matches['away_team_id'].to_numpy(),
+        'home_win': home_score > away_score,
+        'away_win': away_score > home_score,
+    }, index=pd.Index(matches['game_id'].to_numpy(), name='game_id'))
+
+
+def empty_state():
+    """빈 시즌 상태"""
+    return {
+        'version': STATE_VERSION,
+        'game_ids': np.array([], dtype=np.int64),
+        'player_stats': None,        # player_id → 가산 통계 + 출전/미출전 경기 집계
+        'player_teams': pd.Series(dtype=np.int64, name='team_id'),  # player_id → 첫 이벤트 팀
+        'team_results': None,        # team_id → (games, wins)
+        'player_groups': None,       # (player_id, 이름, 포지션) → (event_count, game_count)
+        'team_players': None,        # (team_id, player_id, 이름, 포지션) → 이벤트 수
+        'teams': None,               # (team_id, team_name_ko) → 이벤트 수
+        'player_team_names': None,   # (player_id, team_name_ko) → 이벤트 수
+        # 파생 테이블 (영향받은 선수만 갱신)
+        'profiles': None,
+        'export_profiles': None,
+        'player_entries': {},
+        'role_scores': None,
+        'role_templates': None,
+    }
+
+
+def ingest_games(state, df, match_info_df):
+    """
+    새 경기 묶음의 통계를 상태에 더하기
+
+    df: 새 경기의 이벤트 로그 (raw_data.csv 형식)
+    match_info_df: 새 경기의 경기 정보 (이미 반영된 경기의 행은 무시)
+
+    반환: 영향받은 선수 ID 배열 (정렬)
+    """
+    overlap = np.intersect1d(df['game_id'].unique(), state['game_ids'])
+    if len(overlap) > 0:
+        raise ValueError(f"이미 반영된 경기가 포함되어 있습니다: {overlap.tolist()[:10]}")
+    match_info_df = match_info_df[~match_info_df['game_id'].isin(state['game_ids'])]
+    batch_games = np.union1d(df['game_id'].unique(), match_info_df['game_id'].unique())
+
+    events = df[df['player_id'].notna()]
+
+    # 1. 선수 첫 이벤트 팀 (처음 등장한 선수만 추가)
+    first_teams = events.drop_duplicates('player_id').set_index('player_id')['team_id'].astype(np.int64)
+    new_players = first_teams.index.difference(state['player_teams'].index)
+    player_teams = pd.concat([state['player_teams'], first_teams.loc[new_players]]).sort_index()
+    player_teams.name = 'team_id'
+
+    # 2. 선수별 이벤트 통계 (metric_registry 가산 통계)
+    batch_stats = metric_stats(events, STAT_METRICS).astype(float)
+
+    # 3. 출전 경기 집계 (선수 팀 기준 승리/팀 경기 여부)
+    appearances = pd.DataFrame({
+        'player_id': events['player_id'].to_numpy(),
+        'game_id': events['game_id'].to_numpy(),
+    }).drop_duplicates()
+    results = _batch_results(match_info_df)
+    team_ids = player_teams.reindex(appearances['player_id']).to_numpy()
+    info = results.reindex(appearances['game_id'])
+    in_info = info['home_team_id'].notna().to_numpy()
+    is_home = in_info & (info['home_team_id'].to_numpy() == team_ids)
+    is_away = in_info & (info['away_team_id'].to_numpy() == team_ids)
+    # 팀이 홈이 아니면 원정 승리로 판정 (calculate_league_war와 동일)
+    win = in_info & np.where(is_home, info['home_win'].fillna(False).to_numpy(dtype=bool),
+                             info['away_win'].fillna(False).to_numpy(dtype=bool))
+    played = is_home | is_away
+    war_stats = pd.DataFrame({
+        'player_id': appearances['player_id'].to_numpy(),
+        'war_games_with': 1.0,
+        'war_wins_with': win.astype(float),
+        'war_played_with': played.astype(float),
+        'war_played_wins_with': (played & win).astype(float),
+    }).groupby('player_id').sum()
+    batch_stats = batch_stats.join(war_stats)
+
+    # 4. 팀 경기/승리 수
+    team_results = pd.concat([
+        pd.DataFrame({'team_id': results['home_team_id'], 'games': 1.0, 'wins': results['home_win'].astype(float)}),
+        pd.DataFrame({'team_id': results['away_team_id'], 'games': 1.0, 'wins': results['away_win'].astype(float)}),
+    ]).groupby('team_id').sum()
+
+    # 5. 랭킹/팀 데이터용 그룹별 이벤트 수
+    groups = events.groupby(PLAYER_GROUP_KEYS, observed=True)
+    player_groups = pd.DataFrame({
+        'event_count': groups.size().astype(float),
+        'game_count': groups['game_id'].nunique().astype(float),
+    })
+    team_players = df.groupby(['team_id'] + PLAYER_GROUP_KEYS, observed=True).size().astype(float)
+    teams = df.groupby(['team_id', 'team_name_ko'], observed=True).size().astype(float)
+    player_team_names = df.groupby(['player_id', 'team_name_ko'], observed=True).size().astype(float)
+
+    # 영향받은 선수: 새 경기에 이벤트를 남긴 선수 + 새 경기를 치른 팀의 선수
+    played_teams = team_results.index.to_numpy()
+    affected = np.union1d(batch_stats.index.to_numpy(),
+                          player_teams.index[player_teams.isin(played_teams)].to_numpy())
+
+    state['game_ids'] = np.union1d(state['game_ids'], batch_games)
+    state['player_teams'] = player_teams
+    state['player_stats'] = _add(state['player_stats'], batch_stats)
+    state['team_results'] = _add(state['team_results'], team_results)
+    state['player_groups'] = _add(state['player_groups'], player_groups)
+    state['team_players'] = _add(state['team_players'], team_players)
+    state['teams'] = _add(state['teams'], teams)
+    state['player_team_names'] = _add(state['player_team_names'], player_team_names)
+    return affected
+
+
+def _ratio(numerator, denominator, default=0.0):
+    return np.divide(numerator, denominator, out=np.full(len(numerator), default, dtype=float),
+                     where=denominator > 0)
+
+
+def _war_columns(state, stats):
+    """출전/미출전 경기 집계 → 팀 승률, WAR (calculate_league_war와 동일)"""
+    team_ids = state['player_teams'].reindex(stats.index).to_numpy()
+    team_results = state['team_results']
+    known_team = np.isin(team_ids, team_results.index.to_numpy())
+    team_games = team_results['games'].reindex(team_ids).fillna(0).to_numpy()
+    team_wins = team_results['wins'].reindex(team_ids).fillna(0).to_numpy()
+
+    games_with = stats['war_games_with'].to_numpy()
+    wins_with = np.where(known_team, stats['war_wins_with'].to_numpy(), 0)
+    games_without = np.where(known_team, team_games - stats['war_played_with'].to_numpy(), 0)
+    wins_without = np.where(known_team, team_wins - stats['war_played_wins_with'].to_numpy(), 0)
+
+    team_win_rate = _ratio(wins_with, games_with, default=0.5)
+    win_rate_without = _ratio(wins_without, games_without)
+    war = np.where(games_without > 0, team_win_rate - win_rate_without, 0.0)
+    return {
+        'team_win_rate': team_win_rate,
+        'war': war,
+        'war_games_with': games_with.astype(int),
+        'war_games_without': games_without.astype(int),
+    }
+
+
+def _profiles_from_stats(state, player_ids, name):
+    """가산 통계 → 프로파일 구성 테이블 + 팀 승률/WAR"""
+    stats = state['player_stats'].loc[player_ids]
+    profiles = finalize_profile_set(stats, name)
+    for column, values in _war_columns(state, stats).items():
+        profiles[column] = values
+    return profiles[PROFILE_COLUMNS]
+
+
+def profiles_from_stats(state, player_ids):
+    """
+    가산 통계 → 랭킹용 프로파일 (create_rankings_for_all_roles가 점수를 매기는 프로파일과 같은 컬럼/정의)
+
+    랭킹은 WAR 보너스 없이 점수를 매기므로 WAR 컬럼은 0 (실제 WAR는 웹 데이터용 프로파일에만 들어감)
+    """
+    return without_war(_profiles_from_stats(state, player_ids, RANKING_PROFILE))
+
+
+def export_profiles_from_stats(state, player_ids):
+    """
+    가산 통계 → 웹 데이터용 프로파일 (generate_all_teams_data.calculate_player_profile과 같은 정의)
+    """
+    return _profiles_from_stats(state, player_ids, EXPORT_PROFILE)
+
+
+def _replace_rows(table, rows):
+    """파생 테이블에서 rows의 인덱스 행만 교체 (새 선수는 추가)"""
+    if table is None:
+        return rows.sort_index()
+    return pd.concat([table.drop(rows.index, errors='ignore'), rows]).sort_index()
+
+
+def _score_groups(state, groups, role_templates):
+    """랭킹 대상 (선수, 이름, 포지션) 그룹 × 포지션 롤 점수 (long 형식)"""
+    frames = []
+    for position in role_templates.keys():
+        position_groups = groups[groups.get_level_values('main_position') == position]
+        role_names, template_matrix = templates_to_matrix(role_templates, position)
+        if len(position_groups) == 0 or len(role_names) == 0:
+            continue
+        player_ids = position_groups.get_level_values('player_id')
+        scores = score_profiles(state['profiles'].loc[player_ids], template_matrix)
+        for role_idx, role_name in enumerate(role_names):
+            frame = pd.DataFrame({key: scores[key][:, role_idx] for key in SCORE_KEYS}, index=position_groups)
+            frame['role'] = role_name
+            frames.append(frame.reset_index())
+    if len(frames) == 0:
+        return pd.DataFrame(columns=PLAYER_GROUP_KEYS + SCORE_KEYS + ['role'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def refresh_derived(state, affected, role_templates):
+    """
+    영향받은 선수의 프로파일, WAR, 웹 데이터 항목, 롤 점수만 다시 계산
+
+    롤 템플릿이 바뀌었으면 롤 점수/웹 데이터 항목은 전체 다시 계산
+    """
+    if state['role_templates'] != role_templates:
+        affected = state['player_stats'].index.to_numpy()
+        state['player_entries'] = {}
+        state['role_scores'] = None
+        state['role_templates'] = role_templates
+
+    state['profiles'] = _replace_rows(state['profiles'], profiles_from_stats(state, affected))
+    state['export_profiles'] = _replace_rows(state['export_profiles'], export_profiles_from_stats(state, affected))
+
+    # 웹 데이터 항목 ((선수, 포지션) 단위, 롤은 포지션에 따라 달라짐)
+    affected_set = set(affected.tolist())
+    entries = {key: entry for key, entry in state['player_entries'].items() if key[0] not in affected_set}
+    team_players = state['team_players']
+    candidates = team_players[team_players >= MIN_TEAM_EVENTS].index.droplevel('team_id').unique()
+    for player_id, player_name, position in candidates:
+        if player_id not in affected_set or (player_id, position) in entries:
+            continue
+        profile = get_player_profile(state['export_profiles'], player_id)
+        entries[(player_id, position)] = build_player_entry(player_id, player_name, position, profile, role_templates)
+    state['player_entries'] = entries
+
+    # 롤 점수 (랭킹 최소 기준을 만족하는 그룹만)
+    groups = state['player_groups']
+    eligible = groups[(groups['game_count'] >= MIN_GAMES) & (groups['event_count'] >= MIN_EVENTS)].index
+    eligible = eligible[eligible.get_level_values('player_id').isin(state['profiles'].index)]
+    eligible = eligible[eligible.get_level_values('player_id').isin(affected)]
+    new_scores = _score_groups(state, eligible, role_templates)
+    role_scores = state['role_scores']
+    if role_scores is not None:
+        role_scores = role_scores[~role_scores['player_id'].isin(affected)]
+    parts = [scores for scores in [role_scores, new_scores] if scores is not None and len(scores) > 0]
+    state['role_scores'] = pd.concat(parts, ignore_index=True) if parts else new_scores
+
+
+def build_rankings(state, role_templates):
+    """
+    롤 점수 → 포지션_롤별 랭킹 (create_rankings_for_all_roles와 같은 형태/순서)
+    """
+    team_counts = state['player_team_names']
+    main_teams = {}
+    if team_counts is not None and len(team_counts) > 0:
+        main_teams = {player_id: team_name for player_id, team_name in team_counts.groupby(level='player_id').idxmax()}
+
+    role_scores = state['role_scores'].sort_values(PLAYER_GROUP_KEYS, kind='mergesort')
+    rankings = {}
+    for position in role_templates.keys():
+        role_names, _ = templates_to_matrix(role_templates, position)
+        position_scores = role_scores[role_scores['main_position'] == position]
+        for role_name in role_names:
+            role_rows = position_scores[position_scores['role'] == role_name]
+            role_rows = role_rows.sort_values('fit_score', ascending=False, kind='mergesort')
+            role_rankings = []
+            for rank, row in enumerate(role_rows.itertuples(index=False), 1):
+                profile = get_player_profile(state['profiles'], row.player_id)
+                role_rankings.append({
+                    'player_id': row.player_id,
+                    'player_name': row.player_name_ko,
+                    'team_name': main_teams.get(row.player_id, '알 수 없음'),
+                    'position': position,
+                    'fit_score': float(row.fit_score),
+                    'raw_score': float(row.raw_score),
+                    'confidence': float(row.confidence),
+                    'game_bonus': float(row.game_bonus),
+                    'war_bonus': float(row.war_bonus),
+                    'win_rate_bonus': float(row.win_rate_bonus),
+                    'team_win_rate': profile.get('team_win_rate', 0.5),
+                    'war': profile.get('war', 0.0),
+                    'war_games_with': profile.get('war_games_with', 0),
+                    'war_games_without': profile.get('war_games_without', 0),
+                    'game_count': profile.get('game_count', 0),
+                    'event_count': profile.get('event_count', 0),
+                    'rank': rank,
+                })
+            if len(role_rankings) > 0:
+                rankings[f"{position}_{role_name}"] = role_rankings
+    return rankings
+
+
+def build_teams_data(state):
+    """웹 데이터 항목 → teams_data.json 구조 (generate_all_teams_data와 같은 팀/선수 순서)"""
+    teams = state['teams'].reset_index()[['team_id', 'team_name_ko']].sort_values('team_name_ko')
+    team_players = state['team_players']
+
+    teams_data = {}
+    for _, team_row in teams.iterrows():
+        team_id = team_row['team_id']
+        team_name = team_row['team_name_ko']
+        if team_id not in team_players.index.get_level_values('team_id'):
+            continue
+        counts = team_players.xs(team_id, level='team_id')
+        players_list = []
+        for player_id, player_name, position in counts[counts >= MIN_TEAM_EVENTS].index:
+            entry = state['player_entries'].get((player_id, position))
+            if entry is None:
+                continue
+            players_list.append({**entry, 'player_name': player_name})
+        if len(players_list) > 0:
+            teams_data[team_name] = {
+                'team_id': int(team_id),
+                'team_name': team_name,
+                'players': players_list
+            }
+    return teams_data
+
+
+def _rank_positions(rankings, player_ids):
+    """선수별 {포지션_롤: 순위}"""
+    player_ids = set(player_ids)
+    positions = {}
+    for role_key, role_rankings in rankings.items():
+        for info in role_rankings:
+            if info['player_id'] in player_ids:
+                positions[(info['player_id'], role_key)] = info['rank']
+    return positions
+
+
+def save_state(state, path=STATE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.to_pickle(state, path)
+
+
+def load_state(path=STATE_PATH):
+    """저장된 시즌 상태 (없거나 버전이 다르면 None)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    state = pd.read_pickle(path)
+    if state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시즌 누적 상태 생성 및 새 경기 증분 반영')
+    parser.add_argument('--rebuild', action='store_true', help='시즌 전체 데이터로 상태 다시 생성')
+    parser.add_argument('--events', type=Path, help='새 경기 이벤트 CSV (raw_data.csv 형식)')
+    parser.add_argument('--match-info', type=Path, help='새 경기 정보 CSV (match_info.csv 형식)')
+    parser.add_argument('--state', type=Path, default=STATE_PATH, help='상태 파일 경로')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("시즌 누적 상태 증분 갱신")
+    print("="*80)
+
+    role_templates = load_role_templates()
+    state = None if args.rebuild else load_state(args.state)
+
+    if state is None:
+        print("\n시즌 전체 데이터로 상태 생성 중...")
+        df, match_info_df = load_data()
+        state = empty_state()
+        affected = ingest_games(state, df, match_info_df)
+        previous_ranks = {}
+    else:
+        previous_ranks = _rank_positions(build_rankings(state, role_templates), state['player_stats'].index)
+        affected = np.array([])
+
+    if args.events is not None:
+        if args.match_info is None:
+            parser.error('--events에는 --match-info가 필요합니다')
+        df, match_info_df = load_event_batch(args.events, args.match_info)
+        print(f"\n새 경기 반영 중: {df['game_id'].nunique()}경기, {len(df):,}개 이벤트")
+        affected = np.union1d(affected, ingest_games(state, df, match_info_df))
+
+    print(f"  반영된 경기: {len(state['game_ids'])}경기, 영향받은 선수: {len(affected)}명")
+    refresh_derived(state, affected, role_templates)
+    rankings = build_rankings(state, role_templates)
+
+    if previous_ranks:
+        current_ranks = _rank_positions(rankings, affected)
+        changed = sum(1 for key, rank in current_ranks.items() if previous_ranks.get(key) != rank)
+        print(f"  랭킹 순위 변동: {changed}건")
+
+    save_state(state, args.state)
+    print(f"\n✓ 상태 저장 완료: {args.state}")
+
+    save_teams_data(build_teams_data(state))
+
+
+if __name__ == '__main__':
+    main()
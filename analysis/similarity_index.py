@@ -0,0 +1,158 @@
+"""
+선수 프로파일 유사도 검색 인덱스 (템플릿 → 상위 k명, 선수 → 가장 비슷한 k명)
+
+목적: 롤 템플릿/기준 선수와 비교할 때마다 선수 전체를 Python 루프로 돌며 scipy cosine을 호출하는 대신,
+      프로파일 행렬(players × metrics)을 한 번 만들어 두고 행렬-벡터 곱 + argpartition으로
+      필터(포지션, 최소 경기 수)를 적용한 상위 k명을 바로 조회
+
+- 템플릿 유사도: 템플릿에 있는 지표만으로 코사인 유사도 (role_based_comparison.calculate_role_fit_score와 동일 정의)
+  지표 조합별 선수 벡터 노름은 처음 조회할 때 한 번 계산하여 보관
+- 선수 간 유사도: 리그 평균/표준편차로 표준화한 지표 벡터의 유클리드 거리 (지표 단위 차이 제거)
+  리그 전체 비교표(comparables)는 블록 단위 행렬 곱으로 계산 (메모리 = 블록 크기 × 선수 수)
+"""
+
+import numpy as np
+import pandas as pd
+
+# 리그 전체 비교표 계산 블록 크기 (기준 선수 수)
+BLOCK_SIZE = 1024
+
+
+def _top_k(values, k, largest=True):
+    """값 배열에서 상위 k개 위치 (정렬됨, NaN 제외)"""
+    candidates = np.flatnonzero(~np.isnan(values))
+    k = min(k, len(candidates))
+    if k == 0:
+        return candidates[:0]
+    keyed = -values[candidates] if largest else values[candidates]
+    if k < len(candidates):
+        part = np.argpartition(keyed, k - 1)[:k]
+        candidates, keyed = candidates[part], keyed[part]
+    return candidates[np.argsort(keyed, kind='stable')]
+
+
+class SimilarityIndex:
+    """
+    선수 프로파일 유사도 인덱스
+
+    사용 예:
+        index = SimilarityIndex(profiles, positions=positions, games=profiles['game_count'])
+        index.top_for_template(template, k=10, position='CM', min_games=5)  # 템플릿에 가장 가까운 10명
+        index.nearest_players(player_id, k=5)                                # 리그에서 가장 비슷한 5명
+    """
+
+    def __init__(self, profiles, metrics=None, positions=None, games=None):
+        """
+        profiles: player_id 인덱스 프로파일 DataFrame
+        metrics: 인덱스에 넣을 지표 컬럼 (None이면 전체 컬럼)
+        positions / games: 선수별 포지션 / 출전 경기 수 (profiles와 같은 인덱스의 Series, 필터용)
+        """
+        self.profiles = profiles
+        self.keys = profiles.index
+        self.metrics = list(profiles.columns if metrics is None else metrics)
+        self.matrix = profiles[self.metrics].to_numpy(dtype=float)
+        self._columns = {metric: i for i, metric in enumerate(self.metrics)}
+
+        n = len(self.keys)
+        self.positions = None if positions is None else pd.Series(positions).reindex(self.keys).to_numpy()
+        self.games = np.full(n, np.inf) if games is None else \
+            pd.Series(games).reindex(self.keys).to_numpy(dtype=float)
+
+        # 선수 간 비교용 표준화 벡터 (표준편차 0인 지표는 0)
+        std = self.matrix.std(axis=0)
+        self.standardized = np.divide(self.matrix - self.matrix.mean(axis=0), std,
+                                      out=np.zeros_like(self.matrix), where=std > 0)
+        self._squared_norms = (self.standardized ** 2).sum(axis=1)
+        self._subspace_norms = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _mask(self, position=None, min_games=0):
+        """포지션 / 최소 경기 수 필터 (position은 문자열 또는 목록)"""
+        mask = self.games >= min_games
+        if position is not None:
+            if self.positions is None:
+                raise ValueError("포지션 정보 없이 만든 인덱스입니다")
+            positions = [position] if isinstance(position, str) else list(position)
+            mask &= np.isin(self.positions, positions)
+        return mask
+
+    def _result(self, positions, values, name):
+        return pd.Series(values[positions], index=self.keys[positions], name=name)
+
+    def template_scores(self, template, position=None, min_games=0):
+        """
+        모든 선수의 템플릿 코사인 유사도 (템플릿 지표 중 인덱스에 있는 지표만 사용)
+
+        반환: 선수별 유사도 배열 (필터에서 제외되거나 벡터 노름이 0이면 NaN)
+        """
+        metrics = tuple(metric for metric in template if metric in self._columns)
+        n = len(self.keys)
+        if not metrics:
+            return np.full(n, np.nan)
+
+        columns = [self._columns[metric] for metric in metrics]
+        if metrics not in self._subspace_norms:
+            self._subspace_norms[metrics] = np.linalg.norm(self.matrix[:, columns], axis=1)
+        norms = self._subspace_norms[metrics]
+
+        vector = np.array([template[metric] for metric in metrics], dtype=float)
+        denominator = norms * np.linalg.norm(vector)
+        scores = np.divide(self.matrix[:, columns] @ vector, denominator,
+                           out=np.full(n, np.nan), where=denominator > 0)
+        scores[~self._mask(position, min_games)] = np.nan
+        return scores
+
+    def top_for_template(self, template, k=10, position=None, min_games=0):
+        """
+        템플릿에 가장 가까운 상위 k명
+
+        반환: player_id 인덱스 Series (코사인 유사도, 내림차순)
+        """
+        scores = self.template_scores(template, position, min_games)
+        return self._result(_top_k(scores, k), scores, 'similarity')
+
+    def player_distances(self, player_id, position=None, min_games=0):
+        """
+        기준 선수와 모든 선수의 표준화 지표 거리
+
+        반환: 선수별 거리 배열 (기준 선수 자신과 필터에서 제외된 선수는 NaN)
+        """
+        target = self.keys.get_loc(player_id)
+        vector = self.standardized[target]
+        squared = self._squared_norms + self._squared_norms[target] - 2 * (self.standardized @ vector)
+        distances = np.sqrt(np.maximum(squared, 0))
+        distances[~self._mask(position, min_games)] = np.nan
+        distances[target] = np.nan
+        return distances
+
+    def nearest_players(self, player_id, k=5, position=None, min_games=0):
+        """
+        리그에서 기준 선수와 가장 비슷한 k명 (기준 선수 제외)
+
+        반환: player_id 인덱스 Series (표준화 지표 거리, 오름차순)
+        """
+        distances = self.player_distances(player_id, position, min_games)
+        return self._result(_top_k(distances, k, largest=False), distances, 'distance')
+
+    def comparables(self, k=5, position=None, min_games=0, block_size=BLOCK_SIZE):
+        """
+        필터를 만족하는 모든 선수의 가장 비슷한 k명 (블록 단위 행렬 곱)
+
+        반환: DataFrame (player_id, rank, comparable_id, distance) - 선수별 거리 오름차순
+        """
+        mask = self._mask(position, min_games)
+        candidates = np.flatnonzero(mask)
+        rows = []
+        for start in range(0, len(candidates), block_size):
+            block = candidates[start:start + block_size]
+            squared = (self._squared_norms[block][:, None] + self._squared_norms[None, :] -
+                       2 * (self.standardized[block] @ self.standardized.T))
+            distances = np.sqrt(np.maximum(squared, 0))
+            distances[:, ~mask] = np.nan
+            distances[np.arange(len(block)), block] = np.nan
+            for target, row in zip(block, distances):
+                for rank, neighbor in enumerate(_top_k(row, k, largest=False), 1):
+                    rows.append((self.keys[target], rank, self.keys[neighbor], row[neighbor]))
+        return pd.DataFrame(rows, columns=['player_id', 'rank', 'comparable_id', 'distance'])
@@ -0,0 +1,208 @@
+"""
+공간 그리드(히트맵) 집계 엔진
+
+목적: 구역 지표마다 별도 불리언 필터를 만들고 선수마다 평균 위치를 반복 계산하는 대신,
+      좌표 배열을 한 번 격자 셀 번호로 바꾸고 (그룹 × 셀) bincount 한 번으로
+      모든 선수/팀/경기의 이벤트 수·성공 수 그리드를 동시에 계산
+
+좌표: 0~100 정규화 (x: 폭 방향, y: 공격 방향 - 0이 자기 진영, 100이 상대 골문 쪽)
+그리드 해상도: GRID_SHAPES ('행x열' = y 방향 칸 수 × x 방향 칸 수)
+               100은 마지막 칸, 범위 밖 좌표는 가장자리 칸, 좌표 결측 이벤트는 제외
+그리드 배열 모양: (그룹 수, y 칸, x 칸)
+
+구역 비율(zone_ratios)은 그리드에서 바로 계산 (3등분/중앙/전방 절반 - 칸 경계와 맞는 구역만)
+기존 프로파일 지표(metric_registry의 touch_zone_*, event_zone_*)는 경계값(33/67, 33.3/66.6 등, 경계 포함 여부)이
+칸 경계와 달라 결과가 바뀌지 않도록 그대로 유지
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from event_index import event_frame
+from event_store import load_data
+from metric_registry import EventColumns, group_codes
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_PATH = PROJECT_ROOT / 'docs' / 'data' / 'spatial_grids.json'
+
+PITCH_SIZE = 100.0
+
+GRID_SHAPES = {
+    '3x3': (3, 3),
+    '6x4': (6, 4),
+    '12x8': (12, 8),
+}
+
+
+def _grid_shape(shape):
+    return GRID_SHAPES[shape] if isinstance(shape, str) else tuple(shape)
+
+
+def cell_index(x, y, shape):
+    """
+    좌표 → 셀 번호 (행 우선, 행 = y 칸)
+
+    반환: int 배열 (좌표가 결측이면 -1)
+    """
+    rows, cols = _grid_shape(shape)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    col = np.clip(np.floor(x / PITCH_SIZE * cols), 0, cols - 1)
+    row = np.clip(np.floor(y / PITCH_SIZE * rows), 0, rows - 1)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return np.where(valid, row * cols + col, -1).astype(np.int64)
+
+
+def calculate_grids(df, shapes=('3x3',), by='player_id', filter_name='touch', sort=True):
+    """
+    모든 그룹의 공간 그리드를 한 번의 스캔으로 계산
+
+    df: 이벤트 DataFrame 또는 EventIndex
+    shapes: 그리드 해상도 목록 (GRID_SHAPES 이름 또는 (행, 열))
+    by: 그룹 키 컬럼 (예: 'player_id', 'team_id', ['team_id', 'game_id'])
+    filter_name: 집계할 이벤트 (metric_registry FILTERS 이름, 기본 터치 이벤트)
+
+    반환: {
+        'keys': 그룹 키 Index,
+        'grids': {해상도: {'shape': (행, 열), 'counts': 배열, 'successes': 배열}}  (배열 모양: 그룹 × 행 × 열)
+    }
+    """
+    events = event_frame(df)
+    keys_columns = [by] if isinstance(by, str) else list(by)
+    events = events[events[keys_columns].notna().all(axis=1)]
+    codes, keys = group_codes(events, by, sort)
+    n = len(keys)
+
+    selected = EventColumns(events)[filter_name]
+    successful = events['result_name'].eq('Successful').to_numpy()
+    x = events['start_x'].to_numpy(dtype=float)
+    y = events['start_y'].to_numpy(dtype=float)
+
+    grids = {}
+    for shape in shapes:
+        rows, cols = _grid_shape(shape)
+        cells = rows * cols
+        cell = cell_index(x, y, (rows, cols))
+        mask = selected & (cell >= 0)
+        flat = codes[mask] * cells + cell[mask]
+        counts = np.bincount(flat, minlength=n * cells)
+        successes = np.bincount(flat[successful[mask]], minlength=n * cells)
+        name = shape if isinstance(shape, str) else f'{rows}x{cols}'
+        grids[name] = {
+            'shape': (rows, cols),
+            'counts': counts.reshape(n, rows, cols),
+            'successes': successes.reshape(n, rows, cols),
+        }
+    return {'keys': keys, 'grids': grids}
+
+
+def grid_frame(result, shape):
+    """그리드 결과 중 한 해상도의 그룹별 이벤트 수 (그룹 인덱스 × 셀 컬럼 'r{행}c{열}') DataFrame"""
+    grid = result['grids'][shape]
+    rows, cols = grid['shape']
+    columns = [f'r{r}c{c}' for r in range(rows) for c in range(cols)]
+    return pd.DataFrame(grid['counts'].reshape(len(result['keys']), -1), index=result['keys'], columns=columns)
+
+
+def zone_ratios(grid):
+    """
+    그리드 → 구역 비율 (그룹별 이벤트 중 구역 이벤트 비율, 이벤트가 없으면 0)
+
+    행(y) 칸 수가 3의 배수면 3등분 비율, 짝수면 전방 절반 비율,
+    열(x) 칸 수가 3의 배수면 중앙/측면 비율 (가운데 1/3 열)
+
+    반환: {구역 이름: 그룹별 비율 배열}
+    """
+    counts = grid['counts'].astype(float)
+    rows, cols = grid['shape']
+    total = counts.sum(axis=(1, 2))
+
+    def share(part):
+        return np.divide(part, total, out=np.zeros(len(total)), where=total > 0)
+
+    ratios = {}
+    if rows % 3 == 0:
+        third = rows // 3
+        ratios['zone_defensive_third'] = share(counts[:, :third].sum(axis=(1, 2)))
+        ratios['zone_middle_third'] = share(counts[:, third:2 * third].sum(axis=(1, 2)))
+        ratios['zone_attacking_third'] = share(counts[:, 2 * third:].sum(axis=(1, 2)))
+    if rows % 2 == 0:
+        ratios['zone_forward_half'] = share(counts[:, rows // 2:].sum(axis=(1, 2)))
+    if cols % 3 == 0:
+        third = cols // 3
+        central = share(counts[:, :, third:2 * third].sum(axis=(1, 2)))
+        ratios['zone_central'] = central
+        ratios['zone_wide'] = np.where(total > 0, 1 - central, 0.0)
+    return ratios
+
+
+def _grid_entry(result, position):
+    """JSON 내보내기용 그리드 (해상도별 행 우선 1차원 정수 배열)"""
+    return {
+        name: {
+            'counts': grid['counts'][position].ravel().tolist(),
+            'successes': grid['successes'][position].ravel().tolist(),
+        }
+        for name, grid in result['grids'].items()
+    }
+
+
+def export_grids(df, shapes=tuple(GRID_SHAPES), output_path=OUTPUT_PATH):
+    """
+    팀/선수 터치 히트맵 그리드를 docs 시각화용 JSON으로 저장
+
+    형식: {'shapes': {해상도: [행, 열]},
+           'teams': [{team_id, team_name, grids}], 'players': [{player_id, player_name, team_id, grids}]}
+          grids: {해상도: {'counts': [...], 'successes': [...]}} (행 = y 칸, 행 우선)
+    """
+    events = event_frame(df)
+    team_result = calculate_grids(events, shapes, by='team_id')
+    player_result = calculate_grids(events, shapes, by='player_id')
+
+    team_names = events.groupby('team_id')['team_name_ko'].first()
+    players = events[events['player_id'].notna()].groupby('player_id')[['player_name_ko', 'team_id']].first()
+
+    data = {
+        'shapes': {name: list(grid['shape']) for name, grid in team_result['grids'].items()},
+        'teams': [
+            {
+                'team_id': int(team_id),
+                'team_name': str(team_names.get(team_id, '')),
+                'grids': _grid_entry(team_result, i),
+            }
+            for i, team_id in enumerate(team_result['keys'])
+        ],
+        'players': [
+            {
+                'player_id': float(player_id),
+                'player_name': str(players.at[player_id, 'player_name_ko']),
+                'team_id': int(players.at[player_id, 'team_id']),
+                'grids': _grid_entry(player_result, i),
+            }
+            for i, player_id in enumerate(player_result['keys'])
+        ],
+    }
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"✓ 공간 그리드 저장 완료: {output_path}")
+    print(f"  {len(data['teams'])}개 팀, {len(data['players'])}명의 선수, 해상도 {', '.join(data['shapes'])}")
+    return output_path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='팀/선수 터치 히트맵 그리드 생성 (docs 시각화용)')
+    parser.add_argument('--shapes', nargs='+', default=list(GRID_SHAPES), choices=list(GRID_SHAPES),
+                        help='그리드 해상도')
+    parser.add_argument('--output', type=Path, default=OUTPUT_PATH, help='출력 JSON 경로')
+    args = parser.parse_args()
+
+    df, _ = load_data()
+    export_grids(df, args.shapes, args.output)
@@ -0,0 +1,238 @@
+"""
+청크 단위 스트리밍 프로파일 집계 (메모리보다 큰 이벤트 로그용)
+
+목적: load_data()는 raw_data.csv 전체를 DataFrame 하나로 올리므로 여러 시즌/대회를 합치면 메모리가 부족해짐
+      → 이벤트 로그를 경기 단위 청크로 읽으며 선수별 가산 통계(이벤트 수, 패스 수, 길이 합계, 구역별 수, 출전 경기 수)와
+        선수-경기-팀 출전 목록만 누적하고, 마지막에 한 번 지표로 변환
+      메모리 = 청크 크기 + (선수 수 × 통계 수) + 출전 목록 (이벤트 로그 크기와 무관)
+
+메모리 경로(calculate_profile_set, calculate_all_player_profiles)와 완전히 같은 결과:
+- 청크는 경기 단위 (event_store.iter_event_chunks) → 점유 라벨 / 이벤트 윈도우 필터 / 출전 경기 수가 청크마다 정확
+- 합계는 그룹별 이전 합계에 이어서 더함 (metric_registry.stat_arrays) → 덧셈 순서까지 전체 집계와 동일
+- 그룹 순서: sort=True면 키 순서, False면 이벤트 로그에 처음 나온 순서 (metric_stats와 동일)
+- 팀 승률 / WAR: 누적한 출전 목록(처음 나온 순서)으로 calculate_league_war 계산
+
+사용 예:
+    python stream_profiles.py --chunk-rows 100000 --verify    # 메모리 경로와 비교 (값/최대 메모리)
+    python stream_profiles.py --data-dir raw_data/synthetic/12x10 --output ranking_profiles.parquet
+    python stream_profiles.py --season 2024 --competition 1   # 해당 파티션만 읽어 집계 (event_store 파티션 스토어)
+    python stream_profiles.py --season 2024 --verify          # 해당 파티션 범위로 메모리 경로와 비교
+"""
+
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from event_store import (EVENTS_CSV, MATCH_INFO_CSV, STREAM_CHUNK_ROWS, add_partition_arguments, filter_events,
+                         filter_label, iter_event_chunks, iter_partitions, load_events, load_match_info, open_partitioned_store,
+                         partition_filters_from_args, select_partitions)
+from instrumentation import timed
+from metric_registry import (calculate_profile_set, filter_groups, finalize_profile_set, group_codes,
+                             profile_set_metrics, stat_arrays)
+from profile_engine import add_war_columns, calculate_all_player_profiles
+
+APPEARANCE_COLUMNS = ['player_id', 'game_id', 'team_id']
+
+
+def new_accumulator(metric_ids, by='player_id', filters=(), appearances=False):
+    """
+    스트리밍 집계 상태
+
+    metric_ids / by / filters: metric_stats와 같은 의미
+    appearances: 선수-경기-팀 출전 목록도 누적 (WAR 계산용)
+    """
+    return {
+        'metric_ids': list(dict.fromkeys(metric_ids)),
+        'by': by,
+        'filters': list(filters),
+        'keys': None,
+        'stats': None,
+        'appearances': [] if appearances else None,
+        'chunks': 0,
+        'events': 0,
+    }
+
+
+def accumulate(accumulator, events):
+    """
+    경기 단위 청크 하나를 누적 (청크 사이에 경기가 나뉘지 않아야 함)
+
+    그룹 코드는 처음 나온 순서로 계속 늘어나는 전체 키 목록 기준
+    """
+    by = accumulator['by']
+    key_columns = [by] if isinstance(by, str) else list(by)
+    grouped = events[events[key_columns].notna().all(axis=1)]
+
+    chunk_codes, chunk_keys = group_codes(grouped, by, sort=False)
+    keys = chunk_keys[:0] if accumulator['keys'] is None else accumulator['keys']
+    keys = keys.append(chunk_keys[~chunk_keys.isin(keys)])
+    codes = keys.get_indexer(chunk_keys)[chunk_codes]
+
+    accumulator['stats'] = stat_arrays(grouped, codes, len(keys), accumulator['metric_ids'],
+                                       accumulator['filters'], previous=accumulator['stats'])
+    accumulator['keys'] = keys
+
+    if accumulator['appearances'] is not None:
+        players = events[events['player_id'].notna()]
+        accumulator['appearances'].append(players[APPEARANCE_COLUMNS].drop_duplicates())
+
+    accumulator['chunks'] += 1
+    accumulator['events'] += len(events)
+
+
+def accumulated_stats(accumulator, sort=True):
+    """누적 통계 → metric_stats와 같은 형식의 DataFrame (sort=True면 키 순서)"""
+    if accumulator['stats'] is None:
+        raise ValueError("누적된 이벤트가 없습니다")
+    stats = pd.DataFrame(accumulator['stats'], index=accumulator['keys'])
+    return stats.sort_index() if sort else stats
+
+
+def accumulated_appearances(accumulator):
+    """누적 출전 목록 (player_id, game_id, team_id - 이벤트 로그에 처음 나온 순서)"""
+    return pd.concat(accumulator['appearances'], ignore_index=True)
+
+
+def _has_filters(partition_filters):
+    return any(values is not None for values in (partition_filters or {}).values())
+
+
+def stream_accumulate(accumulator, source_path=EVENTS_CSV, chunk_rows=STREAM_CHUNK_ROWS, partition_filters=None):
+    """
+    이벤트 로그 전체를 청크 단위로 읽어 누적
+
+    partition_filters: 시즌/대회/팀 조건 (event_store.load_data 인자) - 있으면 파티션 스토어에서
+                       조건에 맞는 파티션만 하나씩 읽어 누적 (청크 = 파티션, 맞는 파티션이 없으면 ValueError)
+    """
+    if _has_filters(partition_filters):
+        if not select_partitions(open_partitioned_store(source_path), **partition_filters):
+            raise ValueError(f"조건에 맞는 경기가 없습니다: {filter_label(**partition_filters)}")
+        chunks = iter_partitions(source_path=source_path, **partition_filters)
+    else:
+        chunks = iter_event_chunks(source_path, chunk_rows)
+    for events in chunks:
+        accumulate(accumulator, events)
+    return accumulator
+
+
+def stream_profile_set(source_path=EVENTS_CSV, name='ranking', min_events=0, require=None, by='player_id',
+                       sort=True, chunk_rows=STREAM_CHUNK_ROWS, partition_filters=None):
+    """
+    calculate_profile_set(load_events(source_path), ...)의 스트리밍 버전 (같은 결과)
+
+    반환: by 인덱스 DataFrame (컬럼: 프로파일 출력 컬럼)
+    """
+    extra = [] if require is None else [require]
+    accumulator = new_accumulator(profile_set_metrics(name), by=by, filters=extra)
+    stats = accumulated_stats(stream_accumulate(accumulator, source_path, chunk_rows, partition_filters), sort)
+    return filter_groups(finalize_profile_set(stats, name), stats, min_events, require)
+
+
+@timed('profile')
+def stream_all_player_profiles(source_path=EVENTS_CSV, match_info_df=None, chunk_rows=STREAM_CHUNK_ROWS,
+                               partition_filters=None):
+    """
+    profile_engine.calculate_all_player_profiles의 스트리밍 버전 (같은 결과)
+
+    partition_filters가 있으면 WAR는 누적한 경기의 경기 정보만으로 계산 (load_data 필터와 같은 범위)
+    반환: player_id 인덱스 DataFrame (컬럼: PROFILE_COLUMNS)
+    """
+    accumulator = new_accumulator(profile_set_metrics('ranking'), appearances=match_info_df is not None)
+    stream_accumulate(accumulator, source_path, chunk_rows, partition_filters)
+    profiles = finalize_profile_set(accumulated_stats(accumulator), 'ranking')
+    appearances = accumulated_appearances(accumulator) if match_info_df is not None else None
+    if appearances is not None and _has_filters(partition_filters):
+        match_info_df = match_info_df[match_info_df['game_id'].isin(appearances['game_id'])].reset_index(drop=True)
+    print(f"  스트리밍 집계: {accumulator['events']:,}개 이벤트, {accumulator['chunks']}개 청크")
+    return add_war_columns(profiles, appearances, match_info_df)
+
+
+def _traced(func):
+    """함수 실행 결과와 tracemalloc 최대 메모리(MB)"""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak / 1024**2
+
+
+def verify_streaming(source_path=EVENTS_CSV, match_info_path=MATCH_INFO_CSV, chunk_rows=STREAM_CHUNK_ROWS,
+                     partition_filters=None):
+    """
+    스트리밍 / 메모리 경로 프로파일 비교 (값이 완전히 같은지, 최대 메모리)
+
+    partition_filters가 있으면 스트리밍은 파티션 스토어에서, 메모리 경로는 전체 로딩 후 filter_events로 같은 범위 비교
+    반환: 모든 비교가 같으면 True
+    """
+    match_info_df = load_match_info(match_info_path)
+
+    def load_in_memory():
+        events = load_events(source_path, use_cache=False)
+        if _has_filters(partition_filters):
+            return filter_events(events, match_info_df, **partition_filters)
+        return events, match_info_df
+
+    streamed, stream_peak = _traced(
+        lambda: stream_all_player_profiles(source_path, match_info_df, chunk_rows, partition_filters))
+    in_memory, memory_peak = _traced(lambda: calculate_all_player_profiles(*load_in_memory()))
+
+    checks = {'ranking + WAR': (streamed, in_memory)}
+    for name in ('teams_data', 'role_comparison'):
+        events, _ = load_in_memory()
+        checks[name] = (stream_profile_set(source_path, name, chunk_rows=chunk_rows, partition_filters=partition_filters),
+                        calculate_profile_set(events, name))
+
+    identical = True
+    for name, (left, right) in checks.items():
+        try:
+            pd.testing.assert_frame_equal(left, right, check_exact=True)
+            print(f"  ✓ {name}: {len(left)}명, 완전히 같음")
+        except AssertionError as error:
+            identical = False
+            print(f"  ✗ {name}: 차이 있음\n{error}")
+
+    print(f"  최대 메모리: 스트리밍 {stream_peak:.1f} MB / 메모리 경로 {memory_peak:.1f} MB")
+    return identical
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='청크 단위 스트리밍 선수 프로파일 집계')
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help='raw_data.csv / match_info.csv 디렉토리 (기본: raw_data/open_track2)')
+    parser.add_argument('--chunk-rows', type=int, default=STREAM_CHUNK_ROWS, help='청크 크기 (행 수)')
+    parser.add_argument('--verify', action='store_true', help='메모리 경로와 결과 비교')
+    parser.add_argument('--output', type=Path, default=None, help='프로파일 저장 경로 (.parquet 또는 .csv)')
+    add_partition_arguments(parser)
+    args = parser.parse_args()
+
+    events_path = EVENTS_CSV if args.data_dir is None else args.data_dir / EVENTS_CSV.name
+    match_info_path = MATCH_INFO_CSV if args.data_dir is None else args.data_dir / MATCH_INFO_CSV.name
+
+    partition_filters = partition_filters_from_args(args)
+    if args.verify:
+        print("스트리밍 / 메모리 경로 비교 중...")
+        try:
+            identical = verify_streaming(events_path, match_info_path, args.chunk_rows, partition_filters)
+        except ValueError as error:
+            parser.error(str(error))
+        if not identical:
+            raise SystemExit(1)
+    else:
+        print("스트리밍 프로파일 집계 중...")
+        try:
+            profiles = stream_all_player_profiles(events_path, load_match_info(match_info_path), args.chunk_rows,
+                                                  partition_filters)
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"✓ {len(profiles)}명의 선수 프로파일")
+        if args.output is not None:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            if args.output.suffix == '.csv':
+                profiles.to_csv(args.output)
+            else:
+                profiles.to_parquet(args.output)
+            print(f"✓ 프로파일 저장 완료: {args.output}")
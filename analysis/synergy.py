@@ -0,0 +1,191 @@
+"""
+선수 조합 시너지 엔진 (함께 뛴 경기 vs 따로 뛴 경기 성과)
+
+목적: 선수 쌍마다 set 교집합을 만들고 경기마다 match_info_df를 스캔하는 대신,
+      팀 경기에 대한 선수 출전 행렬(players × games)과 경기 결과 벡터의 행렬곱으로
+      모든 쌍(및 3인 조합)의 함께/따로 경기 수, 승리 수, 득점을 한 번에 계산
+
+- 함께 뛴 경기: 조합의 모든 선수가 이벤트를 남긴 팀 경기
+- 따로 뛴 경기: 조합 중 일부만 뛴 경기 (포함-배제 원리로 계산)
+- 승률/평균 득점의 분모는 경기 수 (match_info에 없는 경기는 0승 0골)
+"""
+
+import numpy as np
+import pandas as pd
+from itertools import combinations
+
+from event_index import event_frame, select_team
+from game_results import build_team_game_results, lookup_team_games
+
+
+def build_team_appearances(team_data):
+    """
+    팀 이벤트 → 선수 × 경기 출전 행렬
+
+    반환: (player_ids, player_names, game_ids, appearances)
+          선수 순서는 팀 이벤트에서 처음 나온 순서, appearances는 (players × games) float 0/1
+    """
+    events = team_data[team_data['player_id'].notna()]
+    named = events.drop_duplicates('player_id')
+    player_ids = named['player_id'].to_numpy()
+    player_names = named['player_name_ko'].tolist()
+
+    game_ids = np.sort(team_data['game_id'].unique())
+    pairs = events[['player_id', 'game_id']].drop_duplicates()
+    rows = pd.Index(player_ids).get_indexer(pairs['player_id'])
+    cols = np.searchsorted(game_ids, pairs['game_id'].to_numpy())
+
+    appearances = np.zeros((len(player_ids), len(game_ids)))
+    appearances[rows, cols] = 1.0
+    return player_ids, player_names, game_ids, appearances
+
+
+def _pair_aggregates(appearances, weights):
+    """
+    쌍별 집계
+
+    weights: {이름: (games,) 경기별 값} (경기 수는 '_games'로 자동 포함)
+    반환: {이름: (together (p × p), separate (p × p))}
+    """
+    aggregates = {}
+    for name, values in {'_games': np.ones(appearances.shape[1]), **weights}.items():
+        weighted = appearances * values
+        together = weighted @ appearances.T
+        per_player = weighted.sum(axis=1)
+        # 따로 뛴 경기 = 한 명만 뛴 경기 (합집합 - 교집합)
+        separate = per_player[:, None] + per_player[None, :] - 2 * together
+        aggregates[name] = (together, separate)
+    return aggregates
+
+
+def _triple_aggregates(appearances, weights):
+    """
+    3인 조합별 집계 (players × players × players)
+
+    따로 뛴 경기 = 세 선수 중 한 명 이상 뛰었지만 세 명이 모두 뛰지는 않은 경기
+    """
+    aggregates = {}
+    for name, values in {'_games': np.ones(appearances.shape[1]), **weights}.items():
+        weighted = appearances * values
+        single = weighted.sum(axis=1)
+        pair = weighted @ appearances.T
+        together = np.einsum('ig,jg,kg->ijk', weighted, appearances, appearances)
+        union = (single[:, None, None] + single[None, :, None] + single[None, None, :]
+                 - pair[:, :, None] - pair[:, None, :] - pair[None, :, :] + together)
+        aggregates[name] = (together, union - together)
+    return aggregates
+
+
+def _rate(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=float), where=denominator > 0)
+
+
+def calculate_synergy(team_data, match_info_df, team_id, min_games_together=3, size=2, results=None,
+                      top_k=None):
+    """
+    팀의 선수 조합(쌍 또는 3인) 시너지 계산
+
+    results: build_team_game_results 결과 (여러 팀을 분석할 때 미리 한 번 계산)
+    size: 2 (선수 쌍) 또는 3 (3인 조합)
+    top_k: 승률 개선 상위 k개만 반환 (None이면 전체)
+
+    반환: 시너지 딕셔너리 리스트 (승률 개선 내림차순, 동률은 조합 순서)
+    """
+    player_ids, player_names, game_ids, appearances = build_team_appearances(team_data)
+    if len(player_ids) < size:
+        return []
+
+    if results is None:
+        results = build_team_game_results(match_info_df, game_ids)
+    vectors = lookup_team_games(results, team_id, game_ids)
+    weights = {
+        'wins': vectors['win'].astype(float),
+        'goals_for': vectors['goals_for'].astype(float),
+    }
+
+    if size == 2:
+        aggregates = _pair_aggregates(appearances, weights)
+        index_sets = np.triu_indices(len(player_ids), k=1)
+    elif size == 3:
+        aggregates = _triple_aggregates(appearances, weights)
+        index_sets = tuple(np.array(list(combinations(range(len(player_ids)), 3))).T)
+    else:
+        raise ValueError(f"지원하지 않는 조합 크기: {size}")
+
+    def pick(name, part):
+        return aggregates[name][part][index_sets]
+
+    together_games = pick('_games', 0)
+    separate_games = pick('_games', 1)
+    together_win_rate = _rate(pick('wins', 0), together_games)
+    separate_win_rate = _rate(pick('wins', 1), separate_games)
+    together_goals = _rate(pick('goals_for', 0), together_games)
+    separate_goals = _rate(pick('goals_for', 1), separate_games)
+
+    selected = np.flatnonzero((together_games >= min_games_together) & (separate_games > 0))
+
+    synergy_results = []
+    for i in selected:
+        members = [index_sets[m][i] for m in range(size)]
+        result = {}
+        if size == 2:
+            for number, member in enumerate(members, 1):
+                result[f'player{number}_id'] = player_ids[member]
+                result[f'player{number}_name'] = player_names[member]
+        else:
+            result['player_ids'] = [player_ids[m] for m in members]
+            result['player_names'] = [player_names[m] for m in members]
+        result.update({
+            'together_games': int(together_games[i]),
+            'separate_games': int(separate_games[i]),
+            'together_win_rate': float(together_win_rate[i]),
+            'separate_win_rate': float(separate_win_rate[i]),
+            'win_rate_improvement': float(together_win_rate[i] - separate_win_rate[i]),
+            'together_avg_goals_for': float(together_goals[i]),
+            'separate_avg_goals_for': float(separate_goals[i]),
+            'goals_improvement': float(together_goals[i] - separate_goals[i]),
+        })
+        synergy_results.append(result)
+
+    # 시너지 효과가 큰 순으로 정렬
+    synergy_results.sort(key=lambda x: x['win_rate_improvement'], reverse=True)
+    if top_k is not None:
+        synergy_results = synergy_results[:top_k]
+    return synergy_results
+
+
+def calculate_league_synergy(df, match_info_df, min_games_together=3, size=2, top_k=10):
+    """
+    리그 전체 팀의 선수 조합 시너지 (결과 행렬은 한 번만 생성)
+
+    df: 이벤트 DataFrame 또는 EventIndex
+    반환: {team_id: 시너지 리스트 (상위 top_k)}
+    """
+    events = event_frame(df)
+    results = build_team_game_results(match_info_df, np.sort(events['game_id'].unique()))
+
+    league_synergy = {}
+    for team_id in np.sort(events['team_id'].unique()):
+        league_synergy[team_id] = calculate_synergy(
+            select_team(df, team_id), match_info_df, team_id,
+            min_games_together=min_games_together, size=size, results=results, top_k=top_k
+        )
+    return league_synergy
+
+
+if __name__ == '__main__':
+    from event_index import EventIndex
+    from event_store import load_data
+
+    df, match_info_df = load_data()
+    events = EventIndex(df)
+    team_names = df.drop_duplicates('team_id').set_index('team_id')['team_name_ko']
+
+    print("="*80)
+    print("리그 전체 선수 쌍 시너지 (팀별 상위 3개)")
+    print("="*80)
+    for team_id, synergy_results in calculate_league_synergy(events, match_info_df, top_k=3).items():
+        print(f"\n{team_names.get(team_id, team_id)}")
+        for synergy in synergy_results:
+            print(f"  {synergy['player1_name']} + {synergy['player2_name']}: "
+                  f"{synergy['together_games']}경기, 승률 개선 {synergy['win_rate_improvement'] * 100:+.1f}%p")
@@ -0,0 +1,486 @@
+"""
+K리그 이벤트 로그 / 경기 정보 합성 데이터 생성기 (대규모 확장성 테스트용)
+
+목적: 실제 입력은 raw_data.csv / match_info.csv 한 시즌뿐이라 10~100배 규모에서 프로파일/네트워크/랭킹이
+      어떻게 동작하는지 확인할 수 없으므로, 같은 컬럼 구성의 이벤트 로그와 경기 정보를
+      N개 팀 × M시즌 규모로 생성하여 경기 묶음(청크) 단위로 CSV에 이어 씀 (메모리 = 청크 크기)
+
+생성 규칙:
+- 리그: 팀마다 포메이션 하나와 포지션 슬롯별 선수 2명 (주전 / 백업, 22명), 팀 전력(strength)
+- 일정: 시즌마다 라운드 로빈 ROUNDS회 (홈/원정 교대), game_id는 GAME_ID_START부터 연속 번호
+- 경기: 점유(possession)를 양 팀이 번갈아 가지며, 점유마다
+  [Carry(선택) → (상대 경합 실패 Tackle/Intervention, 선택) → Pass → Pass Received] × 패스 수 + 점유 종료 이벤트
+  패스 수는 기하분포 (평균 MEAN_PASSES × exp(팀 전력)), 받는 선수는 포지션 가중치로 뽑은 다른 동료
+- 점유 종료: 슈팅(공격 진영일수록 확률 증가, 골 여부로 스코어 결정) / 태클 / 실패 패스 후
+  상대 Interception·Recovery·Intervention·Clearance 또는 Out
+- 좌표: 0~100, 이벤트를 수행한 팀 기준 (y = 공격 방향) - 포지션 기준 위치 + 잡음, 상대 이벤트는 좌표 반전
+- 교체: 경기마다 주전 로테이션(ROTATION_RATE)과 후반 교체 SUBSTITUTIONS명 (같은 슬롯 백업 선수)
+
+같은 시드면 청크 크기 / 워커 수와 관계없이 같은 데이터 (경기마다 (시드, 경기 순번)으로 난수 생성)
+기본 규모(12팀 × 1시즌 × 3라운드 = 198경기, 경기당 약 1,900개 이벤트)가 실제 한 시즌과 비슷하며
+--seasons / --teams로 10~100배 규모 생성
+
+사용 예:
+    python synthetic_data.py --teams 12 --seasons 10 --workers 4
+    → raw_data/synthetic/12x10/raw_data.csv, match_info.csv
+      (event_store.load_data(data_dir=...)로 로딩, benchmark.py --data-dir로 벤치마크)
+"""
+
+import argparse
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / 'raw_data' / 'synthetic'
+
+EVENT_COLUMNS = [
+    'game_id', 'action_id', 'period_id', 'time_seconds', 'team_id', 'team_name_ko',
+    'player_id', 'player_name_ko', 'position_name', 'main_position', 'type_name', 'result_name',
+    'start_x', 'start_y', 'end_x', 'end_y', 'dx', 'dy',
+]
+MATCH_INFO_COLUMNS = [
+    'game_id', 'season_id', 'season_name', 'competition_id', 'competition_name', 'country_name',
+    'game_day', 'game_date', 'home_team_id', 'away_team_id',
+    'home_team_name', 'home_team_name_ko', 'away_team_name', 'away_team_name_ko',
+    'home_score', 'away_score',
+]
+
+# 리그 규모 기본값
+N_TEAMS = 12
+N_SEASONS = 1
+ROUNDS = 3
+FIRST_SEASON = 2024
+GAME_ID_START = 100000
+COMPETITION_ID = 1
+COMPETITION_NAME = 'K리그1'
+
+# 경기 진행 파라미터
+POSSESSIONS_PER_GAME = 180
+MEAN_PASSES = 3.5
+CARRY_RATE = 0.35
+DUEL_RATE = 0.06
+LOCATION_NOISE = 9.0
+PROGRESSION_PER_PASS = 2.5
+ON_TARGET_RATE = 0.35
+GOAL_RATE = 0.3
+TEAM_STRENGTH_STD = 0.15
+ROTATION_RATE = 0.2
+SUBSTITUTIONS = 3
+PERIOD_SECONDS = 45 * 60
+
+# 생성/저장 단위
+GAMES_PER_CHUNK = 50
+SEED = 42
+
+# 포메이션: 슬롯별 (포지션, x, y) 기준 위치 (팀 기준 좌표, y = 공격 방향)
+FORMATIONS = {
+    '4-4-2': [('GK', 50, 6), ('LB', 12, 35), ('CB', 38, 24), ('CB', 62, 24), ('RB', 88, 35),
+              ('LM', 12, 58), ('CM', 40, 50), ('CM', 60, 50), ('RM', 88, 58), ('CF', 42, 80), ('CF', 58, 80)],
+    '4-3-3': [('GK', 50, 6), ('LB', 12, 35), ('CB', 38, 24), ('CB', 62, 24), ('RB', 88, 35),
+              ('CM', 30, 50), ('CM', 50, 45), ('CM', 70, 50), ('LW', 14, 72), ('CF', 50, 82), ('RW', 86, 72)],
+    '3-5-2': [('GK', 50, 6), ('CB', 30, 25), ('CB', 50, 22), ('CB', 70, 25), ('LWB', 10, 48),
+              ('CM', 32, 50), ('CM', 50, 45), ('CM', 68, 50), ('RWB', 90, 48), ('CF', 42, 80), ('CF', 58, 80)],
+}
+
+# 패스를 받을 상대적 빈도 (포지션별)
+RECEIVE_WEIGHTS = {
+    'GK': 0.3, 'CB': 1.0, 'LB': 1.0, 'RB': 1.0, 'LWB': 1.0, 'RWB': 1.0,
+    'CM': 1.3, 'LM': 1.0, 'RM': 1.0, 'LW': 0.9, 'RW': 0.9, 'CF': 0.7,
+}
+
+# 점유 종료 방식 (슈팅 제외 기본 비율) - 'tackle'은 상대 태클, 나머지는 실패 패스 뒤 이어지는 이벤트
+ENDINGS = ['shot', 'tackle', 'Interception', 'Recovery', 'Intervention', 'Clearance', 'Out']
+ENDING_WEIGHTS = np.array([0.0, 0.18, 0.26, 0.18, 0.10, 0.12, 0.16])
+
+# 이벤트 종류 코드 (토큰 배열에서 사용)
+TYPE_NAMES = ['Pass', 'Pass Received', 'Carry', 'Shot', 'Tackle', 'Interception',
+              'Recovery', 'Intervention', 'Clearance', 'Out', 'Block']
+_TYPE = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+
+def build_league(n_teams=N_TEAMS, seed=SEED):
+    """
+    리그 구성 (팀별 포메이션, 전력, 슬롯별 선수 2명)
+
+    반환: {team_id: {'team_id', 'team_name_ko', 'team_name', 'formation', 'strength',
+                    'positions', 'anchors' (11 × 2), 'weights' (11), 'player_ids' (11 × 2), 'player_names' (11 × 2)}}
+    """
+    rng = np.random.default_rng([seed, n_teams])
+    formation_names = list(FORMATIONS)
+    league = {}
+    for team_id in range(1, n_teams + 1):
+        formation = formation_names[rng.integers(len(formation_names))]
+        slots = FORMATIONS[formation]
+        numbers = np.arange(1, 2 * len(slots) + 1).reshape(len(slots), 2)
+        team_name_ko = f'가상{team_id:02d} FC'
+        league[team_id] = {
+            'team_id': team_id,
+            'team_name_ko': team_name_ko,
+            'team_name': f'Synthetic FC {team_id:02d}',
+            'formation': formation,
+            'strength': float(rng.normal(0, TEAM_STRENGTH_STD)),
+            'positions': np.array([position for position, _, _ in slots]),
+            'anchors': np.array([(x, y) for _, x, y in slots], dtype=float),
+            'weights': np.array([RECEIVE_WEIGHTS[position] for position, _, _ in slots]),
+            'player_ids': (team_id * 1000 + numbers).astype(float),
+            'player_names': np.array([[f'{team_name_ko} 선수{n:02d}' for n in row] for row in numbers]),
+        }
+    return league
+
+
+def _round_robin(team_ids):
+    """라운드 로빈 한 바퀴 (circle method) → 경기일별 (홈, 원정) 목록"""
+    ids = list(team_ids) + ([None] if len(team_ids) % 2 else [])
+    n = len(ids)
+    days = []
+    for day in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = ids[i], ids[n - 1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if (day + i) % 2 == 0 else (away, home))
+        days.append(pairs)
+        ids = [ids[0], ids[-1]] + ids[1:-1]
+    return days
+
+
+def build_schedule(league, n_seasons=N_SEASONS, rounds=ROUNDS):
+    """
+    시즌별 라운드 로빈 일정 (라운드마다 홈/원정 교대)
+
+    반환: 경기 정보 DataFrame (MATCH_INFO_COLUMNS 중 스코어 제외, game_index: 생성 순번)
+    """
+    days = _round_robin(sorted(league))
+    rows = []
+    for season in range(n_seasons):
+        season_id = FIRST_SEASON + season
+        season_start = pd.Timestamp(f'{season_id}-03-01 19:00')
+        game_day = 0
+        for round_number in range(rounds):
+            for pairs in days:
+                game_day += 1
+                game_date = season_start + pd.Timedelta(days=7 * (game_day - 1))
+                for home, away in pairs:
+                    if round_number % 2 == 1:
+                        home, away = away, home
+                    rows.append({
+                        'game_id': GAME_ID_START + len(rows),
+                        'season_id': season_id,
+                        'season_name': str(season_id),
+                        'competition_id': COMPETITION_ID,
+                        'competition_name': COMPETITION_NAME,
+                        'country_name': 'South Korea',
+                        'game_day': game_day,
+                        'game_date': game_date.strftime('%Y-%m-%d %H:%M:%S'),
+                        'home_team_id': home,
+                        'away_team_id': away,
+                        'home_team_name': league[home]['team_name'],
+                        'home_team_name_ko': league[home]['team_name_ko'],
+                        'away_team_name': league[away]['team_name'],
+                        'away_team_name_ko': league[away]['team_name_ko'],
+                    })
+    schedule = pd.DataFrame(rows)
+    schedule['game_index'] = np.arange(len(schedule))
+    return schedule
+
+
+def _pick_lineup(team, rng):
+    """경기 출전 명단: 슬롯별 (선발, 교체 투입 선수, 교체 시각(초, 없으면 inf))"""
+    slots = len(team['positions'])
+    rotated = (rng.random(slots) < ROTATION_RATE).astype(int)
+    starters = team['player_ids'][np.arange(slots), rotated]
+    bench = team['player_ids'][np.arange(slots), 1 - rotated]
+    sub_time = np.full(slots, np.inf)
+    sub_slots = rng.choice(np.arange(1, slots), size=SUBSTITUTIONS, replace=False)
+    sub_time[sub_slots] = rng.uniform(55 * 60, 85 * 60, size=SUBSTITUTIONS)
+    return starters, bench, sub_time
+
+
+def _sample_slots(rng, cumulative, side):
+    """팀(side)별 누적 확률로 슬롯 번호 추출"""
+    u = rng.random(len(side))
+    return (u[:, None] > cumulative[side]).sum(axis=1)
+
+
+def _nearest_slots(anchors, side, xy):
+    """팀(side) 기준 위치 중 좌표에 가장 가까운 슬롯 (수비 이벤트 수행자)"""
+    distance = ((anchors[side] - xy[:, None, :]) ** 2).sum(axis=2)
+    return distance.argmin(axis=1)
+
+
+def _clip(xy):
+    return np.clip(xy, 0, 100)
+
+
+def simulate_game(game, league, seed=SEED):
+    """
+    한 경기 이벤트 로그 생성
+
+    game: build_schedule 한 행 (game_id, game_index, home_team_id, away_team_id)
+    반환: (이벤트 DataFrame - EVENT_COLUMNS, 홈 득점, 원정 득점)
+    """
+    rng = np.random.default_rng([seed, int(game['game_index'])])
+    teams = [league[game['home_team_id']], league[game['away_team_id']]]
+    anchors = np.stack([team['anchors'] for team in teams])
+    weights = np.stack([team['weights'] / team['weights'].sum() for team in teams])
+    cumulative = np.cumsum(weights, axis=1)[:, :-1]
+    strength = np.array([team['strength'] for team in teams])
+
+    # 점유: 양 팀 교대, 패스 수는 기하분포
+    n_possessions = rng.poisson(POSSESSIONS_PER_GAME)
+    side = (rng.integers(2) + np.arange(n_possessions)) % 2
+    mean_passes = MEAN_PASSES * np.exp(strength[side])
+    n_steps = rng.geometric(1 / (mean_passes + 1)) - 1
+
+    # 공 소유 선수 사슬 (점유마다 시작 선수 + 패스 수신자, 연속으로 같은 선수 없음)
+    chain_possession = np.repeat(np.arange(n_possessions), n_steps + 1)
+    chain_side = side[chain_possession]
+    chain = _sample_slots(rng, cumulative, chain_side)
+    while True:
+        repeated = np.flatnonzero((chain[1:] == chain[:-1]) & (chain_possession[1:] == chain_possession[:-1])) + 1
+        if len(repeated) == 0:
+            break
+        chain[repeated] = _sample_slots(rng, cumulative, chain_side[repeated])
+
+    chain_start = np.concatenate([[0], np.cumsum(n_steps + 1)[:-1]])
+    chain_step = np.arange(len(chain)) - chain_start[chain_possession]
+    chain_xy = anchors[chain_side, chain] + rng.normal(0, LOCATION_NOISE, (len(chain), 2))
+    chain_xy[:, 1] += PROGRESSION_PER_PASS * chain_step
+    chain_xy = _clip(chain_xy)
+
+    # 패스 단계: 소유 선수 = 사슬 j, 수신자 = 사슬 j+1
+    is_holder = chain_step < n_steps[chain_possession]
+    holder_index = np.flatnonzero(is_holder)
+    step_possession = chain_possession[holder_index]
+    step_side = side[step_possession]
+    step = chain_step[holder_index]
+    holder = chain[holder_index]
+    receiver = chain[holder_index + 1]
+    holder_xy = chain_xy[holder_index]
+    receiver_xy = chain_xy[holder_index + 1]
+    n_total_steps = len(holder_index)
+
+    has_carry = rng.random(n_total_steps) < CARRY_RATE
+    carry_end = _clip(holder_xy + np.column_stack([rng.normal(0, 3, n_total_steps),
+                                                   np.abs(rng.normal(4, 4, n_total_steps))]))
+    pass_start = np.where(has_carry[:, None], carry_end, holder_xy)
+    has_duel = rng.random(n_total_steps) < DUEL_RATE
+
+    tokens = []
+
+    def add(mask, possession, order, sub, actor_side, slot, type_code, success, start, end):
+        """토큰 추가 (mask로 고른 행만, 좌표는 수행 팀 기준)"""
+        count = int(mask.sum())
+        if count == 0:
+            return
+        tokens.append({
+            'possession': possession[mask], 'order': order[mask], 'sub': np.full(count, sub),
+            'side': actor_side[mask], 'slot': slot[mask],
+            'type': np.broadcast_to(type_code, len(mask))[mask].astype(np.int64),
+            'success': np.broadcast_to(success, len(mask))[mask],
+            'start': start[mask], 'end': end[mask],
+        })
+
+    everything = np.ones(n_total_steps, dtype=bool)
+    opponent_step = 1 - step_side
+    duel_xy = 100 - pass_start
+    duel_slot = _nearest_slots(anchors, opponent_step, duel_xy)
+    duel_type = np.where(rng.random(n_total_steps) < 0.6, _TYPE['Tackle'], _TYPE['Intervention'])
+    add(has_carry, step_possession, step, 0, step_side, holder, _TYPE['Carry'], True, holder_xy, carry_end)
+    add(has_duel, step_possession, step, 1, opponent_step, duel_slot, duel_type, False, duel_xy, duel_xy)
+    add(everything, step_possession, step, 2, step_side, holder, _TYPE['Pass'], True, pass_start, receiver_xy)
+    add(everything, step_possession, step, 3, step_side, receiver, _TYPE['Pass Received'], True,
+        receiver_xy, receiver_xy)
+
+    # 점유 종료: 공격 진영 깊숙할수록 슈팅 확률 증가
+    possessions = np.arange(n_possessions)
+    final_index = chain_start + n_steps
+    final_slot = chain[final_index]
+    final_xy = chain_xy[final_index]
+    opponent = 1 - side
+    shot_probability = 0.02 + 0.6 * np.clip((final_xy[:, 1] - 60) / 40, 0, 1) ** 1.5 * np.exp(strength[side])
+    probabilities = np.tile(ENDING_WEIGHTS / ENDING_WEIGHTS.sum(), (n_possessions, 1)) * (1 - shot_probability)[:, None]
+    probabilities[:, 0] = shot_probability
+    ending = (rng.random(n_possessions)[:, None] > np.cumsum(probabilities, axis=1)[:, :-1]).sum(axis=1)
+    ending_name = np.array(ENDINGS)[ending]
+
+    # 슈팅 (유효 슈팅 중 일부 골), 골이 아니면 상대 블록 또는 골키퍼 리커버리
+    is_shot = ending_name == 'shot'
+    on_target = rng.random(n_possessions) < ON_TARGET_RATE
+    is_goal = is_shot & on_target & (rng.random(n_possessions) < GOAL_RATE)
+    goal_mouth = np.column_stack([50 + rng.normal(0, 3, n_possessions), np.full(n_possessions, 100.0)])
+    add(is_shot, possessions, n_steps, 0, side, final_slot, _TYPE['Shot'], on_target, final_xy, goal_mouth)
+    blocked = is_shot & ~is_goal & (rng.random(n_possessions) < 0.3)
+    saved = is_shot & ~is_goal & ~blocked
+    shot_defence_xy = 100 - final_xy
+    add(blocked, possessions, n_steps, 1, opponent, _nearest_slots(anchors, opponent, shot_defence_xy),
+        _TYPE['Block'], True, shot_defence_xy, shot_defence_xy)
+    keeper_xy = _clip(np.column_stack([50 + rng.normal(0, 4, n_possessions), 3 + np.abs(rng.normal(0, 2, n_possessions))]))
+    add(saved, possessions, n_steps, 1, opponent, np.zeros(n_possessions, dtype=int),
+        _TYPE['Recovery'], True, keeper_xy, keeper_xy)
+
+    # 상대 태클
+    is_tackle = ending_name == 'tackle'
+    tackle_xy = 100 - final_xy
+    add(is_tackle, possessions, n_steps, 0, opponent, _nearest_slots(anchors, opponent, tackle_xy),
+        _TYPE['Tackle'], True, tackle_xy, tackle_xy)
+
+    # 실패 패스 → 상대 수비 이벤트 또는 Out
+    is_lost = ~is_shot & ~is_tackle
+    target = _clip(final_xy + np.column_stack([rng.normal(0, 15, n_possessions), rng.normal(10, 8, n_possessions)]))
+    is_cleared = ending_name == 'Clearance'
+    target[is_cleared] = _clip(np.column_stack([50 + rng.normal(0, 10, is_cleared.sum()),
+                                                90 + rng.normal(0, 4, is_cleared.sum())]))
+    is_out = ending_name == 'Out'
+    target[is_out, 0] = np.where(target[is_out, 0] < 50, 0.0, 100.0)
+    add(is_lost, possessions, n_steps, 0, side, final_slot, _TYPE['Pass'], False, final_xy, target)
+    add(is_out, possessions, n_steps, 1, side, final_slot, _TYPE['Out'], True, target, target)
+    defended = is_lost & ~is_out
+    defence_xy = 100 - target
+    defence_type = np.array([_TYPE.get(name, 0) for name in ending_name])
+    add(defended, possessions, n_steps, 1, opponent, _nearest_slots(anchors, opponent, defence_xy),
+        defence_type, True, defence_xy, defence_xy)
+
+    # 토큰 정렬 → 이벤트 순서
+    columns = {key: np.concatenate([token[key] for token in tokens]) for key in tokens[0]}
+    order = np.lexsort((columns['sub'], columns['order'], columns['possession']))
+    columns = {key: values[order] for key, values in columns.items()}
+    n_events = len(order)
+
+    # 시간: 전/후반 절반씩 점유 배분, 피리어드 안에서 정렬된 균등 시각 (추가 시간 1~5분)
+    period = np.where(columns['possession'] < n_possessions // 2, 1, 2)
+    time_seconds = np.empty(n_events)
+    for period_id in (1, 2):
+        in_period = period == period_id
+        length = PERIOD_SECONDS + rng.integers(60, 300)
+        time_seconds[in_period] = np.sort(rng.uniform(0, length, in_period.sum()))
+    game_seconds = time_seconds + (period - 1) * PERIOD_SECONDS
+
+    # 선수: 교체 시각 이후면 같은 슬롯의 교체 선수
+    actor_side, slot = columns['side'], columns['slot']
+    player_ids = np.empty(n_events)
+    player_names = np.empty(n_events, dtype=object)
+    positions = np.empty(n_events, dtype=object)
+    for team_side, team in enumerate(teams):
+        starters, bench, sub_time = _pick_lineup(team, rng)
+        mine = actor_side == team_side
+        substituted = game_seconds[mine] >= sub_time[slot[mine]]
+        ids = np.where(substituted, bench[slot[mine]], starters[slot[mine]])
+        player_ids[mine] = ids
+        names = dict(zip(team['player_ids'].ravel(), team['player_names'].ravel()))
+        player_names[mine] = [names[player_id] for player_id in ids]
+        positions[mine] = team['positions'][slot[mine]]
+
+    start = np.round(_clip(columns['start']), 2)
+    end = np.round(_clip(columns['end']), 2)
+    team_ids = np.array([team['team_id'] for team in teams])
+    team_names = np.array([team['team_name_ko'] for team in teams], dtype=object)
+    events = pd.DataFrame({
+        'game_id': int(game['game_id']),
+        'action_id': np.arange(n_events),
+        'period_id': period,
+        'time_seconds': np.round(time_seconds, 1),
+        'team_id': team_ids[actor_side],
+        'team_name_ko': team_names[actor_side],
+        'player_id': player_ids,
+        'player_name_ko': player_names,
+        'position_name': positions,
+        'main_position': positions,
+        'type_name': np.array(TYPE_NAMES, dtype=object)[columns['type']],
+        'result_name': np.where(columns['success'], 'Successful', 'Unsuccessful'),
+        'start_x': start[:, 0],
+        'start_y': start[:, 1],
+        'end_x': end[:, 0],
+        'end_y': end[:, 1],
+        'dx': np.round(end[:, 0] - start[:, 0], 2),
+        'dy': np.round(end[:, 1] - start[:, 1], 2),
+    }, columns=EVENT_COLUMNS)
+
+    goals = np.bincount(side[is_goal], minlength=2)
+    return events, int(goals[0]), int(goals[1])
+
+
+def simulate_games(task):
+    """
+    경기 묶음 생성 (프로세스 풀 작업 단위)
+
+    task: (schedule 행 DataFrame, league, seed)
+    반환: (이벤트 DataFrame, 스코어 DataFrame - game_id, home_score, away_score)
+    """
+    games, league, seed = task
+    event_frames = []
+    scores = []
+    for game in games.to_dict('records'):
+        events, home_score, away_score = simulate_game(game, league, seed)
+        event_frames.append(events)
+        scores.append((game['game_id'], home_score, away_score))
+    return (pd.concat(event_frames, ignore_index=True),
+            pd.DataFrame(scores, columns=['game_id', 'home_score', 'away_score']))
+
+
+def iter_event_chunks(schedule, league, seed=SEED, games_per_chunk=GAMES_PER_CHUNK, workers=1):
+    """
+    경기 묶음 단위 이벤트 생성 (일정 순서대로 반환)
+
+    workers > 1이면 프로세스 풀에서 병렬 생성 (결과는 동일)
+    반환: (이벤트 DataFrame, 스코어 DataFrame) 제너레이터
+    """
+    tasks = [(schedule.iloc[start:start + games_per_chunk], league, seed)
+             for start in range(0, len(schedule), games_per_chunk)]
+    if workers <= 1:
+        for task in tasks:
+            yield simulate_games(task)
+        return
+
+    with Pool(workers) as pool:
+        yield from pool.imap(simulate_games, tasks)
+
+
+def generate_dataset(output_dir=None, n_teams=N_TEAMS, n_seasons=N_SEASONS, rounds=ROUNDS, seed=SEED,
+                     games_per_chunk=GAMES_PER_CHUNK, workers=1):
+    """
+    합성 raw_data.csv / match_info.csv 생성 (이벤트는 청크 단위로 이어 씀)
+
+    output_dir: 출력 디렉토리 (None이면 raw_data/synthetic/{팀 수}x{시즌 수})
+    반환: (이벤트 CSV 경로, 경기 정보 CSV 경로)
+    """
+    output_dir = Path(output_dir) if output_dir is not None else OUTPUT_DIR / f'{n_teams}x{n_seasons}'
+    output_dir.mkdir(parents=True, exist_ok=True)
+    events_path = output_dir / 'raw_data.csv'
+    match_info_path = output_dir / 'match_info.csv'
+
+    league = build_league(n_teams, seed)
+    schedule = build_schedule(league, n_seasons, rounds)
+    print(f"합성 데이터 생성: {n_teams}개 팀 × {n_seasons}시즌 ({rounds}라운드) = {len(schedule):,}경기")
+
+    score_frames = []
+    n_events = 0
+    for i, (events, scores) in enumerate(iter_event_chunks(schedule, league, seed, games_per_chunk, workers)):
+        events.to_csv(events_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        score_frames.append(scores)
+        n_events += len(events)
+        print(f"  {min((i + 1) * games_per_chunk, len(schedule)):,}/{len(schedule):,}경기, {n_events:,}개 이벤트")
+
+    match_info = schedule.merge(pd.concat(score_frames, ignore_index=True), on='game_id', how='left')
+    match_info[MATCH_INFO_COLUMNS].to_csv(match_info_path, index=False)
+
+    print(f"✓ 합성 데이터 저장 완료: {output_dir}")
+    print(f"  {n_events:,}개 이벤트, {len(match_info):,}경기")
+    return events_path, match_info_path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K리그 이벤트 로그 / 경기 정보 합성 데이터 생성')
+    parser.add_argument('--teams', type=int, default=N_TEAMS, help='팀 수 (기본 12)')
+    parser.add_argument('--seasons', type=int, default=N_SEASONS, help='시즌 수 (기본 1)')
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help='시즌당 라운드 로빈 횟수 (기본 3)')
+    parser.add_argument('--seed', type=int, default=SEED, help='난수 시드')
+    parser.add_argument('--chunk-games', type=int, default=GAMES_PER_CHUNK, help='한 번에 생성/저장할 경기 수')
+    parser.add_argument('--workers', type=int, default=1, help='생성 프로세스 수 (기본 1)')
+    parser.add_argument('--output', type=Path, default=None, help='출력 디렉토리 (기본: raw_data/synthetic/{팀}x{시즌})')
+    args = parser.parse_args()
+
+    generate_dataset(args.output, args.teams, args.seasons, args.rounds, args.seed, args.chunk_games, args.workers)
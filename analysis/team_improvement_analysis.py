@@ -7,19 +7,15 @@
 3. 추천 이유 제공
 """
 
-import pandas as pd
+import argparse
 import numpy as np
 import json
 from pathlib import Path
 from collections import defaultdict
 
-PROJECT_ROOT = Path(__file__).parent.parent
+from instrumentation import add_profile_arguments, profile_session_from_args, stage, timed
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+PROJECT_ROOT = Path(__file__).parent.parent
 
 def load_role_templates():
     """롤 템플릿 로딩"""
@@ -27,6 +23,7 @@ def load_role_templates():
     with open(template_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@timed('load')
 def load_teams_data():
     """팀 데이터 로딩"""
     data_path = PROJECT_ROOT / 'docs' / 'data' / 'teams_data_enhanced.json'
@@ -96,6 +93,7 @@ def analyze_team_weaknesses(team_data):
     
     return weaknesses
 
+@timed('score')
 def find_recommended_players(target_team_data, all_teams_data, target_team_name):
     """보완 가능한 선수 추천"""
     recommendations = []
@@ -361,6 +359,7 @@ def generate_best_11_for_formation(all_teams_data, formation_name):
     
     return best_11
 
+@timed('rank')
 def generate_best_11(all_teams_data):
     """모든 포메이션에 대한 베스트 11 생성"""
     best_11_by_formation = {}
@@ -398,12 +397,17 @@ def generate_improvement_data():
     }
     
     output_path = PROJECT_ROOT / 'docs' / 'data' / 'team_improvements.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with stage('export'), open(output_path, 'w', encoding='utf-8') as f:
         json.dump(output_data, f, ensure_ascii=False, indent=2)
     
     print(f"\n결과 저장 완료: {output_path}")
     return output_data
 
 if __name__ == '__main__':
-    generate_improvement_data()
+    parser = argparse.ArgumentParser(description='팀별 개선점 분석 및 베스트 11 생성')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    with profile_session_from_args(args, 'team_improvement_analysis'):
+        generate_improvement_data()
 
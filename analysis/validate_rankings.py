@@ -4,64 +4,32 @@
 특정 선수(아론, 정태욱 등)의 랭킹이 실제 성과와 일치하는지 검증
 """
 
-import pandas as pd
 import json
 from pathlib import Path
 from collections import defaultdict
 
-PROJECT_ROOT = Path(__file__).parent.parent
+from event_store import load_data
+from event_index import select_player
+from game_results import aggregate_team_games, build_team_game_results, player_game_teams
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+PROJECT_ROOT = Path(__file__).parent.parent
 
 def calculate_team_win_rate(df, match_info_df, player_id):
-    """선수의 팀 승률 계산"""
-    player_data = df[df['player_id'] == player_id]
+    """선수의 팀 승률 계산 (경기마다 선수가 뛴 팀 기준)"""
+    player_data = select_player(df, player_id)
     if len(player_data) == 0:
         return None
     
     player_games = player_data['game_id'].unique()
-    wins = 0
-    draws = 0
-    losses = 0
-    
-    for game_id in player_games:
-        game_info = match_info_df[match_info_df['game_id'] == game_id]
-        if len(game_info) > 0:
-            game_data = player_data[player_data['game_id'] == game_id]
-            if len(game_data) > 0:
-                player_team_id = game_data['team_id'].iloc[0]
-                is_home = game_info['home_team_id'].iloc[0] == player_team_id
-                home_score = game_info['home_score'].iloc[0]
-                away_score = game_info['away_score'].iloc[0]
-                
-                if is_home:
-                    if home_score > away_score:
-                        wins += 1
-                    elif home_score == away_score:
-                        draws += 1
-                    else:
-                        losses += 1
-                else:
-                    if away_score > home_score:
-                        wins += 1
-                    elif away_score == home_score:
-                        draws += 1
-                    else:
-                        losses += 1
-    
-    game_count = len(player_games)
-    win_rate = wins / game_count if game_count > 0 else 0
+    result_table = build_team_game_results(match_info_df, player_games)
+    stats = aggregate_team_games(result_table, player_game_teams(player_data, player_games), player_games)
     
     return {
-        'game_count': game_count,
-        'wins': wins,
-        'draws': draws,
-        'losses': losses,
-        'win_rate': win_rate
+        'game_count': stats['game_count'],
+        'wins': stats['wins'],
+        'draws': stats['draws'],
+        'losses': stats['losses'],
+        'win_rate': stats['win_rate']
     }
 
 def validate_specific_players():
@@ -5,17 +5,19 @@
       (행동 강령: 실행 결과 검증 필수)
 """
 
-import pandas as pd
 import numpy as np
 import json
 from pathlib import Path
 from scipy.stats import f_oneway
 
+from event_store import load_events
+from event_index import EventIndex, event_frame
+from metric_registry import calculate_profile_set, player_profile, profile_row
+
 PROJECT_ROOT = Path(__file__).parent.parent
 
 def load_data():
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    return df
+    return load_events()
 
 def load_role_templates():
     """생성된 롤 템플릿 로딩"""
@@ -27,22 +29,8 @@ def load_role_templates():
         return json.load(f)
 
 def calculate_player_profile(df, player_id):
-    """선수 프로파일 계산 (간단 버전)"""
-    player_data = df[df['player_id'] == player_id].copy()
-    if len(player_data) < 50:
-        return None
-    
-    profile = {}
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        profile['long_pass_ratio'] = (pass_lengths > 20).sum() / len(passes)
-        profile['average_touch_y'] = player_data['start_y'].mean()
-        profile['pass_success_rate'] = len(passes[passes['result_name'] == 'Successful']) / len(passes)
-    else:
-        return None
-    
-    return profile
+    """선수 프로파일 계산 (간단 버전, metric_registry의 'cluster_validation' 프로파일, 패스가 없으면 None)"""
+    return player_profile(df, player_id, 'cluster_validation', min_events=50, require='pass')
 
 def validate_cluster_separation(df, position, role_templates):
     """
@@ -57,13 +45,15 @@ def validate_cluster_separation(df, position, role_templates):
     print(f"{position} 포지션 롤 구분력 검증")
     print(f"{'='*80}")
     
-    position_players = df[df['main_position'] == position]
+    events = event_frame(df)
+    position_players = events[events['main_position'] == position]
     player_ids = position_players['player_id'].dropna().unique()
     
-    # 각 선수의 프로파일 계산
+    # 각 선수의 프로파일 계산 (모든 선수를 한 번의 스캔으로 계산 후 조회)
+    profile_table = calculate_profile_set(df, 'cluster_validation', min_events=50, require='pass')
     player_profiles = {}
     for player_id in player_ids:
-        profile = calculate_player_profile(df, player_id)
+        profile = profile_row(profile_table, player_id)
         if profile:
             player_profiles[player_id] = profile
     
@@ -149,7 +139,7 @@ def main():
     
     for position in main_positions:
         if position in role_templates:
-            validate_cluster_separation(df, position, role_templates)
+            validate_cluster_separation(EventIndex(df), position, role_templates)
     
     print("\n" + "="*80)
     print("검증 완료")
@@ -6,7 +6,7 @@
       - 박진섭이 CB 포지션이지만 딥라잉 플레이메이커처럼 플레이하는지 검증
 """
 
-import pandas as pd
+import sys
 import numpy as np
 from pathlib import Path
 from scipy.spatial.distance import cosine
@@ -14,74 +14,14 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'analysis'))
 
-def load_data():
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+from event_store import load_data
+from metric_registry import player_profile
 
 def calculate_player_profile(df, player_id):
-    """선수별 행동 프로파일 계산"""
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    if len(player_data) < 50:
-        return None
-    
-    profile = {}
-    
-    # 패스 관련 지표
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        forward_passes = passes[passes['dx'] > 0]
-        profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        profile['long_pass_ratio'] = long_passes / len(passes)
-        
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        profile['average_pass_length'] = pass_lengths.mean()
-    else:
-        profile['forward_pass_ratio'] = 0
-        profile['long_pass_ratio'] = 0
-        profile['pass_success_rate'] = 0
-        profile['average_pass_length'] = 0
-    
-    # 캐리 관련 지표
-    carries = player_data[player_data['type_name'] == 'Carry']
-    if len(carries) > 0:
-        carry_lengths = np.sqrt(carries['dx']**2 + carries['dy']**2)
-        profile['average_carry_length'] = carry_lengths.mean()
-        profile['carry_frequency'] = len(carries) / len(player_data)
-    else:
-        profile['average_carry_length'] = 0
-        profile['carry_frequency'] = 0
-    
-    # 공간 활용 지표
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & 
-                                     (player_data['start_x'] <= 70)).sum() / len(player_data)
-    profile['touch_zone_wide'] = ((player_data['start_x'] < 30) | 
-                                  (player_data['start_x'] > 70)).sum() / len(player_data)
-    profile['touch_zone_forward'] = (player_data['start_y'] > 50).sum() / len(player_data)
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    
-    # 수비/압박 지표
-    interventions = player_data[player_data['type_name'] == 'Intervention']
-    blocks = player_data[player_data['type_name'] == 'Block']
-    profile['defensive_action_frequency'] = (len(interventions) + len(blocks)) / len(player_data)
-    
-    # 공격 관련 지표
-    shots = player_data[player_data['type_name'] == 'Shot']
-    profile['shot_frequency'] = len(shots) / len(player_data)
-    
-    # 추가 지표: 빌드업 참여도
-    profile['pass_frequency'] = len(passes) / len(player_data)
-    profile['event_frequency'] = len(player_data)
-    
-    return profile
+    """선수별 행동 프로파일 계산 (metric_registry의 'deep_lying_playmaker' 프로파일)"""
+    return player_profile(df, player_id, 'deep_lying_playmaker', min_events=50)
 
 def define_deep_lying_playmaker_template():
     """딥라잉 플레이메이커 템플릿"""
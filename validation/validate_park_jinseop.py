@@ -4,79 +4,20 @@
 목적: 박진섭 선수의 행동 프로파일을 분석하고, 각 롤 템플릿과의 적합도를 확인
 """
 
-import pandas as pd
+import sys
 import numpy as np
 from pathlib import Path
 from scipy.spatial.distance import cosine
 
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'analysis'))
 
-def load_data():
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+from event_store import load_data
+from metric_registry import calculate_profile_set, player_profile
 
 def calculate_player_profile(df, player_id):
-    """선수별 행동 프로파일 계산"""
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    if len(player_data) < 50:
-        return None
-    
-    profile = {}
-    
-    # 패스 관련 지표
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        forward_passes = passes[passes['dx'] > 0]
-        profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        profile['long_pass_ratio'] = long_passes / len(passes)
-        
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        profile['average_pass_length'] = pass_lengths.mean()
-    else:
-        profile['forward_pass_ratio'] = 0
-        profile['long_pass_ratio'] = 0
-        profile['pass_success_rate'] = 0
-        profile['average_pass_length'] = 0
-    
-    # 캐리 관련 지표
-    carries = player_data[player_data['type_name'] == 'Carry']
-    if len(carries) > 0:
-        carry_lengths = np.sqrt(carries['dx']**2 + carries['dy']**2)
-        profile['average_carry_length'] = carry_lengths.mean()
-        profile['carry_frequency'] = len(carries) / len(player_data)
-    else:
-        profile['average_carry_length'] = 0
-        profile['carry_frequency'] = 0
-    
-    # 공간 활용 지표
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & 
-                                     (player_data['start_x'] <= 70)).sum() / len(player_data)
-    profile['touch_zone_wide'] = ((player_data['start_x'] < 30) | 
-                                  (player_data['start_x'] > 70)).sum() / len(player_data)
-    profile['touch_zone_forward'] = (player_data['start_y'] > 50).sum() / len(player_data)
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    
-    # 수비/압박 지표
-    interventions = player_data[player_data['type_name'] == 'Intervention']
-    blocks = player_data[player_data['type_name'] == 'Block']
-    profile['defensive_action_frequency'] = (len(interventions) + len(blocks)) / len(player_data)
-    
-    # 공격 관련 지표
-    shots = player_data[player_data['type_name'] == 'Shot']
-    profile['shot_frequency'] = len(shots) / len(player_data)
-    
-    # 볼 소유 지표
-    profile['event_frequency'] = len(player_data)
-    
-    return profile
+    """선수별 행동 프로파일 계산 (metric_registry의 'role_validation' 프로파일)"""
+    return player_profile(df, player_id, 'role_validation', min_events=50)
 
 def define_role_template(role_name):
     """롤 템플릿 정의"""
@@ -147,40 +88,16 @@ def calculate_role_fit_score(player_profile, role_template):
         return None
 
 def compare_with_position_average(df, player_id, position):
-    """같은 포지션 평균과 비교"""
-    position_players = df[df['main_position'] == position]
-    position_profile = {}
-    
-    passes = position_players[position_players['type_name'] == 'Pass']
-    if len(passes) > 0:
-        forward_passes = passes[passes['dx'] > 0]
-        position_profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        position_profile['long_pass_ratio'] = long_passes / len(passes)
-        
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        position_profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        position_profile['average_pass_length'] = pass_lengths.mean()
-    else:
-        position_profile['forward_pass_ratio'] = 0
-        position_profile['long_pass_ratio'] = 0
-        position_profile['pass_success_rate'] = 0
-        position_profile['average_pass_length'] = 0
-    
-    position_profile['touch_zone_central'] = ((position_players['start_x'] >= 30) & 
-                                             (position_players['start_x'] <= 70)).sum() / len(position_players)
-    position_profile['touch_zone_forward'] = (position_players['start_y'] > 50).sum() / len(position_players)
-    position_profile['average_touch_x'] = position_players['start_x'].mean()
-    position_profile['average_touch_y'] = position_players['start_y'].mean()
-    
-    interventions = position_players[position_players['type_name'] == 'Intervention']
-    blocks = position_players[position_players['type_name'] == 'Block']
-    position_profile['defensive_action_frequency'] = (len(interventions) + len(blocks)) / len(position_players)
-    
-    return position_profile
+    """같은 포지션 평균과 비교 (포지션 전체 이벤트를 한 그룹으로 집계)"""
+    position_profiles = calculate_profile_set(df, 'role_validation', by='main_position')
+    position_profile = position_profiles.loc[position]
+    
+    keys = [
+        'forward_pass_ratio', 'long_pass_ratio', 'pass_success_rate', 'average_pass_length',
+        'touch_zone_central', 'touch_zone_forward', 'average_touch_x', 'average_touch_y',
+        'defensive_action_frequency',
+    ]
+    return {key: float(position_profile[key]) for key in keys}
 
 def main():
     print("="*60)
@@ -7,12 +7,16 @@
 주의: 이 스크립트는 "계산 가능 여부"만 확인합니다. 실제 성능/결과 해석은 별도 검토가 필요합니다.
 """
 
-import pandas as pd
+import sys
 import numpy as np
 from pathlib import Path
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'analysis'))
+
+from event_store import load_events, load_match_info
+from possession import possession_table
 
 def load_data():
     """데이터 로딩"""
@@ -20,8 +24,8 @@ def load_data():
     print("1. 데이터 로딩")
     print("=" * 60)
     
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
+    df = load_events()
+    match_info_df = load_match_info()
     
     print(f"✓ raw_data.csv 로딩 완료: {len(df):,} 행")
     print(f"✓ match_info.csv 로딩 완료: {len(match_info_df):,} 행")
@@ -254,12 +258,14 @@ def validate_plan4_metrics(df, match_info_df):
     
     # 5. 볼 소유 전환 빈도
     try:
-        # team_id가 연속으로 바뀌는 횟수 계산
-        team_changes = (game_data['team_id'].shift() != game_data['team_id']).sum()
+        # 이벤트 스토어 점유 라벨 기준 (상대 팀 점유로 넘어간 점유 수)
+        possessions = possession_table(game_data)
+        turnovers = (possessions['possession_outcome'] == 'turnover').sum()
         game_duration_min = game_data['time_seconds'].max() / 60  # 경기 시간(분)
-        turnover_frequency = team_changes / game_duration_min if game_duration_min > 0 else 0
+        turnover_frequency = turnovers / game_duration_min if game_duration_min > 0 else 0
         validation_results['possession_turnover'] = True
-        print(f"✓ 볼 소유 전환 빈도 계산 가능: {turnover_frequency:.2f} 회/분")
+        print(f"✓ 볼 소유 전환 빈도 계산 가능: {turnover_frequency:.2f} 회/분 "
+              f"(점유 {len(possessions)}회, 평균 {possessions['events'].mean():.1f} 이벤트)")
     except Exception as e:
         validation_results['possession_turnover'] = False
         print(f"❌ 볼 소유 전환 빈도 계산 실패: {e}")
@@ -13,91 +13,35 @@
       롤 정의와 지표 가중치를 조정해야 할 수 있습니다.
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from scipy.spatial.distance import cosine
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'analysis'))
 
-def load_data():
-    """데이터 로딩"""
-    df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'raw_data.csv')
-    match_info_df = pd.read_csv(PROJECT_ROOT / 'raw_data' / 'open_track2' / 'match_info.csv')
-    return df, match_info_df
+from event_store import load_data
+from metric_registry import calculate_profile_set, player_profile
 
 def calculate_player_profile(df, player_id):
     """
-    선수별 행동 프로파일 계산
+    선수별 행동 프로파일 계산 (metric_registry의 'role_validation' 프로파일)
     
     반환: 딕셔너리 형태의 프로파일 벡터
     """
-    player_data = df[df['player_id'] == player_id].copy()
-    
-    if len(player_data) < 50:  # 최소 이벤트 수 체크
-        return None
-    
-    profile = {}
-    
-    # 패스 관련 지표
-    passes = player_data[player_data['type_name'] == 'Pass']
-    if len(passes) > 0:
-        # 전진 패스 비율
-        forward_passes = passes[passes['dx'] > 0]
-        profile['forward_pass_ratio'] = len(forward_passes) / len(passes)
-        
-        # 롱패스 비율 (거리 > 20m)
-        pass_lengths = np.sqrt(passes['dx']**2 + passes['dy']**2)
-        long_passes = (pass_lengths > 20).sum()
-        profile['long_pass_ratio'] = long_passes / len(passes)
-        
-        # 패스 성공률
-        successful_passes = passes[passes['result_name'] == 'Successful']
-        profile['pass_success_rate'] = len(successful_passes) / len(passes)
-        
-        # 평균 패스 거리
-        profile['average_pass_length'] = pass_lengths.mean()
-    else:
-        profile['forward_pass_ratio'] = 0
-        profile['long_pass_ratio'] = 0
-        profile['pass_success_rate'] = 0
-        profile['average_pass_length'] = 0
-    
-    # 캐리 관련 지표
-    carries = player_data[player_data['type_name'] == 'Carry']
-    if len(carries) > 0:
-        carry_lengths = np.sqrt(carries['dx']**2 + carries['dy']**2)
-        profile['average_carry_length'] = carry_lengths.mean()
-        profile['carry_frequency'] = len(carries) / len(player_data)
-    else:
-        profile['average_carry_length'] = 0
-        profile['carry_frequency'] = 0
-    
-    # 공간 활용 지표
-    profile['touch_zone_central'] = ((player_data['start_x'] >= 30) & 
-                                     (player_data['start_x'] <= 70)).sum() / len(player_data)
-    profile['touch_zone_wide'] = ((player_data['start_x'] < 30) | 
-                                  (player_data['start_x'] > 70)).sum() / len(player_data)
-    profile['touch_zone_forward'] = (player_data['start_y'] > 50).sum() / len(player_data)
-    profile['average_touch_x'] = player_data['start_x'].mean()
-    profile['average_touch_y'] = player_data['start_y'].mean()
-    
-    # 수비/압박 지표
-    interventions = player_data[player_data['type_name'] == 'Intervention']
-    blocks = player_data[player_data['type_name'] == 'Block']
-    profile['defensive_action_frequency'] = (len(interventions) + len(blocks)) / len(player_data)
-    
-    # 공격 관련 지표
-    shots = player_data[player_data['type_name'] == 'Shot']
-    profile['shot_frequency'] = len(shots) / len(player_data)
-    
-    # 볼 소유 지표
-    profile['event_frequency'] = len(player_data)
-    
-    return profile
+    return player_profile(df, player_id, 'role_validation', min_events=50)
+
+def calculate_all_player_profiles(df):
+    """
+    모든 선수의 행동 프로파일을 한 번의 스캔으로 계산 (calculate_player_profile과 동일한 지표)
+
+    반환: player_id 인덱스 DataFrame (이벤트 50개 이상 선수, 이벤트 로그에 처음 나온 순서)
+    """
+    return calculate_profile_set(df, 'role_validation', min_events=50, sort=False)
 
 def define_role_template(role_name):
     """
@@ -148,47 +92,57 @@ def define_role_template(role_name):
     
     return templates.get(role_name, {})
 
-def calculate_role_fit_score(player_profile, role_template):
+def calculate_role_fit_scores(profiles, role_template):
     """
-    선수 프로파일과 롤 템플릿 간의 적합도 스코어 계산 (코사인 유사도)
-    
+    모든 선수의 롤 적합도 (선수 프로파일과 롤 템플릿 간 코사인 유사도, 행렬 연산으로 일괄 계산)
+
+    템플릿에 있는 지표만 사용
     주의: 모든 지표를 동일한 가중치로 계산합니다.
           실제로는 포지션별로 중요 지표에 가중치를 부여해야 할 수 있습니다.
+
+    반환: player_id 인덱스 Series (지표가 모두 0인 프로파일은 NaN)
     """
-    if player_profile is None or not role_template:
-        return None
-    
-    # 벡터로 변환 (템플릿에 있는 지표만 사용)
-    player_vector = []
-    template_vector = []
-    
-    for key in role_template.keys():
-        if key in player_profile:
-            player_vector.append(player_profile[key])
-            template_vector.append(role_template[key])
-    
-    if len(player_vector) == 0:
-        return None
-    
-    # 정규화 (0~1 범위로)
-    player_vector = np.array(player_vector)
-    template_vector = np.array(template_vector)
-    
-    # 코사인 유사도 계산
-    # 1 - cosine distance = similarity (0~1, 1에 가까울수록 유사)
-    try:
-        cosine_sim = 1 - cosine(player_vector, template_vector)
-        return cosine_sim
-    except:
-        return None
+    keys = [key for key in role_template.keys() if key in profiles.columns]
+    player_matrix = profiles[keys].to_numpy(dtype=float)
+    template_vector = np.array([role_template[key] for key in keys], dtype=float)
+
+    norms = np.linalg.norm(player_matrix, axis=1) * np.linalg.norm(template_vector)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cosine_sim = (player_matrix @ template_vector) / norms
+    return pd.Series(cosine_sim, index=profiles.index)
+
+def print_fit_distribution(fit_scores, bins=20):
+    """전체 선수 적합도 분포 통계 및 텍스트 히스토그램 출력 (계산할 수 없는 NaN 점수는 제외)"""
+    scores = pd.Series(fit_scores, dtype=float)
+    fit_scores = scores.dropna().to_numpy()
+    dropped = len(scores) - len(fit_scores)
+    dropped_text = f", 적합도 계산 불가 {dropped}명 제외" if dropped else ""
+    print(f"\n[적합도 스코어 통계] (전체 {len(scores)}명{dropped_text})")
+    if len(fit_scores) == 0:
+        print("  계산 가능한 적합도가 없습니다.")
+        return
+    print(f"  평균: {np.mean(fit_scores):.3f}")
+    print(f"  표준편차: {np.std(fit_scores):.3f}")
+    print(f"  최소: {np.min(fit_scores):.3f}")
+    print(f"  최대: {np.max(fit_scores):.3f}")
+    print(f"  중앙값: {np.median(fit_scores):.3f}")
+    percentiles = np.percentile(fit_scores, [10, 25, 75, 90])
+    print("  백분위 (10/25/75/90): " + " / ".join(f"{value:.3f}" for value in percentiles))
+
+    counts, edges = np.histogram(fit_scores, bins=bins)
+    scale = 40 / max(counts.max(), 1)
+    print("\n[적합도 히스토그램]")
+    for count, low, high in zip(counts, edges[:-1], edges[1:]):
+        print(f"  {low:.3f} ~ {high:.3f} | {'#' * int(round(count * scale)):<40} {count}")
 
-def validate_role_definition(df, role_name, test_cases=None):
+def validate_role_definition(df, role_name, test_cases=None, profiles=None):
     """
     롤 정의 검증
     
     test_cases: {player_id: expected_role} 형태의 딕셔너리
                 (예: {356618: '딥라잉 플레이메이커'})
                 None이면 모든 선수에 대해 롤 적합도를 계산하여 분포 확인
+    profiles: calculate_all_player_profiles 결과 (여러 롤을 검증할 때 한 번만 계산)
     """
     print(f"\n{'='*60}")
     print(f"롤 정의 검증: {role_name}")
@@ -203,45 +157,38 @@ def validate_role_definition(df, role_name, test_cases=None):
     for key, value in role_template.items():
         print(f"  {key}: {value}")
     
-    # 모든 선수에 대해 적합도 계산
+    # 모든 선수에 대해 적합도 계산 (프로파일/적합도 일괄 계산)
     player_ids = df['player_id'].dropna().unique()
-    fit_scores = []
-    player_profiles = []
-    
     print(f"\n선수별 적합도 계산 중... (총 {len(player_ids)}명)")
     
-    for player_id in player_ids[:100]:  # 샘플링 (처음 100명만, 전체는 시간이 오래 걸림)
-        profile = calculate_player_profile(df, player_id)
-        if profile:
-            fit_score = calculate_role_fit_score(profile, role_template)
-            if fit_score is not None:
-                fit_scores.append(fit_score)
-                player_profiles.append({
-                    'player_id': player_id,
-                    'fit_score': fit_score,
-                    'profile': profile
-                })
+    if profiles is None:
+        profiles = calculate_all_player_profiles(df)
+    scores = calculate_role_fit_scores(profiles, role_template)
     
-    if len(fit_scores) == 0:
+    if len(scores) == 0:
         print("❌ 적합도 계산 결과가 없습니다.")
         return None
     
-    # 통계 요약
-    print(f"\n[적합도 스코어 통계]")
-    print(f"  평균: {np.mean(fit_scores):.3f}")
-    print(f"  표준편차: {np.std(fit_scores):.3f}")
-    print(f"  최소: {np.min(fit_scores):.3f}")
-    print(f"  최대: {np.max(fit_scores):.3f}")
-    print(f"  중앙값: {np.median(fit_scores):.3f}")
+    # 통계 요약 (전체 선수 분포)
+    print_fit_distribution(scores)
+    
+    # 지표가 모두 0이라 코사인 유사도가 정의되지 않는 선수(NaN)는 순위/분포에서 제외
+    scores = scores.dropna()
+    fit_scores = scores.tolist()
     
-    # 상위 적합도 선수들
-    sorted_players = sorted(player_profiles, key=lambda x: x['fit_score'], reverse=True)
+    # 상위 적합도 선수들 (선수 첫 이벤트 기준 이름/포지션)
+    player_info = df[df['player_id'].notna()].drop_duplicates('player_id').set_index('player_id')
+    sorted_scores = scores.sort_values(ascending=False, kind='stable')
     print(f"\n[상위 5명 적합도]")
-    for i, player in enumerate(sorted_players[:5], 1):
-        player_id = player['player_id']
-        player_name = df[df['player_id'] == player_id]['player_name_ko'].iloc[0] if len(df[df['player_id'] == player_id]) > 0 else 'N/A'
-        position = df[df['player_id'] == player_id]['main_position'].iloc[0] if len(df[df['player_id'] == player_id]) > 0 else 'N/A'
-        print(f"  {i}. player_id={player_id}, 이름={player_name}, 포지션={position}, 적합도={player['fit_score']:.3f}")
+    for i, (player_id, fit_score) in enumerate(sorted_scores.head(5).items(), 1):
+        player_name = player_info.at[player_id, 'player_name_ko']
+        position = player_info.at[player_id, 'main_position']
+        print(f"  {i}. player_id={player_id}, 이름={player_name}, 포지션={position}, 적합도={fit_score:.3f}")
+    
+    player_profiles = [
+        {'player_id': player_id, 'fit_score': fit_score, 'profile': profiles.loc[player_id].to_dict()}
+        for player_id, fit_score in scores.items()
+    ]
     
     # 테스트 케이스가 있으면 검증
     if test_cases:
@@ -249,12 +196,12 @@ def validate_role_definition(df, role_name, test_cases=None):
         for player_id, expected_role in test_cases.items():
             if expected_role != role_name:
                 continue
-            profile = calculate_player_profile(df, player_id)
-            if profile:
-                fit_score = calculate_role_fit_score(profile, role_template)
-                player_name = df[df['player_id'] == player_id]['player_name_ko'].iloc[0] if len(df[df['player_id'] == player_id]) > 0 else 'N/A'
-                status = "✓" if fit_score and fit_score > np.median(fit_scores) else "⚠"
-                print(f"  {status} {player_name} (player_id={player_id}): 적합도={fit_score:.3f if fit_score else 'N/A'}")
+            if player_id not in scores.index:
+                continue
+            fit_score = scores[player_id]
+            player_name = player_info.at[player_id, 'player_name_ko']
+            status = "✓" if fit_score > np.median(fit_scores) else "⚠"
+            print(f"  {status} {player_name} (player_id={player_id}): 적합도={fit_score:.3f}")
     
     return {
         'fit_scores': fit_scores,
@@ -307,8 +254,11 @@ def main():
     
     all_results = {}
     
+    # 전체 선수 프로파일 (모든 롤 검증에 공유)
+    profiles = calculate_all_player_profiles(df)
+    
     for role_name in roles_to_validate:
-        result = validate_role_definition(df, role_name, test_cases)
+        result = validate_role_definition(df, role_name, test_cases, profiles)
         if result:
             all_results[role_name] = result
             visualize_role_distribution(result, role_name)